@@ -1,12 +1,54 @@
-
 __version__ = "0.1.0"
 __author__ = "Techni Beer Sheva"
 
-from beast.core.registry import Registry
-from beast.core.plugin_loader import PluginLoader
+# _thread is built in; threading would pull functools/collections into every import
+import _thread
+
+# Public names and the modules they come from, imported on first access (PEP 562)
+_LAZY_IMPORTS = {
+    'Registry': 'beast.core.registry',
+    'PluginLoader': 'beast.core.plugin_loader',
+    'BeastFactory': 'beast.core.factory',
+    'create_beast': 'beast.core.factory',
+}
+
+# instances גלובליים - נוצרים בגישה הראשונה בלבד
+_GLOBALS_LOCK = _thread.RLock()
+
+
+def _create_registry():
+    from beast.core.registry import Registry
+    return Registry()
+
+
+def _create_plugin_loader():
+    from beast.core.plugin_loader import PluginLoader
+    return PluginLoader(__getattr__('registry'))
+
+
+_LAZY_GLOBALS = {
+    'registry': _create_registry,
+    'plugin_loader': _create_plugin_loader,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    elif name in _LAZY_GLOBALS:
+        with _GLOBALS_LOCK:
+            if name in globals():
+                return globals()[name]
+            value = _LAZY_GLOBALS[name]()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS) + list(_LAZY_GLOBALS))
 
-# יצירת instances גלובליים
-registry = Registry()
-plugin_loader = PluginLoader(registry)
 
-__all__ = ['registry', 'plugin_loader', 'Registry', 'PluginLoader']
+__all__ = ['registry', 'plugin_loader', 'Registry', 'PluginLoader', 'BeastFactory', 'create_beast']
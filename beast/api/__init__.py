@@ -0,0 +1 @@
+"""HTTP query service"""
@@ -0,0 +1,608 @@
+"""
+HTTP Query Service
+Asyncio HTTP/JSON API over a running BEAST instance (standard library only)
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import re
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import parse_qs, unquote, urlsplit
+
+if TYPE_CHECKING:
+    from beast.core.factory import BeastFactory
+
+# Request limits
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 1024 * 1024
+# Items serialized per streamed chunk
+STREAM_BATCH = 100
+
+
+class HTTPError(Exception):
+    """Error response with a status code"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """
+    Response to write: a complete body, or chunks streamed with chunked
+    transfer encoding
+    """
+    
+    def __init__(self, status: int = 200, body: bytes = b"",
+                 etag: Optional[str] = None,
+                 chunks: Optional[Iterable[bytes]] = None):
+        self.status = status
+        self.body = body
+        self.etag = etag
+        self.chunks = chunks
+
+
+def _json(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _etag(*parts: Any) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for GET)"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _serialize_user(user: Any) -> Dict[str, Any]:
+    return {
+        "id_number": user.id_number,
+        "full_name": user.full_name,
+        "rank_name": user.rank_name,
+        "display_rank": user.display_rank,
+        "department": user.department,
+        "class_name": user.class_name,
+    }
+
+
+def _serialize_class(classroom: Any) -> Dict[str, Any]:
+    return {
+        "class_name": classroom.class_name,
+        "maks": _serialize_user(classroom.maks) if classroom.maks else None,
+        "student_count": classroom.get_student_count(),
+    }
+
+
+def _serialize_event(event: Any) -> Dict[str, Any]:
+    return {
+        "sequence": event.sequence,
+        "event_type": event.event_type,
+        "source": event.source,
+        "data": event.data,
+        "timestamp": event.timestamp.isoformat(),
+        "metadata": event.metadata,
+    }
+
+
+class _Route:
+    """One endpoint: `etag` is computed from version counters before `handler` runs"""
+    
+    def __init__(self, method: str, pattern: str, handler: Callable,
+                 etag: Optional[Callable] = None):
+        self.method = method
+        self.pattern = re.compile("^" + re.sub(r"{(\w+)}", r"(?P<\1>[^/]+)", pattern) + "$")
+        self.handler = handler
+        self.etag = etag
+
+
+class BeastHTTPService:
+    """
+    Read and trigger endpoints over HTTP/1.1 with keep-alive
+    
+    GET  /departments                      departments with their versions
+    GET  /departments/{name}               department info
+    GET  /users?limit=&after=              users, ordered by id number
+    GET  /users/{id_number}                one user
+    GET  /classes?limit=&after=            classes, ordered by name
+    GET  /classes/{name}?limit=&after=     one class and its students
+    GET  /events?limit=&after=&type=       event history, by sequence number
+    GET  /automations                      automation status
+    GET  /automations/{dept}/{name}        one automation's status
+    POST /automations/{dept}/{name}        run it (JSON body: parameters)
+    
+    Every GET response carries an ETag built from the registry version and
+    the department's version counter (users and classes: both departments'
+    and the hierarchy's; event sequence number, automation enabled flags,
+    run counts and last run times). A matching If-None-Match is answered 304 after computing
+    only the ETag. Listings use keyset pagination: pass the response's
+    "next" value as `after` to get the following page; pages stream with
+    chunked transfer encoding. Complete bodies are cached per URL until
+    the ETag changes.
+    
+    Handlers read department state from the event loop thread; automation
+    runs go to the default thread pool.
+    """
+    
+    def __init__(self, factory: 'BeastFactory', host: str = "127.0.0.1", port: int = 8080,
+                 page_size: int = 100, max_page_size: int = 1000,
+                 cache_size: int = 256):
+        """
+        Initialize service
+        
+        Args:
+            factory: Initialized factory to serve
+            host: Interface to bind
+            port: Port to bind (0 picks a free port; see `port` after start)
+            page_size: Default listing page size
+            max_page_size: Largest page size a client may request
+            cache_size: Complete response bodies kept for reuse
+        """
+        self.factory = factory
+        self.host = host
+        self.port = port
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.cache_size = cache_size
+        self.requests_served = 0
+        self.not_modified = 0
+        self._cache: 'OrderedDict[str, Tuple[str, bytes]]' = OrderedDict()
+        self._key_indexes: Dict[str, Tuple[Any, List[str]]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._routes = [
+            _Route("GET", "/departments", self._list_departments, self._departments_etag),
+            _Route("GET", "/departments/{name}", self._get_department, self._department_etag),
+            _Route("GET", "/users", self._list_users, self._users_etag),
+            _Route("GET", "/users/{id_number}", self._get_user, self._users_etag),
+            _Route("GET", "/classes", self._list_classes, self._classes_etag),
+            _Route("GET", "/classes/{name}", self._get_class, self._classes_etag),
+            _Route("GET", "/events", self._list_events, self._events_etag),
+            _Route("GET", "/automations", self._list_automations, self._automations_etag),
+            _Route("GET", "/automations/{department}/{name}", self._get_automation,
+                   self._automations_etag),
+            _Route("POST", "/automations/{department}/{name}", self._run_automation),
+        ]
+    
+    # Lifecycle
+    
+    async def start(self):
+        """Start listening (in the running event loop)"""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self):
+        """Start listening and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def close(self):
+        """Stop listening and drop open connections"""
+        if self._server is not None:
+            self._server.close()
+            # Closing the transports ends idle keep-alive reads cleanly
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+    
+    def start_in_thread(self) -> int:
+        """
+        Serve from a background thread with its own event loop
+        
+        Returns:
+            The bound port
+        """
+        ready = threading.Event()
+        errors: List[BaseException] = []
+        
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.close())
+                loop.close()
+        
+        self._thread = threading.Thread(target=run, name="beast-http", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self.port
+    
+    def stop(self):
+        """Stop a service started with start_in_thread()"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+    
+    # HTTP
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                response = await self._respond(method, target, headers, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._write_response(writer, method, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            # Malformed request - answer and drop the connection
+            await self._write_response(writer, "GET", self._error(e.status, str(e)), False)
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(431, "Too many headers")
+        
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Malformed Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Malformed Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+    
+    async def _write_response(self, writer: asyncio.StreamWriter, method: str,
+                              response: Response, keep_alive: bool):
+        status = HTTPStatus(response.status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+                 "Content-Type: application/json; charset=utf-8",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if response.etag:
+            lines.append(f"ETag: {response.etag}")
+        chunked = response.chunks is not None and status.value == 200
+        if chunked:
+            # Also for HEAD, which gets the same headers as GET and no body
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append(f"Content-Length: {len(response.body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        
+        if method == "HEAD":
+            pass
+        elif chunked:
+            for chunk in response.chunks:
+                if chunk:
+                    writer.write(f"{len(chunk):x}\r\n".encode("latin-1") + chunk + b"\r\n")
+                    await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        elif response.status != 304:
+            writer.write(response.body)
+        await writer.drain()
+        self.requests_served += 1
+    
+    def _error(self, status: int, message: str) -> Response:
+        return Response(status, _json({"error": message}))
+    
+    async def _respond(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Response:
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        lookup = "GET" if method == "HEAD" else method
+        
+        allowed = False
+        for route in self._routes:
+            match = route.pattern.match(path)
+            if match is None:
+                continue
+            if route.method != lookup:
+                allowed = True
+                continue
+            try:
+                return await self._dispatch(route, match.groupdict(), query, headers, body, target)
+            except HTTPError as e:
+                return self._error(e.status, str(e))
+            except ValueError as e:
+                return self._error(400, str(e))
+            except Exception as e:
+                return self._error(500, f"{type(e).__name__}: {e}")
+        if allowed:
+            return self._error(405, f"Method {method} not allowed")
+        return self._error(404, f"Not found: {path}")
+    
+    async def _dispatch(self, route: _Route, params: Dict[str, str], query: Dict[str, str],
+                        headers: Dict[str, str], body: bytes, target: str) -> Response:
+        if route.etag is None:
+            return await route.handler(params, body)
+        
+        # Counters only - nothing is rendered for a 304 or a cached body
+        etag = route.etag(params)
+        if _etag_matches(headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(304, etag=etag)
+        cached = self._cache.get(target)
+        if cached is not None and cached[0] == etag:
+            self._cache.move_to_end(target)
+            return Response(200, cached[1], etag=etag)
+        
+        response = route.handler(params, query)
+        response.etag = etag
+        if response.chunks is None:
+            self._cache[target] = (etag, response.body)
+            self._cache.move_to_end(target)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return response
+    
+    # Pagination
+    
+    def _page_args(self, query: Dict[str, str]) -> Tuple[int, Optional[str]]:
+        try:
+            limit = int(query.get("limit", self.page_size))
+        except ValueError:
+            raise HTTPError(400, "limit must be an integer")
+        if not 1 <= limit <= self.max_page_size:
+            raise HTTPError(400, f"limit must be between 1 and {self.max_page_size}")
+        return limit, query.get("after")
+    
+    def _sorted_keys(self, name: str, version: Any, mapping: Dict[str, Any]) -> List[str]:
+        """Sorted keys of a mapping, rebuilt only when its version changes"""
+        cached = self._key_indexes.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        keys = sorted(list(mapping))
+        self._key_indexes[name] = (version, keys)
+        return keys
+    
+    def _keyset_page(self, name: str, version: Any, mapping: Dict[str, Any],
+                     query: Dict[str, str], serialize: Callable[[Any], Dict[str, Any]],
+                     header: Optional[Dict[str, Any]] = None) -> Response:
+        """Stream one page of a mapping, ordered by key, starting after the cursor"""
+        limit, after = self._page_args(query)
+        keys = self._sorted_keys(name, version, mapping)
+        start = bisect_right(keys, after) if after is not None else 0
+        page = keys[start:start + limit]
+        next_key = page[-1] if page and start + limit < len(keys) else None
+        return self._stream_page(dict(header or {}, next=next_key, total=len(keys)),
+                                 (mapping.get(key) for key in page), serialize)
+    
+    def _stream_page(self, header: Dict[str, Any], items: Iterable[Any],
+                     serialize: Callable[[Any], Dict[str, Any]]) -> Response:
+        def chunks():
+            yield _json(header)[:-1] + (b',"items":[' if len(header) else b'"items":[')
+            batch = []
+            first = True
+            for item in items:
+                if item is None:  # Removed since the page was cut
+                    continue
+                batch.append(_json(serialize(item)))
+                if len(batch) == STREAM_BATCH:
+                    yield (b"" if first else b",") + b",".join(batch)
+                    first = False
+                    batch = []
+            if batch:
+                yield (b"" if first else b",") + b",".join(batch)
+            yield b"]}"
+        
+        return Response(200, chunks=chunks())
+    
+    # Version counters
+    
+    def _department(self, name: str) -> Any:
+        dept = self.factory.registry.get_department(name)
+        if dept is None:
+            raise HTTPError(404, f"Department '{name}' not found")
+        return dept
+    
+    def _departments_etag(self, params: Dict[str, str]) -> str:
+        snapshot = self.factory.registry.snapshot()
+        # Department versions only grow, so their sum changes whenever one does
+        return _etag(snapshot.version, sum(dept.version for dept in snapshot.departments.values()))
+    
+    def _department_etag(self, params: Dict[str, str]) -> str:
+        return _etag(self.factory.registry.version, self._department(params["name"]).version)
+    
+    def _people_etag(self, owner: str) -> str:
+        """
+        Users and classes share User objects: hadracha sets a user's
+        class_name and display_rank comes from the hierarchy, so both ETags
+        follow kochav_adam, hadracha (if loaded) and the hierarchy version
+        """
+        snapshot = self.factory.registry.snapshot()
+        versions = [self._department(owner).version]
+        for name in ("kochav_adam", "hadracha"):
+            dept = snapshot.departments.get(name)
+            if name != owner and dept is not None:
+                versions.append(dept.version)
+        manager = self.factory.hierarchy_manager
+        return _etag(snapshot.version, *versions, manager.version if manager else 0)
+    
+    def _users_etag(self, params: Dict[str, str]) -> str:
+        return self._people_etag("kochav_adam")
+    
+    def _classes_etag(self, params: Dict[str, str]) -> str:
+        return self._people_etag("hadracha")
+    
+    def _events_etag(self, params: Dict[str, str]) -> str:
+        return _etag(self.factory.event_system.sequence)
+    
+    def _automations_etag(self, params: Dict[str, str]) -> str:
+        snapshot = self.factory.registry.snapshot()
+        # Run counts alone miss enabling/disabling and cache hits
+        state = [(automation.enabled, automation.history.runs, automation.last_run)
+                 for autos in snapshot.automations.values()
+                 for automation in autos.values() if automation is not None]
+        return _etag(snapshot.version, zlib.crc32(repr(state).encode("utf-8")))
+    
+    # Handlers
+    
+    def _list_departments(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        snapshot = self.factory.registry.snapshot()
+        departments = []
+        for name in sorted(set(snapshot.departments) | set(snapshot.lazy_departments)):
+            dept = snapshot.departments.get(name)
+            departments.append({
+                "name_en": name,
+                "name": dept.name if dept else None,
+                "loaded": dept is not None,
+                "version": dept.version if dept else None,
+                "automations": sorted(snapshot.automations.get(name, {})),
+            })
+        return Response(200, _json({"registry_version": snapshot.version,
+                                    "departments": departments}))
+    
+    def _get_department(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        return Response(200, _json(self._department(params["name"]).get_info()))
+    
+    def _list_users(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        dept = self._department("kochav_adam")
+        return self._keyset_page("users", dept.version, dept.users, query, _serialize_user)
+    
+    def _get_user(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        user = self._department("kochav_adam").get_user(params["id_number"])
+        if user is None:
+            raise HTTPError(404, f"User '{params['id_number']}' not found")
+        return Response(200, _json(_serialize_user(user)))
+    
+    def _list_classes(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        dept = self._department("hadracha")
+        return self._keyset_page("classes", dept.version, dept.classes, query, _serialize_class)
+    
+    def _get_class(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        dept = self._department("hadracha")
+        classroom = dept.get_class(params["name"])
+        if classroom is None:
+            raise HTTPError(404, f"Class '{params['name']}' not found")
+        students = {student.id_number: student for student in classroom.students}
+        return self._keyset_page(f"classes/{classroom.class_name}", dept.version, students,
+                                 query, _serialize_user, header=_serialize_class(classroom))
+    
+    def _list_events(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        limit, after = self._page_args(query)
+        try:
+            after_sequence = int(after or 0)
+        except ValueError:
+            raise HTTPError(400, "after must be an event sequence number")
+        events = self.factory.event_system.get_events_after(after_sequence, limit + 1,
+                                                            query.get("type"))
+        next_sequence = events[limit - 1].sequence if len(events) > limit else None
+        return self._stream_page({"next": next_sequence}, events[:limit], _serialize_event)
+    
+    def _automation(self, params: Dict[str, str]) -> Any:
+        automation = self.factory.registry.get_automation(params["department"], params["name"])
+        if automation is None:
+            raise HTTPError(404, f"Automation '{params['name']}' not found in department "
+                                 f"'{params['department']}'")
+        return automation
+    
+    def _list_automations(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        snapshot = self.factory.registry.snapshot()
+        status: Dict[str, Dict[str, Any]] = {}
+        for dept_name, autos in sorted(snapshot.automations.items()):
+            status[dept_name] = {
+                auto_name: automation.get_info() if automation is not None else None
+                for auto_name, automation in sorted(autos.items())
+            }
+        return Response(200, _json(status))
+    
+    def _get_automation(self, params: Dict[str, str], query: Dict[str, str]) -> Response:
+        return Response(200, _json(self._automation(params).get_info()))
+    
+    async def _run_automation(self, params: Dict[str, str], body: bytes) -> Response:
+        automation = self._automation(params)
+        try:
+            kwargs = json.loads(body.decode("utf-8")) if body.strip() else {}
+        except ValueError:
+            raise HTTPError(400, "Body must be a JSON object")
+        if not isinstance(kwargs, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        if not automation.can_run():
+            raise HTTPError(409, "Automation is disabled")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, functools.partial(automation.run, **kwargs))
+        return Response(200 if result.get("success") else 500, _json(result))
+
+
+def main():
+    """Serve a freshly initialized BEAST instance"""
+    from beast.core.factory import create_beast
+    
+    parser = argparse.ArgumentParser(description="BEAST HTTP query service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--lazy", action="store_true", help="Load departments on first access")
+    args = parser.parse_args()
+    
+    service = BeastHTTPService(create_beast(lazy=args.lazy), args.host, args.port)
+    
+    async def serve():
+        await service.start()
+        print(f"Serving on http://{service.host}:{service.port}")
+        await service.serve_forever()
+    
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
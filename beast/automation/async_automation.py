@@ -0,0 +1,160 @@
+"""
+Async Base Automation Class
+Automations with an `async def execute`, for database and file-system I/O
+"""
+
+import asyncio
+import inspect
+from abc import abstractmethod
+from typing import Dict, Any, Callable, Optional, Set
+from beast.automation.base_automation import BaseAutomation
+from beast.automation.sinks import StreamSummary
+
+
+class AsyncBaseAutomation(BaseAutomation):
+    """
+    Base class for asyncio-native automations
+    
+    `execute` is a coroutine, or an async generator yielding row chunks
+    (and optionally a StreamSummary). `run_async` returns the same result
+    shape as the synchronous `run`, which stays available for sync callers
+    and drives `run_async` on a private event loop.
+    """
+    
+    reserved_params = ("sink", "progress", "timeout")
+    
+    def __init__(self, department: Any):
+        super().__init__(department)
+        self._cancel_requested = False
+        self._tasks: Set[asyncio.Task] = set()
+    
+    @abstractmethod
+    async def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Execute the automation
+        
+        Long-running implementations should check `self.cancelled` between
+        steps so cancellation is cooperative rather than abrupt.
+        
+        Args:
+            **kwargs: Automation-specific parameters
+        
+        Returns:
+            Result dictionary
+        """
+        pass
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested for the current runs"""
+        return self._cancel_requested
+    
+    def cancel(self):
+        """
+        Cancel the current runs
+        Sets the `cancelled` flag and interrupts pending awaits (thread-safe)
+        """
+        self._cancel_requested = True
+        for task in list(self._tasks):
+            task.get_loop().call_soon_threadsafe(task.cancel)
+    
+    def run(self, sink: Optional[Any] = None,
+            progress: Optional[Callable[[int, int], None]] = None,
+            **kwargs) -> Dict[str, Any]:
+        """Run the automation synchronously (not from inside a running event loop)"""
+        return asyncio.run(self.run_async(sink=sink, progress=progress, **kwargs))
+    
+    async def run_async(self, sink: Optional[Any] = None,
+                        progress: Optional[Callable[[int, int], None]] = None,
+                        timeout: Optional[float] = None,
+                        **kwargs) -> Dict[str, Any]:
+        """
+        Run the automation (async wrapper around execute)
+        
+        Args:
+            sink: Sink for streamed rows (see beast.automation.sinks)
+            progress: Called as progress(rows, chunks) after each chunk
+            timeout: Deadline in seconds (None for no limit)
+            **kwargs: Automation-specific parameters
+        
+        Returns:
+            Result dictionary - failures carry "timed_out" or "cancelled"
+        """
+        if not self.can_run():
+            return {"success": False, "error": "Automation is disabled"}
+        
+        # CPU time is the loop thread's, so it includes interleaved tasks
+        meter = self.history.start()
+        result = await self._run_async(sink, progress, timeout, kwargs)
+        meter.finish(result)
+        return result
+    
+    async def _run_async(self, sink: Optional[Any],
+                         progress: Optional[Callable[[int, int], None]],
+                         timeout: Optional[float],
+                         kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute with caching, streaming, deadline and cancellation - see run_async()"""
+        use_cache = self.result_cache is not None and sink is None
+        if not self._tasks:
+            self._cancel_requested = False
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        stream_state = {"rows": 0, "chunks": 0}
+        try:
+            kwargs = self.resolve_params(kwargs)
+            if use_cache:
+                cached = self._get_cached(kwargs)
+                if cached is not None:
+                    return cached
+            if timeout is None:
+                result = await self._execute(sink, progress, stream_state, kwargs)
+            else:
+                result = await asyncio.wait_for(
+                    self._execute(sink, progress, stream_state, kwargs), timeout)
+            if self._cancel_requested:
+                return self._error_result("Automation was cancelled", stream_state,
+                                          cancelled=True)
+            return self._finish(result, kwargs, use_cache)
+        except asyncio.TimeoutError:
+            return self._error_result(f"Timed out after {timeout} seconds", stream_state,
+                                      timed_out=True)
+        except asyncio.CancelledError:
+            if not self._cancel_requested:
+                # Cancelled by the caller (task.cancel()) - let it propagate
+                raise
+            return self._error_result("Automation was cancelled", stream_state,
+                                      cancelled=True)
+        except Exception as e:
+            return self._error_result(str(e), stream_state)
+        finally:
+            self._tasks.discard(task)
+    
+    async def _execute(self, sink: Optional[Any],
+                       progress: Optional[Callable[[int, int], None]],
+                       stream_state: Dict[str, int],
+                       kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Await execute, piping async-generator output into the sink"""
+        if not inspect.isasyncgenfunction(self.execute):
+            return await self.execute(**kwargs)
+        
+        stream = self.execute(**kwargs)
+        summary = None
+        target = self._open_sink(sink)
+        try:
+            async for item in stream:
+                if isinstance(item, StreamSummary):
+                    summary = item
+                    continue
+                self._write_chunk(target, item, progress, stream_state)
+                if self._cancel_requested:
+                    break
+        finally:
+            await stream.aclose()
+            target.close()
+        return self._stream_summary(summary, sink, target, stream_state)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state['_cancel_requested'] = False
+        state['_tasks'] = set()
+        return state
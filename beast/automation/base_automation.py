@@ -3,14 +3,40 @@ Base Automation Class
 All automations must inherit from this class
 """
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
 from datetime import datetime
+from beast.automation.telemetry import RunHistory
 
 
 class BaseAutomation(ABC):
     """Base class for all automations"""
     
+    # Result caching (opt-in) - see beast.automation.cache
+    cacheable: bool = False
+    cache_ttl: Optional[float] = None
+    # Event type -> parameter names that must match the event data
+    invalidated_by: Dict[str, Tuple[str, ...]] = {}
+    # Upstream automations ("name" or "department.name") - see beast.automation.dag
+    depends_on: Tuple[str, ...] = ()
+    # Event triggers (EventTrigger instances) - see beast.automation.triggers
+    triggers: Tuple[Any, ...] = ()
+    # Keyword arguments consumed by run() and never passed to execute()
+    reserved_params: Tuple[str, ...] = ("sink", "progress")
+    
+    def __init_subclass__(cls, **kwargs):
+        """Reject execute() parameters that run() would swallow"""
+        super().__init_subclass__(**kwargs)
+        execute = cls.__dict__.get("execute")
+        if execute is None:
+            return
+        clashes = [name for name in inspect.signature(execute).parameters
+                   if name in cls.reserved_params]
+        if clashes:
+            raise TypeError(f"{cls.__name__}.execute() cannot take reserved "
+                            f"parameter(s) {', '.join(clashes)} (used by run())")
+    
     def __init__(self, department: Any):
         """
         Initialize automation
@@ -21,6 +47,8 @@ class BaseAutomation(ABC):
         self.department = department
         self.last_run: Optional[datetime] = None
         self.enabled = True
+        self.result_cache = None
+        self.history = RunHistory()
     
     @property
     @abstractmethod
@@ -51,23 +79,152 @@ class BaseAutomation(ABC):
         """Check if automation can run"""
         return self.enabled
     
-    def run(self, **kwargs) -> Dict[str, Any]:
-        """Run the automation (wrapper around execute)"""
+    def resolve_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill in parameter defaults that depend on when the run happens
+        
+        Called before the cache lookup, so a default such as "today" is
+        cached under the actual date. Override in automations that have
+        such defaults.
+        
+        Args:
+            kwargs: Parameters passed to run()
+        
+        Returns:
+            Parameters passed to execute()
+        """
+        return kwargs
+    
+    def run(self, sink: Optional[Any] = None,
+            progress: Optional[Callable[[int, int], None]] = None,
+            **kwargs) -> Dict[str, Any]:
+        """
+        Run the automation (wrapper around execute)
+        
+        `execute` may return a result dictionary, or be a generator that
+        yields rows / row chunks (streaming). Streamed chunks are written to
+        `sink` as they arrive, so memory stays bounded by the chunk size;
+        without a sink they are collected into result["rows"]. The
+        generator's return value (a dictionary, optional) becomes the
+        summary result.
+        
+        Args:
+            sink: Sink for streamed rows (see beast.automation.sinks)
+            progress: Called as progress(rows, chunks) after each chunk
+            **kwargs: Automation-specific parameters
+        
+        Returns:
+            Result dictionary
+        """
         if not self.can_run():
             return {"success": False, "error": "Automation is disabled"}
         
+        meter = self.history.start()
+        result = self._run(sink, progress, kwargs)
+        meter.finish(result)
+        return result
+    
+    def _run(self, sink: Optional[Any],
+             progress: Optional[Callable[[int, int], None]],
+             kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute with caching and streaming - see run()"""
+        use_cache = self.result_cache is not None and sink is None
+        stream_state = {"rows": 0, "chunks": 0}
         try:
+            kwargs = self.resolve_params(kwargs)
+            if use_cache:
+                cached = self._get_cached(kwargs)
+                if cached is not None:
+                    return cached
             result = self.execute(**kwargs)
-            self.last_run = datetime.now()
-            result["success"] = True
-            result["timestamp"] = self.last_run.isoformat()
-            return result
+            if isinstance(result, Iterator):
+                target = self._open_sink(sink)
+                try:
+                    while True:
+                        try:
+                            item = next(result)
+                        except StopIteration as stop:
+                            summary = stop.value
+                            break
+                        self._write_chunk(target, item, progress, stream_state)
+                finally:
+                    target.close()
+                result = self._stream_summary(summary, sink, target, stream_state)
+            return self._finish(result, kwargs, use_cache)
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._error_result(str(e), stream_state)
+    
+    def _get_cached(self, kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Look up a cached result"""
+        cached = self.result_cache.get(self, kwargs)
+        if cached is not None:
+            cached["cached"] = True
+        return cached
+    
+    def _finish(self, result: Dict[str, Any], kwargs: Dict[str, Any],
+                use_cache: bool) -> Dict[str, Any]:
+        """Attach run metadata to a successful result"""
+        self.last_run = datetime.now()
+        result["success"] = True
+        result["timestamp"] = self.last_run.isoformat()
+        if use_cache:
+            self.result_cache.put(self, kwargs, result)
+        return result
+    
+    def _error_result(self, error: str, stream_state: Dict[str, int],
+                      **extra) -> Dict[str, Any]:
+        """Build a failed result"""
+        result = {
+            "success": False,
+            "error": error,
+            "timestamp": datetime.now().isoformat()
+        }
+        if stream_state["chunks"]:
+            result["row_count"] = stream_state["rows"]
+        result.update(extra)
+        return result
+    
+    @staticmethod
+    def _open_sink(sink: Optional[Any]) -> Any:
+        """Open the sink for a streaming run (rows are collected if none is given)"""
+        from beast.automation.sinks import CollectSink
+        
+        target = sink if sink is not None else CollectSink()
+        target.open()
+        return target
+    
+    @staticmethod
+    def _write_chunk(target: Any, item: Any,
+                     progress: Optional[Callable[[int, int], None]],
+                     state: Dict[str, int]):
+        """Write one streamed item to the sink and report progress"""
+        from beast.automation.sinks import as_chunk
+        
+        chunk = as_chunk(item)
+        target.write_rows(chunk)
+        state["rows"] += len(chunk)
+        state["chunks"] += 1
+        if progress:
+            progress(state["rows"], state["chunks"])
+    
+    @staticmethod
+    def _stream_summary(summary: Optional[Dict[str, Any]], sink: Optional[Any],
+                        target: Any, state: Dict[str, int]) -> Dict[str, Any]:
+        """Build the result of a streaming run"""
+        result = dict(summary) if summary else {}
+        result["row_count"] = state["rows"]
+        result["chunk_count"] = state["chunks"]
+        if sink is None:
+            result["rows"] = target.rows
+        else:
+            result["sink"] = target.describe()
+        return result
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Result caches are per-process and are not pickled"""
+        state = self.__dict__.copy()
+        state['result_cache'] = None
+        return state
     
     def get_info(self) -> Dict[str, Any]:
         """Get automation information"""
@@ -76,5 +233,6 @@ class BaseAutomation(ABC):
             "name_en": self.name_en,
             "department": self.department.name_en if self.department else None,
             "enabled": self.enabled,
-            "last_run": self.last_run.isoformat() if self.last_run else None
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "stats": self.history.summary()
         }
@@ -0,0 +1,273 @@
+"""
+Automation Result Cache
+LRU/TTL cache for automation results with event-driven invalidation
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+from beast.core.event_system import Event, EventSystem
+
+
+# Result keys that change on every run and must not affect fingerprints
+_VOLATILE_KEYS = ("timestamp", "cached")
+
+
+def result_fingerprint(result: Dict[str, Any]) -> str:
+    """Stable hash of a result's content (run metadata excluded)"""
+    content = {k: v for k, v in result.items() if k not in _VOLATILE_KEYS}
+    encoded = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def upstream_fingerprint(upstream: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Fingerprint of the upstream results the DAG executor passes to a node
+    
+    Uses the `fingerprint` attribute the executor attaches, if present,
+    instead of hashing every result again.
+    """
+    fingerprint = getattr(upstream, "fingerprint", None)
+    if fingerprint is None:
+        fingerprint = result_fingerprint(
+            {node: result_fingerprint(result) for node, result in upstream.items()})
+    return fingerprint
+
+
+def normalize_kwargs(kwargs: Dict[str, Any]) -> Tuple:
+    """
+    Build a hashable, order-independent key from automation parameters
+    None values are dropped, so run() and run(class_name=None) share a key.
+    Upstream results carry run timestamps and are keyed by their content
+    fingerprint instead.
+    """
+    return tuple(sorted(
+        (key, upstream_fingerprint(value) if key == "upstream" else _freeze(value))
+        for key, value in kwargs.items() if value is not None))
+
+
+def _freeze(value: Any) -> Any:
+    """Convert nested containers to hashable equivalents"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+class _CacheEntry:
+    __slots__ = ("result", "expires_at", "params")
+    
+    def __init__(self, result: Dict[str, Any], expires_at: Optional[float],
+                 params: Dict[str, Any]):
+        self.result = result
+        self.expires_at = expires_at
+        self.params = params
+
+
+class AutomationResultCache:
+    """
+    Opt-in cache for BaseAutomation.run results
+    
+    Automations opt in with `cacheable = True` and declare the events that
+    invalidate them in `invalidated_by`, mapping an event type to the
+    parameter names that must match the event data, e.g.
+    {"student_added_to_class": ("class_name",)}. An entry is evicted when
+    every listed parameter either equals the event's value or is absent on
+    one side (a school-wide report is affected by any class).
+    
+    Results are deep-copied on the way in and out, so callers may modify
+    what they get back.
+    """
+    
+    def __init__(self, event_system: Optional[EventSystem] = None,
+                 max_entries: int = 1024,
+                 default_ttl: Optional[float] = None):
+        """
+        Initialize cache
+        
+        Args:
+            event_system: Event system to subscribe to for invalidation
+            max_entries: Maximum cached results (least recently used evicted first)
+            default_ttl: Seconds before an entry expires (None for no expiry),
+                overridden by an automation's `cache_ttl`
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.event_system = event_system
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        # Automation ID -> keys of its entries, for targeted invalidation
+        self._keys_by_automation: Dict[str, set] = {}
+        # Event type -> automations it invalidates
+        self._listeners: Dict[str, List[Any]] = {}
+        self._lock = threading.RLock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def automation_id(automation: Any) -> str:
+        """Identify an automation by department and name"""
+        department = automation.department.name_en if automation.department else None
+        return f"{department}.{automation.name_en}"
+    
+    def attach(self, automation: Any) -> bool:
+        """
+        Enable caching for an automation and subscribe to its invalidation events
+        
+        Args:
+            automation: Automation instance
+        
+        Returns:
+            True if the automation opted in and was attached
+        """
+        if automation is None or not getattr(automation, "cacheable", False):
+            return False
+        
+        automation.result_cache = self
+        with self._lock:
+            for event_type in automation.invalidated_by:
+                listeners = self._listeners.setdefault(event_type, [])
+                if automation not in listeners:
+                    listeners.append(automation)
+                if self.event_system:
+                    self.event_system.subscribe(event_type, self._on_event)
+        return True
+    
+    def detach(self, automation: Any):
+        """Disable caching for an automation and drop its entries"""
+        if getattr(automation, "result_cache", None) is self:
+            automation.result_cache = None
+        with self._lock:
+            for event_type, listeners in list(self._listeners.items()):
+                if automation in listeners:
+                    listeners.remove(automation)
+                if not listeners:
+                    del self._listeners[event_type]
+                    if self.event_system:
+                        self.event_system.unsubscribe(event_type, self._on_event)
+            self._drop_keys(list(self._keys_by_automation.get(self.automation_id(automation), ())))
+    
+    def get(self, automation: Any, kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+        
+        Returns:
+            A deep copy of the cached result, or None on a miss
+        """
+        key = (self.automation_id(automation), normalize_kwargs(kwargs))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None \
+                    and entry.expires_at <= time.monotonic():
+                self._drop_keys([key])
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry.result
+        return copy.deepcopy(result)
+    
+    def put(self, automation: Any, kwargs: Dict[str, Any], result: Dict[str, Any]):
+        """Store a result"""
+        auto_id = self.automation_id(automation)
+        key = (auto_id, normalize_kwargs(kwargs))
+        ttl = getattr(automation, "cache_ttl", None)
+        if ttl is None:
+            ttl = self.default_ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        params = {k: v for k, v in kwargs.items() if v is not None and k != "upstream"}
+        entry = _CacheEntry(copy.deepcopy(result), expires_at, params)
+        
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._keys_by_automation.setdefault(auto_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop_keys([oldest])
+                self.evictions += 1
+    
+    def invalidate(self, automation: Any, match: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Evict an automation's entries
+        
+        Args:
+            automation: Automation instance
+            match: Only evict entries whose parameters match these values
+                (missing on either side counts as a match); None evicts all
+        
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock:
+            keys = self._keys_by_automation.get(self.automation_id(automation), set())
+            if match is None:
+                affected = list(keys)
+            else:
+                affected = [key for key in keys
+                            if self._matches(self._entries[key].params, match)]
+            self._drop_keys(affected)
+            self.invalidations += len(affected)
+            return len(affected)
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_automation.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+    
+    def _on_event(self, event: Event):
+        """Evict the entries affected by an event"""
+        with self._lock:
+            for automation in list(self._listeners.get(event.event_type, ())):
+                keys = automation.invalidated_by.get(event.event_type) or ()
+                match = {k: event.data[k] for k in keys if k in event.data}
+                self.invalidate(automation, match)
+    
+    @staticmethod
+    def _matches(params: Dict[str, Any], match: Dict[str, Any]) -> bool:
+        for key, value in match.items():
+            if key in params and params[key] != value:
+                return False
+        return True
+    
+    def _drop_keys(self, keys: List[Tuple]):
+        """Remove entries and their index records - caller holds the lock"""
+        for key in keys:
+            self._entries.pop(key, None)
+            auto_keys = self._keys_by_automation.get(key[0])
+            if auto_keys is not None:
+                auto_keys.discard(key)
+                if not auto_keys:
+                    del self._keys_by_automation[key[0]]
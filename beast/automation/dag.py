@@ -0,0 +1,267 @@
+"""
+Automation DAG Executor
+Runs automations in dependency order, passing results downstream
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Set
+from beast.core.registry import Registry
+from beast.automation import worker
+from beast.automation.cache import result_fingerprint
+
+
+class UpstreamResults(dict):
+    """
+    The upstream results passed to a node, {node_id: result}
+    
+    `fingerprint` identifies their content without run timestamps. The
+    DAG's memo and the result cache key on it instead of on the results.
+    """
+    
+    def __init__(self, results: Dict[str, Dict[str, Any]]):
+        super().__init__(results)
+        self.fingerprint = result_fingerprint(
+            {node: result_fingerprint(result) for node, result in results.items()})
+
+
+class AutomationDAG:
+    """
+    Dependency graph over the automations in a Registry
+    
+    Automations declare upstream dependencies in `depends_on` - either
+    "automation" (same department) or "department.automation". A node
+    receives its upstream results as `upstream={node_id: result}` (an
+    UpstreamResults).
+    
+    The DAG remembers each node's inputs between runs: a downstream node
+    whose kwargs and upstream results are unchanged is not executed again,
+    its previous result is reused.
+    """
+    
+    def __init__(self, registry: Registry):
+        """
+        Initialize DAG
+        
+        Args:
+            registry: Registry holding the automations
+        """
+        self.registry = registry
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        # Node ID -> (input fingerprint, result) from the last successful run
+        self._memo: Dict[str, tuple] = {}
+        self.build()
+    
+    @staticmethod
+    def node_id(department: str, automation_name: str) -> str:
+        return f"{department}.{automation_name}"
+    
+    def build(self):
+        """(Re)build the graph from the registry"""
+        dependencies: Dict[str, List[str]] = {}
+        for dept_name, auto_names in self.registry.list_automations().items():
+            for auto_name in auto_names:
+                automation = self.registry.get_automation(dept_name, auto_name)
+                declared = getattr(automation, "depends_on", ()) if automation else ()
+                dependencies[self.node_id(dept_name, auto_name)] = [
+                    dep if "." in dep else self.node_id(dept_name, dep) for dep in declared
+                ]
+        
+        dependents: Dict[str, List[str]] = {node: [] for node in dependencies}
+        for node, deps in dependencies.items():
+            for dep in deps:
+                if dep not in dependencies:
+                    raise ValueError(f"Automation '{node}' depends on unknown automation '{dep}'")
+                dependents[dep].append(node)
+        
+        self.dependencies = dependencies
+        self.dependents = dependents
+        self._memo = {node: memo for node, memo in self._memo.items() if node in dependencies}
+        self.topological_order()
+    
+    def topological_order(self, nodes: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Order nodes so every dependency comes first
+        
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        selected = set(nodes) if nodes is not None else set(self.dependencies)
+        remaining = {node: len([d for d in self.dependencies[node] if d in selected])
+                     for node in selected}
+        ready = sorted(node for node, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for dependent in self.dependents[node]:
+                if dependent in remaining:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+        if len(order) != len(selected):
+            cycle = sorted(set(selected) - set(order))
+            raise ValueError(f"Automation dependencies contain a cycle: {', '.join(cycle)}")
+        return order
+    
+    def upstream_closure(self, targets: Iterable[str]) -> Set[str]:
+        """Targets plus everything they transitively depend on"""
+        closure: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            node = stack.pop()
+            if node in closure:
+                continue
+            if node not in self.dependencies:
+                raise ValueError(f"Unknown automation: '{node}'")
+            closure.add(node)
+            stack.extend(self.dependencies[node])
+        return closure
+    
+    def run(self, targets: Optional[Iterable[str]] = None,
+            changed: Optional[Iterable[str]] = None,
+            kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+            parallelism: int = 4,
+            executor: str = "thread") -> Dict[str, Any]:
+        """
+        Execute the graph, running independent branches in parallel
+        
+        Args:
+            targets: Node IDs to produce (None for the whole graph); their
+                upstream dependencies are included automatically
+            changed: Node IDs known to have changed - only these are forced
+                to run; other nodes with a previous result reuse it unless
+                their inputs changed (None forces every source node to run)
+            kwargs: Per-node parameters, keyed by node ID
+            parallelism: Maximum number of concurrent runs
+            executor: "thread" or "process"
+        
+        Returns:
+            Summary with an entry per node ("succeeded", "reused", "failed"
+            or "skipped") in execution order
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor type: {executor}")
+        
+        kwargs = kwargs or {}
+        selected = self.upstream_closure(targets) if targets is not None else set(self.dependencies)
+        order = self.topological_order(selected)
+        forced = set(changed) if changed is not None else None
+        started = time.perf_counter()
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        waiting = {node: set(self.dependencies[node]) for node in order}
+        ready = [node for node in order if not waiting[node]]
+        in_flight: Dict[Any, tuple] = {}
+        
+        if executor == "process":
+            departments = sorted({node.split(".", 1)[0] for node in order})
+            context = worker.build_worker_context(self.registry, departments)
+            pool = ProcessPoolExecutor(max_workers=parallelism,
+                                       initializer=worker.init_worker,
+                                       initargs=(context,))
+        else:
+            pool = ThreadPoolExecutor(max_workers=parallelism,
+                                      thread_name_prefix="beast-dag")
+        
+        def settle(node: str, entry: Dict[str, Any]):
+            results[node] = entry
+            for dependent in self.dependents[node]:
+                if dependent in waiting:
+                    waiting[dependent].discard(node)
+                    if not waiting[dependent]:
+                        ready.append(dependent)
+        
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < parallelism:
+                    node = ready.pop(0)
+                    entry = self._prepare(node, results, forced, kwargs.get(node, {}))
+                    if "status" in entry:
+                        settle(node, entry)
+                        continue
+                    dept_name, auto_name = node.split(".", 1)
+                    if executor == "process":
+                        future = pool.submit(worker.run_automation_timed,
+                                             dept_name, auto_name, entry["kwargs"])
+                    else:
+                        automation = self.registry.get_automation(dept_name, auto_name)
+                        future = pool.submit(worker.run_timed, automation, entry["kwargs"])
+                    in_flight[future] = (node, entry["fingerprint"])
+                
+                if not in_flight:
+                    continue
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, fingerprint = in_flight.pop(future)
+                    settle(node, self._complete(node, fingerprint, future))
+        finally:
+            pool.shutdown(wait=True)
+        
+        ordered = {node: results[node] for node in order}
+        return {
+            "success": all(entry["status"] in ("succeeded", "reused")
+                           for entry in ordered.values()),
+            "timestamp": datetime.now().isoformat(),
+            "wall_time": time.perf_counter() - started,
+            "results": ordered,
+        }
+    
+    def _prepare(self, node: str, results: Dict[str, Dict[str, Any]],
+                 forced: Optional[Set[str]], node_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide whether a ready node runs, is reused or is skipped"""
+        dept_name, auto_name = node.split(".", 1)
+        automation = self.registry.get_automation(dept_name, auto_name)
+        if automation is None:
+            return {"status": "skipped", "reason": "not implemented"}
+        if not automation.can_run():
+            return {"status": "skipped", "reason": "disabled"}
+        
+        upstream = {}
+        for dep in self.dependencies[node]:
+            dep_entry = results[dep]
+            if dep_entry["status"] not in ("succeeded", "reused"):
+                return {"status": "skipped", "reason": f"upstream '{dep}' did not succeed"}
+            upstream[dep] = dep_entry["result"]
+        
+        call_kwargs = dict(node_kwargs)
+        upstream_key = None
+        if upstream:
+            upstream = call_kwargs["upstream"] = UpstreamResults(upstream)
+            upstream_key = upstream.fingerprint
+        fingerprint = result_fingerprint({"kwargs": node_kwargs, "upstream": upstream_key})
+        
+        if forced is None:
+            # Source nodes read live department state, so they always run
+            must_run = not self.dependencies[node]
+        else:
+            must_run = node in forced
+        memo = self._memo.get(node)
+        if memo is not None and memo[0] == fingerprint and not must_run:
+            return {"status": "reused", "result": memo[1], "wall_time": 0.0, "cpu_time": 0.0}
+        return {"kwargs": call_kwargs, "fingerprint": fingerprint}
+    
+    def _complete(self, node: str, fingerprint: str, future) -> Dict[str, Any]:
+        """Build the entry for a finished node and remember its inputs"""
+        try:
+            timed = future.result()
+        except Exception as e:
+            self._memo.pop(node, None)
+            return {"status": "failed", "error": str(e)}
+        
+        result = timed["result"]
+        entry = {
+            "result": result,
+            "wall_time": timed["wall_time"],
+            "cpu_time": timed["cpu_time"],
+        }
+        if result.get("success"):
+            entry["status"] = "succeeded"
+            self._memo[node] = (fingerprint, result)
+        else:
+            entry["status"] = "failed"
+            entry["error"] = result.get("error")
+            self._memo.pop(node, None)
+        return entry
@@ -3,13 +3,26 @@ Daily Attendance Automation
 Tracks student attendance
 """
 
+from datetime import date as date_type
 from typing import Dict, Any
 from beast.automation.base_automation import BaseAutomation
+from beast.automation.triggers import EventTrigger
 
 
 class DailyAttendanceAutomation(BaseAutomation):
     """אוטומציית נוכחות יומית"""
     
+    cacheable = True
+    invalidated_by = {
+        "class_created": ("class_name",),
+        "student_added_to_class": ("class_name",),
+    }
+    # Re-run once per class after a burst of roster changes settles
+    triggers = (
+        EventTrigger("student_added_to_class", key=("class_name",),
+                     debounce=2.0, max_wait=30.0),
+    )
+    
     @property
     def name(self) -> str:
         return "נוכחות יומית"
@@ -18,6 +31,12 @@ class DailyAttendanceAutomation(BaseAutomation):
     def name_en(self) -> str:
         return "daily_attendance"
     
+    def resolve_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve the default date, so a cached "today" is not served tomorrow"""
+        if kwargs.get("date") is None:
+            kwargs = dict(kwargs, date=date_type.today().isoformat())
+        return kwargs
+    
     def execute(self, class_name: str = None, date: str = None, **kwargs) -> Dict[str, Any]:
         """
         Execute attendance tracking
@@ -32,7 +51,7 @@ class DailyAttendanceAutomation(BaseAutomation):
         # This is a placeholder - in production, this would query database
         result = {
             "class_name": class_name,
-            "date": date or "today",
+            "date": date or date_type.today().isoformat(),
             "attendance": []
         }
         
@@ -3,13 +3,20 @@ Grades Report Automation
 Generates grade reports
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 from beast.automation.base_automation import BaseAutomation
 
 
 class GradesReportAutomation(BaseAutomation):
     """אוטומציית דוח ציונים"""
     
+    cacheable = True
+    invalidated_by = {
+        "class_created": ("class_name",),
+        "student_added_to_class": ("class_name",),
+    }
+    depends_on = ("daily_attendance",)
+    
     @property
     def name(self) -> str:
         return "דוח ציונים"
@@ -18,22 +25,49 @@ class GradesReportAutomation(BaseAutomation):
     def name_en(self) -> str:
         return "grades_report"
     
-    def execute(self, class_name: str = None, subject: str = None, **kwargs) -> Dict[str, Any]:
+    def execute(self, class_name: str = None, subject: str = None,
+                upstream: Optional[Dict[str, Dict[str, Any]]] = None,
+                **kwargs) -> Iterator[List[Dict[str, Any]]]:
         """
-        Generate grades report
+        Generate grades report, streamed one class at a time
         
         Args:
             class_name: Specific class (optional)
             subject: Specific subject (optional)
+            upstream: Upstream results when run from the DAG executor (optional)
+        
+        Yields:
+            One chunk of grade rows per class
         
         Returns:
-            Grades report
+            Report summary
         """
-        # Placeholder implementation
-        result = {
+        classes = getattr(self.department, "classes", {})
+        if class_name is not None:
+            classrooms = [classes[class_name]] if class_name in classes else []
+        else:
+            classrooms = list(classes.values())
+        
+        for classroom in classrooms:
+            # Placeholder grades - in production, this would query database
+            yield [{
+                "class_name": classroom.class_name,
+                "student_id": student.id_number,
+                "student_name": student.full_name,
+                "subject": subject,
+                "grade": None,
+            } for student in classroom.students]
+        
+        summary = {
             "class_name": class_name,
             "subject": subject,
-            "grades": []
+            "class_count": len(classrooms),
         }
         
-        return result
+        # Attendance from the daily_attendance run, for attendance-weighted grades
+        attendance = (upstream or {}).get(f"{self.department.name_en}.daily_attendance")
+        if attendance:
+            summary["attendance"] = attendance.get("attendance", [])
+            summary["total_students"] = attendance.get("total_students")
+        
+        return summary
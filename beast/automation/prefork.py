@@ -0,0 +1,291 @@
+"""
+Pre-Fork Worker Pool
+Serves automation and report requests from forked workers that share the parent's state
+"""
+
+import gc
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from beast.automation import worker
+
+if TYPE_CHECKING:
+    from beast.core.factory import BeastFactory
+
+# The started pool; forked workers inherit it together with the factory
+_active_pool: Optional['PreforkPool'] = None
+# Startup tasks wait here until every worker runs one (inherited, not pickled)
+_start_barrier = None
+# Seconds a worker waits for the others to be forked
+START_TIMEOUT = 60.0
+
+
+def _in_worker() -> bool:
+    return _active_pool is not None and os.getpid() != _active_pool.owner_pid
+
+
+def _get_department(department: str) -> Any:
+    dept = _active_pool.factory.registry.get_department(department)
+    if dept is None:
+        raise ValueError(f"Department '{department}' not found")
+    return dept
+
+
+def _run_in_worker(department: str, automation_name: str,
+                   kwargs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Task body - run an automation from the inherited registry"""
+    automation = _active_pool.factory.registry.get_automation(department, automation_name)
+    if automation is None:
+        raise ValueError(f"Automation '{automation_name}' not found in department '{department}'")
+    timed = worker.run_timed(automation, kwargs)
+    timed["worker"] = os.getpid()
+    return timed
+
+
+def _wait_for_workers() -> int:
+    """Startup task - hold a worker until all of them are running one"""
+    _start_barrier.wait(START_TIMEOUT)
+    return os.getpid()
+
+
+def _read_in_worker(department: str, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Task body - call a read-only department method"""
+    return getattr(_get_department(department), method)(*args, **kwargs)
+
+
+def route_write(department: str, method: str, *args, **kwargs):
+    """
+    Apply a department write in the owning (parent) process
+    
+    Inside a pre-fork worker the call is queued to the parent and applied
+    there in arrival order; the worker's own copy is left untouched, so it
+    only sees the write after PreforkPool.refresh(). Outside a worker the
+    write is applied immediately. Arguments are pickled when routed.
+    
+    Args:
+        department: Department name
+        method: Department method to call (e.g. "register_user")
+        *args, **kwargs: Method arguments
+    """
+    if _in_worker():
+        _active_pool._write_queue.put((department, method, args, kwargs))
+    elif _active_pool is not None:
+        _active_pool.write(department, method, *args, **kwargs)
+    else:
+        raise RuntimeError("No pre-fork pool is running")
+
+
+class PreforkPool:
+    """
+    Worker processes forked from a fully loaded BEAST instance
+    
+    The parent loads every department (users, hierarchy, class rosters),
+    then freezes the garbage collector (gc.freeze) and forks the workers.
+    Workers read the parent's objects through copy-on-write pages instead
+    of each loading or unpickling its own copy, and the frozen collector
+    never walks (and so never dirties) those pages. Reads and automation
+    runs are served by the workers; writes are applied by the parent only
+    (see write() and route_write()). Workers keep the state they were
+    forked with until refresh() forks a new generation.
+    
+    Requires the "fork" start method (Linux, macOS). Start the pool before
+    starting scheduler, trigger or watcher threads: forking copies every
+    lock in whatever state another thread holds it. Events emitted and run
+    history recorded inside a worker stay in that worker. Only one pool
+    can run per process.
+    """
+    
+    def __init__(self, factory: 'BeastFactory', workers: Optional[int] = None,
+                 freeze: bool = True):
+        """
+        Initialize pool
+        
+        Args:
+            factory: Initialized factory owning the state and all writes
+            workers: Number of worker processes (defaults to the CPU count)
+            freeze: Freeze the parent's objects before forking (gc.freeze)
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("Pre-fork mode requires the 'fork' start method")
+        workers = workers or os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.factory = factory
+        self.workers = workers
+        self.freeze = freeze
+        self.owner_pid = os.getpid()
+        self.forked_version: Optional[int] = None
+        self.writes_since_fork = 0
+        self.generation = 0
+        self._context = multiprocessing.get_context("fork")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._write_queue = None
+        self._writer: Optional[threading.Thread] = None
+        self._write_lock = threading.RLock()
+    
+    def start(self) -> 'PreforkPool':
+        """Load all departments and fork the workers"""
+        global _active_pool, _start_barrier
+        if self._executor is not None:
+            return self
+        if _active_pool is not None and _active_pool is not self:
+            raise ValueError("Another pre-fork pool is already running")
+        
+        registry = self.factory.registry
+        # Lazy departments must live in the shared heap, not be loaded per worker
+        for name in registry.list_departments():
+            registry.get_department(name)
+        
+        _active_pool = self
+        self._write_queue = self._context.SimpleQueue()
+        # Hold the write lock so no write is half-applied in the forked copies
+        with self._write_lock:
+            if self.freeze:
+                gc.collect()
+                gc.freeze()
+            try:
+                _start_barrier = self._context.Barrier(self.workers)
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=self._context)
+                # Before Python 3.11 the executor forks workers one at a time
+                # as tasks arrive; tasks that block until all of them run
+                # force every fork to happen here, while frozen and locked
+                startup = [self._executor.submit(_wait_for_workers)
+                           for _ in range(self.workers)]
+                forked = {future.result() for future in startup}
+                if len(forked) != self.workers:
+                    raise RuntimeError(f"Forked {len(forked)} of {self.workers} workers")
+            except BaseException:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                _active_pool = None
+                raise
+            finally:
+                if self.freeze:
+                    # The parent keeps mutating its objects; only workers stay frozen
+                    gc.unfreeze()
+            self.forked_version = registry.version
+            self.writes_since_fork = 0
+            self.generation += 1
+        
+        self._writer = threading.Thread(target=self._apply_routed_writes,
+                                        args=(self._write_queue,),
+                                        name="beast-prefork-writer", daemon=True)
+        self._writer.start()
+        return self
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the workers and apply writes they already routed"""
+        global _active_pool
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._writer is not None:
+            # After a waited shutdown the workers have exited, so the sentinel
+            # is the last item in the queue
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if _active_pool is self:
+            _active_pool = None
+    
+    def refresh(self):
+        """Fork a new generation of workers from the parent's current state"""
+        self.shutdown()
+        self.start()
+    
+    @property
+    def stale(self) -> bool:
+        """Whether the parent changed since the workers were forked"""
+        return (self.writes_since_fork > 0
+                or self.factory.registry.version != self.forked_version)
+    
+    def _require_started(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            raise RuntimeError("Pre-fork pool is not running")
+        return self._executor
+    
+    def submit(self, department: str, automation_name: str,
+               kwargs: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Run an automation in a worker
+        
+        Args:
+            department: Department name
+            automation_name: Automation name
+            kwargs: Automation parameters (pickled)
+        
+        Returns:
+            Future resolving to the run result, wall time, CPU time and
+            the worker's process id
+        """
+        return self._require_started().submit(_run_in_worker, department,
+                                              automation_name, kwargs)
+    
+    def run(self, department: str, automation_name: str,
+            kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run an automation in a worker and wait for it (see submit())"""
+        return self.submit(department, automation_name, kwargs).result()
+    
+    def map(self, requests: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]
+            ) -> List[Dict[str, Any]]:
+        """
+        Run many automations across the workers
+        
+        Args:
+            requests: (department, automation_name, kwargs) tuples
+        
+        Returns:
+            Results in request order
+        """
+        futures = [self.submit(*request) for request in requests]
+        return [future.result() for future in futures]
+    
+    def read(self, department: str, method: str, *args, **kwargs) -> Any:
+        """
+        Call a read-only department method in a worker
+        
+        The return value is pickled back to the caller, e.g.
+        pool.read("hadracha", "get_class", "יא-1").
+        """
+        return self._require_started().submit(_read_in_worker, department, method,
+                                              args, kwargs).result()
+    
+    def write(self, department: str, method: str, *args, **kwargs) -> Any:
+        """
+        Apply a department write in the parent
+        
+        Workers do not see the change until refresh().
+        
+        Returns:
+            The method's return value
+        """
+        with self._write_lock:
+            dept = self.factory.registry.get_department(department)
+            if dept is None:
+                raise ValueError(f"Department '{department}' not found")
+            result = getattr(dept, method)(*args, **kwargs)
+            self.writes_since_fork += 1
+            return result
+    
+    def _apply_routed_writes(self, queue):
+        """Writer thread - apply writes routed from workers, in arrival order"""
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            department, method, args, kwargs = item
+            try:
+                self.write(department, method, *args, **kwargs)
+            except Exception as e:
+                print(f"Warning: Routed write {department}.{method} failed: {e}")
+    
+    def __enter__(self) -> 'PreforkPool':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
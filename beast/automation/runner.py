@@ -0,0 +1,201 @@
+"""
+Parallel Automation Runner
+Runs every registered automation concurrently across departments
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from beast.core.registry import Registry
+from beast.automation import worker
+
+
+def _collect_jobs(registry: Registry, department: Optional[str]
+                  ) -> Tuple[List[Tuple[str, str, Any]], List[Dict[str, Any]]]:
+    """Split registered automations into runnable jobs and skipped entries"""
+    jobs = []
+    skipped = []
+    for dept_name, auto_names in registry.list_automations(department).items():
+        for auto_name in auto_names:
+            automation = registry.get_automation(dept_name, auto_name)
+            if automation is None:
+                reason = "not implemented"
+            elif not automation.can_run():
+                reason = "disabled"
+            else:
+                jobs.append((dept_name, auto_name, automation))
+                continue
+            skipped.append({
+                "department": dept_name,
+                "automation": auto_name,
+                "status": "skipped",
+                "reason": reason,
+            })
+    return jobs, skipped
+
+
+def run_all(registry: Registry,
+            department: Optional[str] = None,
+            parallelism: int = 4,
+            executor: str = "thread",
+            timeout: Optional[float] = None,
+            kwargs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Run all registered automations concurrently
+    
+    Placeholder (None) and disabled automations are reported as skipped.
+    At most `parallelism` jobs are in flight, and each is handed to a pool
+    with a free worker, so its timeout covers only its own run (plus worker
+    start-up for process pools). A run that exceeds its timeout is
+    abandoned and its result discarded. It still holds its worker, so the
+    remaining jobs are sent to a fresh pool. With process pools the old
+    pool's workers are killed once its other runs finish; a thread cannot
+    be interrupted, so an abandoned thread run keeps going in the
+    background (and delays interpreter exit until it returns).
+    
+    Args:
+        registry: Registry holding the automations
+        department: Only run this department's automations (None for all)
+        parallelism: Maximum number of concurrent runs
+        executor: "thread" or "process"
+        timeout: Per-job timeout in seconds (None for no limit)
+        kwargs: Per-automation parameters, keyed by "department.automation"
+    
+    Returns:
+        Summary with a result entry per automation, including wall-clock
+        and CPU time for each run
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor type: {executor}")
+    if parallelism < 1:
+        raise ValueError("parallelism must be at least 1")
+    
+    kwargs = kwargs or {}
+    jobs, results = _collect_jobs(registry, department)
+    started = time.perf_counter()
+    
+    if executor == "process":
+        # Ship only the departments involved, once per worker process
+        context = worker.build_worker_context(registry, sorted({job[0] for job in jobs}))
+    
+    def create_pool():
+        if executor == "process":
+            return ProcessPoolExecutor(max_workers=parallelism,
+                                       initializer=worker.init_worker,
+                                       initargs=(context,))
+        return ThreadPoolExecutor(max_workers=parallelism,
+                                  thread_name_prefix="beast-run-all")
+    
+    pool = create_pool()
+    pools = [pool]
+    # Pools running an abandoned job
+    abandoned_pools: List[Any] = []
+    pending = list(reversed(jobs))
+    in_flight: Dict[Any, Tuple[str, str, float, Any]] = {}
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < parallelism:
+                dept_name, auto_name, automation = pending.pop()
+                job_kwargs = kwargs.get(f"{dept_name}.{auto_name}", {})
+                if executor == "process":
+                    future = pool.submit(worker.run_automation_timed,
+                                         dept_name, auto_name, job_kwargs)
+                else:
+                    future = pool.submit(worker.run_timed, automation, job_kwargs)
+                in_flight[future] = (dept_name, auto_name, time.perf_counter(), pool)
+            
+            wait_for = None
+            if timeout is not None:
+                earliest = min(entry[2] for entry in in_flight.values())
+                wait_for = max(0.0, earliest + timeout - time.perf_counter())
+            done, _ = wait(list(in_flight), timeout=wait_for, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                dept_name, auto_name, _, _ = in_flight.pop(future)
+                results.append(_job_result(dept_name, auto_name, future))
+            
+            if timeout is not None:
+                now = time.perf_counter()
+                for future, (dept_name, auto_name, submitted, owner) in list(in_flight.items()):
+                    if now - submitted >= timeout:
+                        future.cancel()
+                        del in_flight[future]
+                        results.append({
+                            "department": dept_name,
+                            "automation": auto_name,
+                            "status": "timeout",
+                            "success": False,
+                            "error": f"Timed out after {timeout} seconds",
+                            "wall_time": now - submitted,
+                            "cpu_time": None,
+                        })
+                        if owner not in abandoned_pools:
+                            abandoned_pools.append(owner)
+                if pool in abandoned_pools and pending:
+                    # Jobs still in flight finish on the old pool (a process
+                    # pool is shut down below, when its workers are killed)
+                    if executor == "thread":
+                        pool.shutdown(wait=False)
+                    pool = create_pool()
+                    pools.append(pool)
+            
+            if executor == "process":
+                busy = [entry[3] for entry in in_flight.values()]
+                for owner in [owner for owner in abandoned_pools if owner not in busy]:
+                    abandoned_pools.remove(owner)
+                    _kill_workers(owner)
+    finally:
+        # Do not block on abandoned (timed-out) runs
+        for pool in pools:
+            if executor == "process" and pool in abandoned_pools:
+                _kill_workers(pool)
+            else:
+                pool.shutdown(wait=False)
+    
+    counts: Dict[str, int] = {}
+    for entry in results:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    
+    return {
+        "success": counts.get("failed", 0) == 0 and counts.get("timeout", 0) == 0,
+        "timestamp": datetime.now().isoformat(),
+        "executor": executor,
+        "parallelism": parallelism,
+        "wall_time": time.perf_counter() - started,
+        "counts": counts,
+        "results": results,
+    }
+
+
+def _kill_workers(pool: ProcessPoolExecutor):
+    """Shut down a process pool and kill its workers, hung runs included"""
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+def _job_result(department: str, automation_name: str, future) -> Dict[str, Any]:
+    """Build the result entry for a finished job"""
+    entry: Dict[str, Any] = {"department": department, "automation": automation_name}
+    try:
+        timed = future.result()
+    except Exception as e:
+        entry.update(status="failed", success=False, error=str(e),
+                     wall_time=None, cpu_time=None)
+        return entry
+    
+    result = timed["result"]
+    success = bool(result.get("success"))
+    entry.update(
+        status="succeeded" if success else "failed",
+        success=success,
+        result=result,
+        wall_time=timed["wall_time"],
+        cpu_time=timed["cpu_time"],
+    )
+    if not success:
+        entry["error"] = result.get("error")
+    return entry
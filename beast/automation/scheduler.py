@@ -0,0 +1,624 @@
+"""
+Automation Scheduler
+Fires registered automations on interval or cron-like schedules
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set, Tuple
+from beast.core.registry import Registry
+from beast.core.event_system import EventSystem, EventType
+from beast.automation import worker
+
+
+# Misfire policies - what to do when a fire time was missed by more than
+# the grace period (scheduler stopped, pool saturated, clock jump)
+MISFIRE_RUN_ONCE = "run_once"   # Run once now, then continue from now
+MISFIRE_SKIP = "skip"           # Drop the missed run, continue from now
+MISFIRE_RUN_ALL = "run_all"     # Run every missed occurrence, queued while busy
+
+MISFIRE_POLICIES = (MISFIRE_RUN_ONCE, MISFIRE_SKIP, MISFIRE_RUN_ALL)
+
+
+class IntervalSchedule:
+    """Fire every N seconds, optionally anchored to a start time"""
+    
+    def __init__(self, seconds: float, start: Optional[datetime] = None):
+        """
+        Initialize interval schedule
+        
+        Args:
+            seconds: Interval between runs
+            start: Anchor time (optional, defaults to the time of scheduling)
+        """
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.interval = timedelta(seconds=seconds)
+        self.start = start
+    
+    def next_fire(self, after: datetime) -> datetime:
+        """Get the first fire time strictly after the given time"""
+        if self.start is None:
+            return after + self.interval
+        if after < self.start:
+            return self.start
+        elapsed = (after - self.start) // self.interval
+        return self.start + (elapsed + 1) * self.interval
+    
+    def __repr__(self):
+        return f"IntervalSchedule(seconds={self.interval.total_seconds()})"
+
+
+class CronSchedule:
+    """
+    Cron-like schedule with five fields: minute hour day month weekday
+    Supports '*', lists (1,5), ranges (1-5), steps (*/15, 1-30/5) and
+    the @hourly/@daily/@weekly/@monthly/@yearly aliases
+    """
+    
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+        "@yearly": "0 0 1 1 *",
+    }
+    
+    # (minimum, maximum) for each field
+    FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+    
+    # Give up searching after this many years (e.g. "0 0 30 2 *")
+    MAX_YEARS_AHEAD = 5
+    
+    def __init__(self, expression: str):
+        """
+        Initialize cron schedule
+        
+        Args:
+            expression: Cron expression (e.g. "30 7 * * 0-4")
+        """
+        self.expression = expression
+        fields = self.ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: '{expression}'")
+        
+        parsed = [self._parse_field(field, low, high)
+                  for field, (low, high) in zip(fields, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both 0 and 7 mean Sunday
+        if 7 in weekdays:
+            weekdays = (weekdays - {7}) | {0}
+        self.weekdays = weekdays
+        # Standard cron: if both day fields are restricted, either may match.
+        # Like cron, a field starting with '*' (including "*/N") is unrestricted
+        self._day_restricted = not fields[2].startswith("*")
+        self._weekday_restricted = not fields[4].startswith("*")
+    
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> Set[int]:
+        """Parse a single cron field into the set of allowed values"""
+        values: Set[int] = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"Invalid cron step: '{field}'")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start_str, end_str = part.split("-", 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field out of range: '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, moment: datetime) -> bool:
+        """Check the day-of-month and day-of-week fields"""
+        in_days = moment.day in self.days
+        # Python: Monday=0, cron: Sunday=0
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+    
+    def next_fire(self, after: datetime) -> datetime:
+        """Get the first fire time strictly after the given time"""
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit_year = after.year + self.MAX_YEARS_AHEAD
+        
+        # Skip whole months/days/hours that cannot match
+        while moment.year <= limit_year:
+            if moment.month not in self.months:
+                year = moment.year + moment.month // 12
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+                continue
+            if moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+                continue
+            return moment
+        
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+    
+    def __repr__(self):
+        return f"CronSchedule('{self.expression}')"
+
+
+class ScheduledJob:
+    """A registered automation together with its schedule and run state"""
+    
+    def __init__(self, department: str, automation_name: str, schedule: Any,
+                 kwargs: Optional[Dict[str, Any]] = None,
+                 max_concurrency: int = 1,
+                 misfire_policy: str = MISFIRE_RUN_ONCE,
+                 misfire_grace_time: float = 1.0,
+                 jitter: float = 0.0):
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy: {misfire_policy}")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        self.department = department
+        self.automation_name = automation_name
+        self.schedule = schedule
+        self.kwargs = kwargs or {}
+        self.max_concurrency = max_concurrency
+        self.misfire_policy = misfire_policy
+        self.misfire_grace_time = timedelta(seconds=misfire_grace_time)
+        self.jitter = jitter
+        
+        # Un-jittered fire time - jitter never accumulates across runs
+        self.next_base: Optional[datetime] = None
+        self.next_fire: Optional[datetime] = None
+        self.running = 0
+        # MISFIRE_RUN_ALL occurrences waiting for a free concurrency slot
+        self.queued = 0
+        self.runs = 0
+        self.skipped = 0
+        self.misfires = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.removed = False
+    
+    @property
+    def job_id(self) -> str:
+        return f"{self.department}.{self.automation_name}"
+    
+    def set_next(self, base: datetime):
+        """Set the next fire time, applying jitter"""
+        self.next_base = base
+        offset = random.uniform(0, self.jitter) if self.jitter > 0 else 0.0
+        self.next_fire = base + timedelta(seconds=offset)
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Get job information"""
+        return {
+            "job_id": self.job_id,
+            "department": self.department,
+            "automation": self.automation_name,
+            "schedule": repr(self.schedule),
+            "next_fire": self.next_fire.isoformat() if self.next_fire else None,
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "misfire_policy": self.misfire_policy,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "misfires": self.misfires,
+        }
+
+
+class _BaseScheduler(ABC):
+    """Job bookkeeping shared by the threaded and asyncio schedulers"""
+    
+    def __init__(self, registry: Registry, event_system: Optional[EventSystem] = None):
+        self.registry = registry
+        self.event_system = event_system
+        
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[Tuple[datetime, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        # Runs started under the lock, announced by _announce() after it
+        self._started: List[ScheduledJob] = []
+    
+    def add_job(self, department: str, automation_name: str, schedule: Any,
+                kwargs: Optional[Dict[str, Any]] = None,
+                max_concurrency: int = 1,
+                misfire_policy: str = MISFIRE_RUN_ONCE,
+                misfire_grace_time: float = 1.0,
+                jitter: float = 0.0,
+                now: Optional[datetime] = None) -> str:
+        """
+        Schedule a registered automation
+        
+        Args:
+            department: Department name
+            automation_name: Automation name
+            schedule: IntervalSchedule, CronSchedule, cron string or seconds
+            kwargs: Parameters passed to the automation on every run
+            max_concurrency: Maximum simultaneous runs of this job
+            misfire_policy: One of MISFIRE_RUN_ONCE, MISFIRE_SKIP, MISFIRE_RUN_ALL
+            misfire_grace_time: Seconds of lateness tolerated before a misfire
+            jitter: Maximum random delay in seconds added to each fire time
+            now: Reference time (optional, defaults to now)
+        
+        Returns:
+            Job ID ("department.automation_name")
+        """
+        if self.registry.get_automation(department, automation_name) is None:
+            raise ValueError(f"Automation '{automation_name}' not found in department '{department}'")
+        
+        if isinstance(schedule, str):
+            schedule = CronSchedule(schedule)
+        elif isinstance(schedule, (int, float)):
+            schedule = IntervalSchedule(schedule)
+        
+        job = ScheduledJob(department, automation_name, schedule, kwargs,
+                           max_concurrency, misfire_policy, misfire_grace_time, jitter)
+        
+        with self._condition:
+            if job.job_id in self._jobs:
+                raise ValueError(f"Job '{job.job_id}' is already scheduled")
+            self._jobs[job.job_id] = job
+            job.set_next(schedule.next_fire(now or datetime.now()))
+            self._push(job)
+            self._wake()
+        
+        return job.job_id
+    
+    def remove_job(self, job_id: str):
+        """Remove a scheduled job (runs already in flight are not cancelled)"""
+        with self._condition:
+            job = self._jobs.pop(job_id, None)
+            if job:
+                # Lazy deletion - the heap entry is dropped when popped
+                job.removed = True
+    
+    def get_job(self, job_id: str) -> Optional[ScheduledJob]:
+        """Get a scheduled job"""
+        return self._jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """List all scheduled jobs, ordered by next fire time"""
+        with self._condition:
+            jobs = sorted(self._jobs.values(), key=lambda j: j.next_fire)
+            return [job.get_info() for job in jobs]
+    
+    def _wake(self):
+        """Wake the timer after the heap changed - caller holds the lock"""
+        self._condition.notify()
+    
+    def _push(self, job: ScheduledJob):
+        heapq.heappush(self._heap, (job.next_fire, next(self._counter), job))
+    
+    def _seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest fire time (None if nothing is scheduled)"""
+        if not self._heap:
+            return None
+        return (self._heap[0][0] - datetime.now()).total_seconds()
+    
+    def _dispatch_due(self, now: datetime) -> int:
+        """Pop and dispatch all due jobs - caller holds the lock"""
+        dispatched = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, job = heapq.heappop(self._heap)
+            if job.removed:
+                continue
+            
+            late = now - job.next_fire > job.misfire_grace_time
+            if late:
+                job.misfires += 1
+            
+            if late and job.misfire_policy == MISFIRE_SKIP:
+                job.skipped += 1
+            elif job.running >= job.max_concurrency:
+                if job.misfire_policy == MISFIRE_RUN_ALL:
+                    # Started by _record_result() when a run finishes
+                    job.queued += 1
+                else:
+                    job.skipped += 1
+            elif self._submit(job):
+                dispatched += 1
+            
+            # MISFIRE_RUN_ALL catches up from the missed time, the others
+            # coalesce everything missed into (at most) one run
+            if late and job.misfire_policy != MISFIRE_RUN_ALL:
+                job.set_next(job.schedule.next_fire(now))
+            else:
+                job.set_next(job.schedule.next_fire(job.next_base))
+            self._push(job)
+        return dispatched
+    
+    def _submit(self, job: ScheduledJob) -> bool:
+        """Start a run of a due job - caller holds the lock"""
+        automation = self.registry.get_automation(job.department, job.automation_name)
+        if automation is None or not automation.can_run() or not self._ready():
+            job.skipped += 1
+            return False
+        
+        self._start_run(job, automation)
+        job.running += 1
+        job.runs += 1
+        self._started.append(job)
+        return True
+    
+    def _announce(self):
+        """Emit AUTOMATION_TRIGGERED for started runs - called without the lock"""
+        with self._condition:
+            started, self._started = self._started, []
+        if self.event_system:
+            for job in started:
+                self.event_system.emit(EventType.AUTOMATION_TRIGGERED.value, "scheduler", {
+                    "department": job.department,
+                    "automation": job.automation_name,
+                    "kwargs": job.kwargs,
+                })
+    
+    @abstractmethod
+    def _start_run(self, job: ScheduledJob, automation: Any):
+        """Hand a run to the executor"""
+        pass
+    
+    def _ready(self) -> bool:
+        """Whether runs can be started (the executor is available)"""
+        return True
+    
+    def _record_result(self, job: ScheduledJob, result: Dict[str, Any]):
+        """Record a finished run and start a queued one in its slot"""
+        with self._condition:
+            job.running -= 1
+            job.last_result = result
+            if job.removed or not self._ready():
+                job.queued = 0
+                return
+            while job.queued and job.running < job.max_concurrency:
+                job.queued -= 1
+                if not self._submit(job):
+                    # The automation cannot run - the rest are skipped too
+                    job.skipped += job.queued
+                    job.queued = 0
+        self._announce()
+    
+    @staticmethod
+    def _failure(error: Exception) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": str(error),
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+class AutomationScheduler(_BaseScheduler):
+    """
+    Schedules automations registered in the Registry
+    Next-fire times live in a min-heap; a single timer thread sleeps until
+    the earliest one, so idle jobs cost nothing. Due runs are dispatched to
+    a thread or process pool.
+    
+    Process workers run against a copy of the departments taken when the
+    pool starts. The pool is restarted when the registry version changes
+    (departments or automations registered, replaced or removed), but
+    writes to department state in the parent, such as new users, are not
+    seen by the workers until then. Use the thread executor for jobs that
+    must read live state.
+    """
+    
+    def __init__(self, registry: Registry,
+                 event_system: Optional[EventSystem] = None,
+                 executor: str = "thread",
+                 max_workers: int = 4):
+        """
+        Initialize scheduler
+        
+        Args:
+            registry: Registry holding the automations
+            event_system: Event system for AUTOMATION_TRIGGERED events (optional)
+            executor: "thread" or "process"
+            max_workers: Pool size
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor type: {executor}")
+        super().__init__(registry, event_system)
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self._thread: Optional[threading.Thread] = None
+        self._pool = None
+        # Registry version the process workers' department copy was taken at
+        self._context_version: Optional[int] = None
+    
+    def start(self):
+        """Start the pool and the timer thread"""
+        with self._condition:
+            if self._running:
+                return
+            if self._pool is None:
+                self._pool = self._create_pool()
+            self._running = True
+            self._thread = threading.Thread(target=self._loop,
+                                            name="beast-scheduler", daemon=True)
+            self._thread.start()
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the timer thread and the pool"""
+        with self._condition:
+            self._running = False
+            # Detached under the lock, so nothing is submitted to it once
+            # it shuts down (finished runs no longer start queued ones)
+            pool, self._pool = self._pool, None
+            self._condition.notify()
+        if self._thread and wait:
+            self._thread.join()
+        self._thread = None
+        if pool:
+            pool.shutdown(wait=wait)
+    
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """
+        Dispatch every job that is due (without the timer thread)
+        Useful for cron-invoked processes and tests
+        
+        Args:
+            now: Reference time (optional, defaults to now)
+        
+        Returns:
+            Number of runs dispatched
+        """
+        with self._condition:
+            if self._pool is None:
+                self._pool = self._create_pool()
+            dispatched = self._dispatch_due(now or datetime.now())
+        self._announce()
+        return dispatched
+    
+    def _ready(self) -> bool:
+        return self._pool is not None
+    
+    def _create_pool(self):
+        """Create the worker pool"""
+        if self.executor_type == "process":
+            # Department state is shipped once per worker, not once per task
+            self._context_version = self.registry.version
+            context = worker.build_worker_context(self.registry)
+            return ProcessPoolExecutor(max_workers=self.max_workers,
+                                       initializer=worker.init_worker,
+                                       initargs=(context,))
+        return ThreadPoolExecutor(max_workers=self.max_workers,
+                                  thread_name_prefix="beast-automation")
+    
+    def _loop(self):
+        """Timer thread - sleep until the earliest fire time"""
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                delay = self._seconds_until_next()
+                if delay is None or delay > 0:
+                    self._condition.wait(timeout=delay)
+                    continue
+                self._dispatch_due(datetime.now())
+            self._announce()
+    
+    def _start_run(self, job: ScheduledJob, automation: Any):
+        if self.executor_type == "process":
+            if self.registry.version != self._context_version:
+                # Departments changed - new workers get a fresh copy, runs
+                # in flight finish on the old pool
+                stale, self._pool = self._pool, self._create_pool()
+                stale.shutdown(wait=False)
+            future = self._pool.submit(worker.run_automation, job.department,
+                                       job.automation_name, job.kwargs)
+        else:
+            future = self._pool.submit(automation.run, **job.kwargs)
+        future.add_done_callback(lambda f, job=job: self._on_done(job, f))
+    
+    def _on_done(self, job: ScheduledJob, future: Future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = self._failure(e)
+        self._record_result(job, result)
+
+
+class AsyncAutomationScheduler(_BaseScheduler):
+    """
+    Asyncio scheduler loop - drives many I/O-bound automations on one thread
+    AsyncBaseAutomation jobs run as tasks on the loop; synchronous
+    automations are offloaded to the loop's default executor.
+    """
+    
+    def __init__(self, registry: Registry,
+                 event_system: Optional[EventSystem] = None,
+                 timeout: Optional[float] = None):
+        """
+        Initialize scheduler
+        
+        Args:
+            registry: Registry holding the automations
+            event_system: Event system for AUTOMATION_TRIGGERED events (optional)
+            timeout: Deadline in seconds for async runs (None for no limit)
+        """
+        super().__init__(registry, event_system)
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Future] = set()
+    
+    async def run_forever(self):
+        """Run the scheduler loop until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._running = True
+        try:
+            while self._running:
+                with self._condition:
+                    self._dispatch_due(datetime.now())
+                    delay = self._seconds_until_next()
+                self._announce()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+    
+    def stop(self):
+        """Stop the scheduler loop (thread-safe); runs in flight keep going"""
+        self._running = False
+        self._notify_loop()
+    
+    async def wait_idle(self):
+        """Wait until every dispatched run has finished"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+    
+    def _wake(self):
+        self._notify_loop()
+    
+    def _ready(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+    
+    def _notify_loop(self):
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    def _start_run(self, job: ScheduledJob, automation: Any):
+        from beast.automation.async_automation import AsyncBaseAutomation
+        
+        if isinstance(automation, AsyncBaseAutomation):
+            task = self._loop.create_task(
+                automation.run_async(timeout=self.timeout, **job.kwargs))
+        else:
+            task = self._loop.run_in_executor(None, lambda: automation.run(**job.kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(lambda t, job=job: self._on_done(job, t))
+    
+    def _on_done(self, job: ScheduledJob, task: asyncio.Future):
+        self._tasks.discard(task)
+        if task.cancelled():
+            result = self._failure(Exception("Automation was cancelled"))
+            result["cancelled"] = True
+        elif task.exception() is not None:
+            result = self._failure(task.exception())
+        else:
+            result = task.result()
+        self._record_result(job, result)
@@ -0,0 +1,158 @@
+"""
+Report Sinks
+Destinations for streaming automation output, written chunk by chunk
+"""
+
+import csv
+import gzip
+import io
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+
+class BaseSink(ABC):
+    """
+    Base class for streaming report sinks
+    A sink is single-use: BaseAutomation.run opens it, writes chunks and closes it
+    """
+    
+    def __init__(self):
+        self.rows_written = 0
+    
+    def open(self):
+        """Prepare the sink for writing"""
+        pass
+    
+    @abstractmethod
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        """Write a chunk of rows"""
+        pass
+    
+    def close(self):
+        """Flush and release resources"""
+        pass
+    
+    def describe(self) -> Dict[str, Any]:
+        """Describe the sink for the run summary"""
+        return {"type": type(self).__name__, "rows": self.rows_written}
+
+
+class FileSink(BaseSink):
+    """Base class for sinks backed by a (optionally gzip-compressed) text file"""
+    
+    def __init__(self, path: Union[str, Path], compress: Optional[bool] = None):
+        """
+        Initialize file sink
+        
+        Args:
+            path: Output file path
+            compress: Gzip the output (None to infer from a .gz suffix)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.compress = self.path.suffix == ".gz" if compress is None else compress
+        self._file: Optional[io.TextIOBase] = None
+    
+    def open(self):
+        if self.compress:
+            self._file = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def describe(self) -> Dict[str, Any]:
+        info = super().describe()
+        info.update(path=str(self.path), compressed=self.compress)
+        return info
+
+
+class JsonlSink(FileSink):
+    """Write one JSON object per line"""
+    
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self._file.writelines(json.dumps(row, ensure_ascii=False, default=str) + "\n"
+                              for row in rows)
+        self.rows_written += len(rows)
+
+
+class CsvSink(FileSink):
+    """Write rows as CSV - columns come from `fieldnames` or the first row"""
+    
+    def __init__(self, path: Union[str, Path], fieldnames: Optional[List[str]] = None,
+                 compress: Optional[bool] = None):
+        super().__init__(path, compress)
+        self.fieldnames = fieldnames
+        self._writer: Optional[csv.DictWriter] = None
+    
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        if self._writer is None:
+            self.fieldnames = self.fieldnames or list(rows[0].keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames,
+                                          extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self.rows_written += len(rows)
+
+
+class CollectSink(BaseSink):
+    """Keep rows in memory (for small reports and tests)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.rows: List[Dict[str, Any]] = []
+    
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        self.rows.extend(rows)
+        self.rows_written += len(rows)
+
+
+def open_sink(path: Union[str, Path], compress: Optional[bool] = None) -> FileSink:
+    """
+    Create a file sink from a path, choosing the format by suffix
+    (.jsonl/.ndjson or .csv, optionally followed by .gz)
+    
+    Args:
+        path: Output file path
+        compress: Gzip the output (None to infer from a .gz suffix)
+    
+    Returns:
+        File sink
+    """
+    path = Path(path)
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    fmt = suffixes[-1] if suffixes else ""
+    
+    if fmt in (".jsonl", ".ndjson"):
+        return JsonlSink(path, compress)
+    if fmt == ".csv":
+        return CsvSink(path, compress=compress)
+    raise ValueError(f"Unsupported sink format: {path.name}")
+
+
+class StreamSummary(dict):
+    """
+    Summary metadata yielded by an async streaming automation
+    (async generators cannot `return` a value)
+    """
+    pass
+
+
+def as_chunk(item: Any) -> List[Dict[str, Any]]:
+    """Normalize a yielded item (single row or iterable of rows) into a chunk"""
+    if isinstance(item, dict):
+        return [item]
+    if isinstance(item, list):
+        return item
+    if isinstance(item, Iterable):
+        return list(item)
+    raise TypeError(f"Streaming automations must yield rows or row chunks, got {type(item).__name__}")
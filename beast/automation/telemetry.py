@@ -0,0 +1,241 @@
+"""
+Automation Telemetry
+Per-automation run history, percentile summaries and Prometheus export
+"""
+
+import math
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+
+# Default number of runs kept per automation
+DEFAULT_HISTORY_SIZE = 256
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def enable_memory_tracking():
+    """
+    Start tracemalloc so runs also record peak memory
+    Peaks are process-wide, so they are approximate while runs overlap
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(q * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def result_size(result: Dict[str, Any]) -> int:
+    """Number of rows/items in a result (streamed row count, or list/dict lengths)"""
+    if "row_count" in result:
+        return result["row_count"]
+    return sum(len(value) for value in result.values() if isinstance(value, (list, dict)))
+
+
+class RunRecord:
+    """Measurements of a single automation run"""
+    __slots__ = ("started_at", "wall_time", "cpu_time", "peak_memory", "result_size", "outcome")
+    
+    def __init__(self, started_at: datetime, wall_time: float, cpu_time: float,
+                 peak_memory: Optional[int], result_size: int, outcome: str):
+        self.started_at = started_at
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+        self.result_size = result_size
+        self.outcome = outcome
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_memory": self.peak_memory,
+            "result_size": self.result_size,
+            "outcome": self.outcome,
+        }
+
+
+class RunMeter:
+    """Measures one run - created by RunHistory.start()"""
+    
+    def __init__(self, history: 'RunHistory'):
+        self.history = history
+        self.started_at = datetime.now()
+        self._memory = tracemalloc.is_tracing()
+        if self._memory and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._memory_start = tracemalloc.get_traced_memory()[0] if self._memory else 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+    
+    def finish(self, result: Dict[str, Any]) -> RunRecord:
+        """Record the run's result and return its measurements"""
+        wall_time = time.perf_counter() - self._wall_start
+        cpu_time = time.thread_time() - self._cpu_start
+        peak_memory = None
+        if self._memory and tracemalloc.is_tracing():
+            peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self._memory_start)
+        
+        if result.get("cached"):
+            outcome = "cached"
+        elif result.get("success"):
+            outcome = "success"
+        elif result.get("timed_out"):
+            outcome = "timeout"
+        elif result.get("cancelled"):
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        
+        record = RunRecord(self.started_at, wall_time, cpu_time, peak_memory,
+                           result_size(result), outcome)
+        self.history.add(record)
+        return record
+
+
+class RunHistory:
+    """
+    Bounded history of an automation's runs
+    Totals are kept for the whole lifetime; percentiles cover the window
+    """
+    
+    def __init__(self, maxlen: int = DEFAULT_HISTORY_SIZE):
+        self.records: deque = deque(maxlen=maxlen)
+        self.outcome_totals: Dict[str, int] = {}
+        self.runs = 0
+        self.wall_time_total = 0.0
+        self.cpu_time_total = 0.0
+        self._lock = threading.Lock()
+    
+    def start(self) -> RunMeter:
+        """Begin measuring a run"""
+        return RunMeter(self)
+    
+    def add(self, record: RunRecord):
+        with self._lock:
+            self.records.append(record)
+            self.runs += 1
+            self.outcome_totals[record.outcome] = self.outcome_totals.get(record.outcome, 0) + 1
+            self.wall_time_total += record.wall_time
+            self.cpu_time_total += record.cpu_time
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of the records and lifetime totals"""
+        with self._lock:
+            return {
+                "records": list(self.records),
+                "outcome_totals": dict(self.outcome_totals),
+                "wall_time_total": self.wall_time_total,
+                "cpu_time_total": self.cpu_time_total,
+            }
+    
+    def summary(self) -> Dict[str, Any]:
+        """Counts plus p50/p95/p99 of the windowed measurements"""
+        snapshot = self.snapshot()
+        records = snapshot["records"]
+        totals = snapshot["outcome_totals"]
+        
+        summary: Dict[str, Any] = {
+            "runs": sum(totals.values()),
+            "outcomes": totals,
+            "window": len(records),
+        }
+        for field in ("wall_time", "cpu_time", "peak_memory", "result_size"):
+            values = sorted(v for v in (getattr(r, field) for r in records) if v is not None)
+            if not values:
+                continue
+            stats = {f"p{int(q * 100)}": percentile(values, q) for q in QUANTILES}
+            stats["max"] = values[-1]
+            summary[field] = stats
+        return summary
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(automations: Iterable[Any]) -> str:
+    """
+    Render automation telemetry in the Prometheus text exposition format
+    
+    Args:
+        automations: Automation instances (None placeholders are ignored)
+    
+    Returns:
+        Exposition text
+    """
+    runs: List[str] = []
+    seconds: Dict[str, List[str]] = {"wall": [], "cpu": []}
+    for automation in automations:
+        if automation is None:
+            continue
+        snapshot = automation.history.snapshot()
+        records = snapshot["records"]
+        totals = snapshot["outcome_totals"]
+        sums = {"wall": snapshot["wall_time_total"], "cpu": snapshot["cpu_time_total"]}
+        department = automation.department.name_en if automation.department else ""
+        labels = f'department="{_label(department)}",automation="{_label(automation.name_en)}"'
+        for outcome, count in sorted(totals.items()):
+            runs.append(f'beast_automation_runs_total{{{labels},outcome="{outcome}"}} {count}')
+        for kind, lines in seconds.items():
+            name = f"beast_automation_{kind}_seconds"
+            values = sorted(getattr(r, f"{kind}_time") for r in records)
+            for q in QUANTILES:
+                value = percentile(values, q)
+                lines.append(f'{name}{{{labels},quantile="{q}"}} '
+                             f'{value if value is not None else "NaN"}')
+            lines.append(f"{name}_sum{{{labels}}} {sums[kind]}")
+            lines.append(f"{name}_count{{{labels}}} {sum(totals.values())}")
+    
+    output = [
+        "# HELP beast_automation_runs_total Automation runs by outcome",
+        "# TYPE beast_automation_runs_total counter",
+        *runs,
+    ]
+    for kind, lines in seconds.items():
+        name = f"beast_automation_{kind}_seconds"
+        output.append(f"# HELP {name} Automation {kind} time per run (quantiles over recent runs)")
+        output.append(f"# TYPE {name} summary")
+        output.extend(lines)
+    return "\n".join(output) + "\n"
+
+
+def export_prometheus(automations: Iterable[Any], path: Union[str, Path]) -> Path:
+    """
+    Write automation telemetry to a file in Prometheus text format
+    The file is replaced atomically (suitable for a textfile collector)
+    
+    Args:
+        automations: Automation instances
+        path: Output file path
+    
+    Returns:
+        Path written
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(render_prometheus(automations), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,307 @@
+"""
+Event Triggers
+Run automations in reaction to events, debounced and coalesced
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from beast.core.event_system import Event, EventSystem, EventType
+
+
+class EventTrigger:
+    """
+    Declares that an automation runs when an event fires
+    
+    Events whose `key` fields have the same values collapse into a single
+    run with those fields as kwargs. The run fires once no matching event
+    arrived for `debounce` seconds, or `max_wait` seconds after the first
+    pending event, whichever comes first. With `batch=True`, every pending
+    key is merged into one invocation that receives `batch=[{...}, ...]`.
+    """
+    
+    def __init__(self, event_type: str,
+                 key: Tuple[str, ...] = (),
+                 debounce: float = 1.0,
+                 max_wait: Optional[float] = None,
+                 batch: bool = False,
+                 kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Initialize trigger
+        
+        Args:
+            event_type: Event type to react to
+            key: Event data fields used as the coalescing key (and run kwargs)
+            debounce: Quiet period in seconds before the run fires
+            max_wait: Maximum delay in seconds after the first pending event
+            batch: Merge distinct keys into one invocation
+            kwargs: Extra fixed parameters for every triggered run
+        """
+        if debounce < 0:
+            raise ValueError("debounce must not be negative")
+        if max_wait is not None and max_wait < debounce:
+            raise ValueError("max_wait must be at least the debounce window")
+        self.event_type = event_type
+        self.key = tuple(key)
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.batch = batch
+        self.kwargs = kwargs or {}
+    
+    def __repr__(self):
+        return (f"EventTrigger(event_type={self.event_type}, key={self.key}, "
+                f"debounce={self.debounce}, max_wait={self.max_wait}, batch={self.batch})")
+
+
+class _PendingRun:
+    """Events waiting to be coalesced into one run"""
+    __slots__ = ("automation", "trigger", "keys", "first_event", "last_event", "events")
+    
+    def __init__(self, automation: Any, trigger: EventTrigger, now: float):
+        self.automation = automation
+        self.trigger = trigger
+        self.keys: Dict[Tuple, Dict[str, Any]] = {}
+        self.first_event = now
+        self.last_event = now
+        self.events = 0
+    
+    @property
+    def deadline(self) -> float:
+        deadline = self.last_event + self.trigger.debounce
+        if self.trigger.max_wait is not None:
+            deadline = min(deadline, self.first_event + self.trigger.max_wait)
+        return deadline
+
+
+class TriggerManager:
+    """
+    Subscribes automations' EventTriggers to the EventSystem
+    A single timer thread fires coalesced runs on a thread pool; while no
+    events are pending it sleeps without polling.
+    """
+    
+    def __init__(self, event_system: EventSystem, max_workers: int = 4):
+        """
+        Initialize trigger manager
+        
+        Args:
+            event_system: Event system to subscribe to
+            max_workers: Pool size for triggered runs
+        """
+        self.event_system = event_system
+        self.max_workers = max_workers
+        
+        # Event type -> [(automation, trigger)]
+        self._bindings: Dict[str, List[Tuple[Any, EventTrigger]]] = {}
+        self._pending: Dict[Tuple, _PendingRun] = {}
+        self._heap: List[Tuple[float, int, Tuple]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._running = False
+        
+        self.events_received = 0
+        self.runs_fired = 0
+        self.events_coalesced = 0
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+    
+    def attach(self, automation: Any) -> bool:
+        """
+        Bind an automation's triggers
+        
+        Returns:
+            True if the automation declares triggers
+        """
+        triggers = getattr(automation, "triggers", ()) if automation is not None else ()
+        if not triggers:
+            return False
+        with self._condition:
+            for trigger in triggers:
+                bindings = self._bindings.setdefault(trigger.event_type, [])
+                if (automation, trigger) not in bindings:
+                    bindings.append((automation, trigger))
+                self.event_system.subscribe(trigger.event_type, self._on_event)
+        return True
+    
+    def detach(self, automation: Any):
+        """Unbind an automation's triggers and drop its pending runs"""
+        with self._condition:
+            for event_type, bindings in list(self._bindings.items()):
+                bindings[:] = [b for b in bindings if b[0] is not automation]
+                if not bindings:
+                    del self._bindings[event_type]
+                    self.event_system.unsubscribe(event_type, self._on_event)
+            for group, pending in list(self._pending.items()):
+                if pending.automation is automation:
+                    del self._pending[group]
+    
+    def start(self):
+        """Start the timer thread and the pool"""
+        with self._condition:
+            if self._running:
+                return
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="beast-trigger")
+            self._running = True
+            self._thread = threading.Thread(target=self._loop,
+                                            name="beast-triggers", daemon=True)
+            self._thread.start()
+    
+    def shutdown(self, flush: bool = True, wait: bool = True):
+        """
+        Stop the trigger manager
+        
+        Args:
+            flush: Fire pending runs before stopping
+            wait: Wait for running automations to finish
+        """
+        if flush:
+            self.flush()
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread and wait:
+            self._thread.join()
+        self._thread = None
+        if self._pool:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+    
+    def flush(self) -> int:
+        """
+        Fire every pending run now, ignoring debounce windows
+        
+        Returns:
+            Number of runs fired
+        """
+        with self._condition:
+            runs = [self._take(group) for group in list(self._pending)]
+            self._heap.clear()
+        # Outside the lock: a run without the pool executes right here
+        for run in runs:
+            self._fire(*run)
+        return len(runs)
+    
+    def pending_count(self) -> int:
+        """Number of coalesced runs waiting to fire"""
+        return len(self._pending)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get trigger counters"""
+        with self._condition:
+            return {
+                "events_received": self.events_received,
+                "runs_fired": self.runs_fired,
+                "coalesced": self.events_coalesced,
+                "pending": len(self._pending),
+            }
+    
+    def _on_event(self, event: Event):
+        """Record an event against every matching trigger"""
+        now = time.monotonic()
+        with self._condition:
+            for automation, trigger in self._bindings.get(event.event_type, ()):
+                if trigger.key and not all(field in event.data for field in trigger.key):
+                    continue
+                values = tuple(event.data[field] for field in trigger.key)
+                group = (id(automation), id(trigger)) if trigger.batch \
+                    else (id(automation), id(trigger), values)
+                
+                pending = self._pending.get(group)
+                if pending is None:
+                    pending = _PendingRun(automation, trigger, now)
+                    self._pending[group] = pending
+                    heapq.heappush(self._heap, (pending.deadline, next(self._counter), group))
+                    self._condition.notify()
+                pending.keys.setdefault(values, dict(zip(trigger.key, values)))
+                pending.last_event = now
+                pending.events += 1
+                self.events_received += 1
+    
+    def _loop(self):
+        """Timer thread - fire runs whose debounce window has closed"""
+        while True:
+            with self._condition:
+                run = self._next_due()
+            if run is None:
+                return
+            self._fire(*run)
+    
+    def _next_due(self) -> Optional[Tuple]:
+        """Wait for the next run whose window closed (None once stopped) - caller holds the lock"""
+        while self._running:
+            if not self._heap:
+                self._condition.wait()
+                continue
+            deadline, _, group = self._heap[0]
+            now = time.monotonic()
+            if deadline > now:
+                self._condition.wait(timeout=deadline - now)
+                continue
+            heapq.heappop(self._heap)
+            pending = self._pending.get(group)
+            if pending is None:
+                continue
+            # Newer events pushed the deadline back - one heap entry per group
+            if pending.deadline > now:
+                heapq.heappush(self._heap, (pending.deadline, next(self._counter), group))
+                continue
+            return self._take(group)
+        return None
+    
+    def _take(self, group: Tuple) -> Tuple[Any, EventTrigger, Dict[str, Any], int]:
+        """Remove a group's pending run and build its kwargs - caller holds the lock"""
+        pending = self._pending.pop(group)
+        trigger = pending.trigger
+        kwargs = dict(trigger.kwargs)
+        if trigger.batch:
+            kwargs["batch"] = list(pending.keys.values())
+        else:
+            kwargs.update(next(iter(pending.keys.values())))
+        self.runs_fired += 1
+        self.events_coalesced += pending.events - 1
+        return pending.automation, trigger, kwargs, pending.events
+    
+    def _fire(self, automation: Any, trigger: EventTrigger, kwargs: Dict[str, Any], events: int):
+        """
+        Submit a taken run (or run it inline without a pool) and announce it
+        Called without the lock, so other threads' events are never held
+        up by a run or by AUTOMATION_TRIGGERED subscribers.
+        """
+        pool = self._pool
+        future = None
+        if pool is not None:
+            try:
+                future = pool.submit(automation.run, **kwargs)
+            except RuntimeError:
+                # The pool was shut down meanwhile
+                future = None
+        if future is not None:
+            future.add_done_callback(lambda f, a=automation: self._on_done(a, f))
+        else:
+            self._record(automation, automation.run(**kwargs))
+        
+        if trigger.event_type != EventType.AUTOMATION_TRIGGERED.value:
+            self.event_system.emit(EventType.AUTOMATION_TRIGGERED.value, "triggers", {
+                "department": automation.department.name_en if automation.department else None,
+                "automation": automation.name_en,
+                "event_type": trigger.event_type,
+                "events": events,
+                "kwargs": kwargs,
+            })
+    
+    def _on_done(self, automation: Any, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        self._record(automation, result)
+    
+    def _record(self, automation: Any, result: Dict[str, Any]):
+        with self._condition:
+            department = automation.department.name_en if automation.department else None
+            self.last_results[f"{department}.{automation.name_en}"] = result
@@ -0,0 +1,109 @@
+"""
+Automation Worker Helpers
+Run automations inside pool worker processes
+"""
+
+import pickle
+import time
+from typing import Dict, Any, List, Optional
+from beast.core.registry import Registry
+
+
+# Worker-local registry, populated once per process by init_worker()
+_worker_registry: Optional[Registry] = None
+
+
+def build_worker_context(registry: Registry,
+                         departments: Optional[List[str]] = None) -> bytes:
+    """
+    Serialize department state for shipping to worker processes
+    
+    Departments drop their registry and event system when pickled, so the
+    payload holds only department-owned state and is built once per pool,
+    not once per task.
+    
+    Args:
+        registry: Registry holding the departments
+        departments: Department names to include (None for all)
+    
+    Returns:
+        Pickled department context
+    """
+    names = departments if departments is not None else registry.list_departments()
+    context = {}
+    for name in names:
+        dept = registry.get_department(name)
+        if dept is not None:
+            context[name] = dept
+    return pickle.dumps(context, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def init_worker(context: bytes):
+    """
+    Pool initializer - rebuild a worker-local registry from a context
+    
+    Args:
+        context: Payload produced by build_worker_context()
+    """
+    global _worker_registry
+    registry = Registry()
+    for name, dept in pickle.loads(context).items():
+        dept.registry = registry
+        registry.register_department(name, dept)
+        for auto_name, auto_instance in dept._automations.items():
+            if auto_instance is not None:
+                registry.register_automation(name, auto_name, auto_instance)
+    _worker_registry = registry
+
+
+def _get_automation(department: str, automation_name: str) -> Any:
+    """Look up an automation in the worker-local registry"""
+    if _worker_registry is None:
+        raise RuntimeError("Worker process was not initialized")
+    automation = _worker_registry.get_automation(department, automation_name)
+    if automation is None:
+        raise ValueError(f"Automation '{automation_name}' not found in department '{department}'")
+    return automation
+
+
+def run_automation(department: str, automation_name: str,
+                   kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run an automation from the worker-local registry
+    
+    Args:
+        department: Department name
+        automation_name: Automation name
+        kwargs: Automation parameters
+    
+    Returns:
+        Result dictionary (same shape as BaseAutomation.run)
+    """
+    return _get_automation(department, automation_name).run(**(kwargs or {}))
+
+
+def run_timed(automation: Any, kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run an automation and measure it
+    
+    Args:
+        automation: Automation instance
+        kwargs: Automation parameters
+    
+    Returns:
+        Dictionary with the run result, wall time and CPU time (seconds)
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    result = automation.run(**(kwargs or {}))
+    return {
+        "result": result,
+        "wall_time": time.perf_counter() - wall_start,
+        "cpu_time": time.thread_time() - cpu_start,
+    }
+
+
+def run_automation_timed(department: str, automation_name: str,
+                         kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Like run_automation(), but measured with run_timed()"""
+    return run_timed(_get_automation(department, automation_name), kwargs)
@@ -0,0 +1,184 @@
+"""
+Department Authorization
+Rank permissions compiled into bitmasks, checked on guarded department methods
+"""
+
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from beast.core.models.hierarchy import HierarchyManager
+    from beast.core.models.user import User
+
+# Rank flags that can be required on top of department access, in bit order
+FLAGS = ("can_manage_classes", "can_manage_maks", "can_manage_memach")
+
+# The user on whose behalf department methods are being called
+_current_actor: contextvars.ContextVar = contextvars.ContextVar("beast_actor", default=None)
+
+
+class AuthorizationError(PermissionError):
+    """Raised when the current actor's rank may not call a guarded method"""
+
+
+class PermissionTable:
+    """
+    Permissions of every rank of one hierarchy version, as integer masks
+    
+    Bits 0-2 are the FLAGS, followed by one bit per department that any
+    rank lists. A check is `mask & required == required`.
+    """
+    
+    __slots__ = ('version', 'rank_masks', 'department_bits', 'nobody_bit', '_required')
+    
+    def __init__(self, manager: 'HierarchyManager'):
+        self.version = manager.version
+        ranks = manager.list_ranks()
+        departments = sorted({department for rank in ranks for department in rank.departments})
+        self.department_bits: Dict[str, int] = {
+            department: 1 << (len(FLAGS) + index) for index, department in enumerate(departments)
+        }
+        # Required for departments no rank lists, so nobody passes
+        self.nobody_bit = 1 << (len(FLAGS) + len(departments))
+        self.rank_masks: Dict[str, int] = {}
+        for rank in ranks:
+            mask = 0
+            for bit, flag in enumerate(FLAGS):
+                if getattr(rank, flag, False):
+                    mask |= 1 << bit
+            for department in rank.departments:
+                mask |= self.department_bits[department]
+            self.rank_masks[rank.name] = mask
+        # (department, flags) -> required mask
+        self._required: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+    
+    def required(self, department: str, flags: Tuple[str, ...] = ()) -> int:
+        """Mask a rank needs to call into `department` with `flags`"""
+        key = (department, flags)
+        mask = self._required.get(key)
+        if mask is None:
+            mask = self.department_bits.get(department, self.nobody_bit)
+            for flag in flags:
+                mask |= 1 << FLAGS.index(flag)
+            self._required[key] = mask
+        return mask
+
+
+class Authorizer:
+    """
+    Answers "may this rank do this in that department" from a PermissionTable
+    
+    The table is compiled on first use and recompiled whenever the
+    hierarchy manager's version changes (rank added, removed, overridden
+    or reloaded from configuration).
+    """
+    
+    def __init__(self, manager: 'HierarchyManager'):
+        self.manager = manager
+        self._table: Optional[PermissionTable] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def table(self) -> PermissionTable:
+        table = self._table
+        if table is None or table.version != self.manager.version:
+            with self._lock:
+                table = self._table
+                if table is None or table.version != self.manager.version:
+                    table = self._table = PermissionTable(self.manager)
+        return table
+    
+    def allowed(self, rank_name: str, department: str, flags: Tuple[str, ...] = ()) -> bool:
+        """Whether a rank may call into a department (and holds the flags)"""
+        table = self._table
+        if table is None or table.version != self.manager.version:
+            table = self.table
+        # Required masks are never 0, so a miss falls through to compute it
+        required = table._required.get((department, flags)) or table.required(department, flags)
+        return table.rank_masks.get(rank_name, 0) & required == required
+    
+    def authorize(self, user: 'User', department: str, *flags: str) -> bool:
+        """Whether a user's rank may call into a department"""
+        return self.allowed(user.rank_name, department, flags)
+    
+    def authorize_many(self, users: Iterable['User'], department: str,
+                       *flags: str) -> List['User']:
+        """
+        The users whose rank may call into a department
+        
+        The table and required mask are looked up once for the whole batch.
+        """
+        table = self.table
+        required = table.required(department, flags)
+        masks = table.rank_masks
+        return [user for user in users if masks.get(user.rank_name, 0) & required == required]
+    
+    def __getstate__(self) -> Dict:
+        """The compiled table is rebuilt after unpickling"""
+        return {'manager': self.manager}
+    
+    def __setstate__(self, state: Dict):
+        self.__init__(state['manager'])
+
+
+def current_actor() -> Optional['User']:
+    """The user set by acting_as(), or None for system calls"""
+    return _current_actor.get()
+
+
+@contextmanager
+def acting_as(user: Optional['User']):
+    """
+    Run guarded department methods on behalf of a user
+    
+    Works per thread and per asyncio task. Calls made outside any
+    acting_as() block are system calls and are not checked.
+    """
+    token = _current_actor.set(user)
+    try:
+        yield user
+    finally:
+        _current_actor.reset(token)
+
+
+def check_access(user: 'User', department: str, *flags: str, action: str = ""):
+    """
+    Raise AuthorizationError unless the user's rank may call into a department
+    
+    A user without a hierarchy manager has no known rank and is refused.
+    """
+    manager = user.hierarchy_manager
+    if manager is not None and manager.authorizer.allowed(user.rank_name, department, flags):
+        return
+    target = f"{department}.{action}" if action else department
+    raise AuthorizationError(f"לדרגה {user.rank_name} אין הרשאה לפעולה {target}")
+
+
+def requires_access(*flags: str) -> Callable[[Callable], Callable]:
+    """
+    Guard a department method
+    
+    While acting_as() a user, the user's rank must list the department
+    (its `name_en`) and hold every flag given, e.g.
+    `@requires_access("can_manage_classes")`.
+    
+    Args:
+        *flags: Rank flags required in addition to department access
+    """
+    for flag in flags:
+        if flag not in FLAGS:
+            raise ValueError(f"Unknown rank flag '{flag}' (expected one of: {', '.join(FLAGS)})")
+    
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def guarded(self, *args, **kwargs):
+            actor = _current_actor.get()
+            if actor is not None:
+                check_access(actor, self.name_en, *flags, action=method.__name__)
+            return method(self, *args, **kwargs)
+        guarded.required_flags = flags
+        return guarded
+    return decorate
@@ -3,23 +3,101 @@ Configuration Loader
 Loads and manages dynamic configurations from files or database
 """
 
+import hashlib
 import json
-import yaml
+import marshal
+import os
 from pathlib import Path
 from typing import Dict, Any, Optional
 from beast.core.registry import Registry
 
 
+def _load_yaml(text: str) -> Any:
+    """
+    Parse YAML, with the C (libyaml) loader when PyYAML was built with it
+    yaml is imported here so hot starts served from the cache never load it
+    """
+    import yaml
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+# Bump when the cache file layout changes
+CONFIG_CACHE_VERSION = 2
+
+
+def _is_plain(value: Any) -> bool:
+    """Whether a value is plain JSON-like data (the only thing the cache stores)"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, list):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_plain(item) for key, item in value.items())
+    return False
+
+
+def _validate_hierarchy(config: Dict[str, Any]):
+    """Validate hierarchy.yaml structure"""
+    ranks = config.get('ranks', [])
+    if not isinstance(ranks, list):
+        raise ValueError("hierarchy: 'ranks' must be a list")
+    names = set()
+    for rank in ranks:
+        if not isinstance(rank, dict) or not rank.get('name'):
+            raise ValueError(f"hierarchy: every rank needs a name: {rank!r}")
+        if not isinstance(rank.get('level', 0), int):
+            raise ValueError(f"hierarchy: level of rank '{rank['name']}' must be an integer")
+        if rank['name'] in names:
+            raise ValueError(f"hierarchy: duplicate rank '{rank['name']}'")
+        names.add(rank['name'])
+
+
+def _validate_departments(config: Dict[str, Any]):
+    """Validate departments.yaml structure"""
+    departments = config.get('departments', [])
+    if not isinstance(departments, list):
+        raise ValueError("departments: 'departments' must be a list")
+    for dept in departments:
+        missing = [key for key in ('name', 'module_path', 'class_name')
+                   if not isinstance(dept, dict) or not dept.get(key)]
+        if missing:
+            raise ValueError(f"departments: missing {', '.join(missing)} in {dept!r}")
+    profiling = config.get('profiling')
+    if profiling is not None and not isinstance(profiling, (str, bool)):
+        raise ValueError("departments: 'profiling' must be a backend spec such as 'counters'")
+
+
+# Config name (file stem) -> validator, run once when a file is compiled
+CONFIG_VALIDATORS = {
+    'hierarchy': _validate_hierarchy,
+    'departments': _validate_departments,
+}
+
+
 class ConfigLoader:
     """
     Loads configurations dynamically
     Supports JSON and YAML formats
     Can reload configurations at runtime
+    
+    With a cache directory, parsed files are stored in a compiled binary
+    form keyed by path, mtime, size and content hash, so hot starts skip
+    YAML parsing entirely.
     """
     
-    def __init__(self, registry: Registry):
+    def __init__(self, registry: Registry, cache_dir: Optional[Path] = None):
+        """
+        Initialize loader
+        
+        Args:
+            registry: Registry instance
+            cache_dir: Directory for compiled config caches (None disables caching)
+        """
         self.registry = registry
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self._configs: Dict[str, Dict] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def load_from_file(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -34,18 +112,97 @@ class ConfigLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {file_path}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            if file_path.suffix in ['.yaml', '.yml']:
-                config = yaml.safe_load(f)
-            elif file_path.suffix == '.json':
-                config = json.load(f)
-            else:
-                raise ValueError(f"Unsupported configuration format: {file_path.suffix}")
+        config = self._load_cached(file_path) if self.cache_dir else None
+        if config is None:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            config = self._compile(file_path, raw)
+            if self.cache_dir:
+                self._store_cache(file_path, raw, config)
         
         config_name = file_path.stem
         self._configs[config_name] = config
         return config
     
+    def _compile(self, file_path: Path, raw: bytes) -> Dict[str, Any]:
+        """Parse and validate a configuration file's contents"""
+        if file_path.suffix in ['.yaml', '.yml']:
+            config = _load_yaml(raw.decode('utf-8'))
+        elif file_path.suffix == '.json':
+            config = json.loads(raw.decode('utf-8'))
+        else:
+            raise ValueError(f"Unsupported configuration format: {file_path.suffix}")
+        
+        validator = CONFIG_VALIDATORS.get(file_path.stem)
+        if validator and config is not None:
+            validator(config)
+        return config
+    
+    def _cache_path(self, file_path: Path) -> Path:
+        key = hashlib.sha1(str(file_path.resolve()).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{file_path.stem}-{key}.cache"
+    
+    def _load_cached(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached config if it is still valid
+        Matching mtime and size is trusted without reading the source; if
+        they changed but the content hash did not (touch, checkout), the
+        cache entry is refreshed instead of re-parsing. Entries are read
+        with marshal and must hold plain data - anything else is a miss.
+        """
+        try:
+            with open(self._cache_path(file_path), 'rb') as f:
+                entry = marshal.load(f)
+            if not isinstance(entry, dict) or entry.get('version') != CONFIG_CACHE_VERSION \
+                    or not _is_plain(entry.get('config')):
+                raise ValueError("stale or invalid cache entry")
+            
+            stat = file_path.stat()
+            if entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                if hashlib.sha256(raw).hexdigest() != entry['sha256']:
+                    self.cache_misses += 1
+                    return None
+                entry['mtime_ns'] = stat.st_mtime_ns
+                entry['size'] = stat.st_size
+                self._write_entry(file_path, entry)
+            
+            config = entry['config']
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            self.cache_misses += 1
+            return None
+        
+        self.cache_hits += 1
+        return config
+    
+    def _store_cache(self, file_path: Path, raw: bytes, config: Any):
+        """Write a compiled cache entry (failures only disable caching)"""
+        if not _is_plain(config):
+            # YAML timestamps and other non-plain values are not cached;
+            # such files are parsed on every load
+            return
+        stat = file_path.stat()
+        entry = {
+            'version': CONFIG_CACHE_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': hashlib.sha256(raw).hexdigest(),
+            'config': config,
+        }
+        self._write_entry(file_path, entry)
+    
+    def _write_entry(self, file_path: Path, entry: Dict[str, Any]):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path = self._cache_path(file_path)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(entry, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
     def load_hierarchy_config(self, file_path: Path):
         """
         Load hierarchy configuration and register it
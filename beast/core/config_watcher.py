@@ -0,0 +1,167 @@
+"""
+Configuration File Watcher
+Detects changes to configuration files and reports them for hot reload
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# Completed writes and renames only, so half-written files are never read
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+# Quiet period that ends a burst of events (editors write several files)
+_SETTLE_SECONDS = 0.05
+
+
+class _Inotify:
+    """Minimal ctypes binding for a single inotify directory watch"""
+    
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, str(directory).encode(), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+    
+    def wait(self, timeout: float) -> List[str]:
+        """Block until events arrive (or timeout) and return the file names involved"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(data[offset:offset + length].rstrip(b"\0").decode(errors="replace"))
+            offset += length
+        return names
+    
+    def close(self):
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """
+    Watches configuration files in a directory
+    
+    Files are identified by (mtime, size) signatures; the callback runs
+    once per changed or newly created file. On Linux, inotify wakes the
+    watcher as soon as the directory changes; elsewhere (or when inotify is
+    unavailable) the directory is stat-polled every `interval` seconds.
+    Deleted files are forgotten but not reported.
+    """
+    
+    def __init__(self, directory: Path, callback: Callable[[Path], None],
+                 pattern: str = "*.yaml", interval: float = 1.0,
+                 use_inotify: bool = True):
+        """
+        Initialize watcher
+        
+        Args:
+            directory: Directory holding the configuration files
+            callback: Called with the path of each changed file
+            pattern: Glob pattern of watched files
+            interval: Polling interval in seconds (inotify: stop-check interval)
+            use_inotify: Use inotify when the platform supports it
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.directory = Path(directory)
+        self.callback = callback
+        self.pattern = pattern
+        self.interval = interval
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.backend: Optional[str] = None
+        self._signatures: Dict[Path, Tuple[int, int]] = self._scan()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        signatures = {}
+        for path in self.directory.glob(self.pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+    
+    def poll(self) -> List[Path]:
+        """
+        Check the files once and run the callback for each change
+        
+        Returns:
+            Paths that changed since the previous check
+        """
+        signatures = self._scan()
+        changed = [path for path, signature in sorted(signatures.items())
+                   if self._signatures.get(path) != signature]
+        self._signatures = signatures
+        for path in changed:
+            try:
+                self.callback(path)
+            except Exception as e:
+                print(f"Warning: Failed to apply configuration change in {path}: {e}")
+        return changed
+    
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify(self.directory)
+            except (OSError, AttributeError):
+                inotify = None
+        self.backend = "inotify" if inotify else "polling"
+        self._thread = threading.Thread(target=self._watch, args=(inotify,),
+                                        name="beast-config-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait: bool = True):
+        """Stop watching"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
+    
+    def _watch(self, inotify: Optional[_Inotify]):
+        try:
+            while not self._stop.is_set():
+                if inotify is None:
+                    self._stop.wait(self.interval)
+                elif not any(Path(name).match(self.pattern)
+                             for name in inotify.wait(self.interval)):
+                    continue
+                else:
+                    while inotify.wait(_SETTLE_SECONDS):
+                        pass
+                if not self._stop.is_set():
+                    self.poll()
+        finally:
+            if inotify is not None:
+                inotify.close()
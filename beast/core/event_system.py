@@ -3,7 +3,8 @@ Event System for Dynamic Communication
 Enables departments and automations to communicate via events
 """
 
-from typing import Dict, List, Callable, Any, Optional
+import threading
+from typing import Dict, List, Callable, Any, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
@@ -17,6 +18,8 @@ class EventType(Enum):
     CLASS_UPDATED = "class_updated"
     AUTOMATION_TRIGGERED = "automation_triggered"
     DEPARTMENT_LOADED = "department_loaded"
+    CONFIG_CHANGED = "config_changed"
+    MEMORY_REPORT = "memory_report"
     CUSTOM = "custom"
 
 
@@ -28,6 +31,7 @@ class Event:
     data: Dict[str, Any]
     timestamp: datetime
     metadata: Optional[Dict[str, Any]] = None
+    sequence: int = 0  # Position in the emitting EventSystem (1, 2, 3, ...)
 
 
 class EventSystem:
@@ -40,6 +44,15 @@ class EventSystem:
         self._subscribers: Dict[str, List[Callable]] = {}
         self._event_history: List[Event] = []
         self._max_history: int = 1000
+        self._sequence = 0
+        # Numbering and recording an event is atomic, so sequence numbers
+        # stay unique and consecutive with emitters on several threads
+        self._lock = threading.Lock()
+    
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last emitted event (0 before the first)"""
+        return self._sequence
     
     def subscribe(self, event_type: str, callback: Callable[[Event], None]):
         """
@@ -61,6 +74,23 @@ class EventSystem:
             if callback in self._subscribers[event_type]:
                 self._subscribers[event_type].remove(callback)
     
+    def replace_subscriptions(self, old: List[Tuple[str, Callable]],
+                              new: List[Tuple[str, Callable]]):
+        """
+        Swap one set of (event_type, callback) subscriptions for another
+        Each event type's subscriber list is replaced in a single assignment,
+        so an event is delivered to either the old or the new callbacks,
+        never both and never neither.
+        """
+        for event_type in dict.fromkeys([t for t, _ in old] + [t for t, _ in new]):
+            removed = [cb for t, cb in old if t == event_type]
+            subscribers = [cb for cb in self._subscribers.get(event_type, [])
+                           if cb not in removed]
+            for t, callback in new:
+                if t == event_type and callback not in subscribers:
+                    subscribers.append(callback)
+            self._subscribers[event_type] = subscribers
+    
     def emit(self, event_type: str, source: str, data: Dict[str, Any], 
              metadata: Optional[Dict[str, Any]] = None):
         """
@@ -72,20 +102,23 @@ class EventSystem:
             data: Event data
             metadata: Additional metadata
         """
-        event = Event(
-            event_type=event_type,
-            source=source,
-            data=data,
-            timestamp=datetime.now(),
-            metadata=metadata
-        )
+        with self._lock:
+            self._sequence += 1
+            event = Event(
+                event_type=event_type,
+                source=source,
+                data=data,
+                timestamp=datetime.now(),
+                metadata=metadata,
+                sequence=self._sequence
+            )
+            
+            # Store in history
+            self._event_history.append(event)
+            if len(self._event_history) > self._max_history:
+                self._event_history.pop(0)
         
-        # Store in history
-        self._event_history.append(event)
-        if len(self._event_history) > self._max_history:
-            self._event_history.pop(0)
-        
-        # Notify subscribers
+        # Notify subscribers (outside the lock - callbacks may emit)
         if event_type in self._subscribers:
             for callback in self._subscribers[event_type]:
                 try:
@@ -120,6 +153,36 @@ class EventSystem:
         
         return events[-limit:]
     
+    def get_events_after(self, after: int = 0, limit: int = 100,
+                         event_type: Optional[str] = None) -> List[Event]:
+        """
+        Events with a sequence number greater than `after`, oldest first
+        Sequence numbers in the history are consecutive, so the start of
+        the page is found without scanning (keyset pagination).
+        
+        Args:
+            after: Sequence number of the last event already seen
+            limit: Maximum number of events to return
+            event_type: Filter by event type (None for all)
+        
+        Returns:
+            List of events
+        """
+        with self._lock:
+            history = self._event_history[:]
+        if not history:
+            return []
+        start = max(0, after - history[0].sequence + 1)
+        if event_type is None:
+            return history[start:start + limit]
+        events = []
+        for event in history[start:]:
+            if event.event_type == event_type:
+                events.append(event)
+                if len(events) == limit:
+                    break
+        return events
+    
     def clear_history(self):
         """Clear event history"""
         self._event_history.clear()
@@ -3,21 +3,38 @@ Factory for initializing the entire system
 Loads configurations and registers all departments
 """
 
+import sys
 from pathlib import Path
-from typing import Optional
-from beast.core.registry import Registry
-from beast.core.event_system import EventSystem
+from typing import Dict, List, Optional, TYPE_CHECKING
+from beast.core.registry import Registry, DepartmentDescriptor
+from beast.core.event_system import EventSystem, EventType
 from beast.core.config_loader import ConfigLoader
 from beast.core.plugin_loader import PluginLoader
+from beast.core.startup_profiler import StartupProfiler
 from beast.core.models.hierarchy import HierarchyManager
-from beast.departments.hadracha import HadrachaDepartment
-from beast.departments.logistika import LogistikaDepartment
-from beast.departments.kochav_adam import KochavAdamDepartment
-from beast.departments.tifool import TifoolDepartment
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config.settings import CONFIG_DIR, HIERARCHY_CONFIG_PATH, DEPARTMENTS_CONFIG_PATH
+
+if TYPE_CHECKING:
+    from beast.automation.cache import AutomationResultCache
+    from beast.automation.prefork import PreforkPool
+    from beast.automation.triggers import TriggerManager
+    from beast.core.config_watcher import ConfigWatcher
+    from beast.core.instrumentation import Instrumentation
+    from beast.core.memory import MemorySampler
+    from beast.core.snapshot import SnapshotRestore
+    from beast.core.tenancy import SharedConfig
+
+
+def load_settings():
+    """
+    Import config.settings on first use
+    The project root is put first on sys.path here instead of at import
+    time, so another `config` package on the path cannot shadow it.
+    """
+    root = str(Path(__file__).resolve().parent.parent.parent)
+    if not sys.path or sys.path[0] != root:
+        sys.path.insert(0, root)
+    from config import settings
+    return settings
 
 
 class BeastFactory:
@@ -25,64 +42,184 @@ class BeastFactory:
     Factory class for creating and initializing the entire BEAST system
     """
     
-    def __init__(self):
+    def __init__(self, lazy: bool = False, shared_config: Optional['SharedConfig'] = None):
+        """
+        Initialize factory
+        
+        Args:
+            lazy: Register departments as descriptors and load each one on
+                first access instead of during initialize(). Unloaded
+                departments do not receive events.
+            shared_config: Parsed configuration and flyweight ranks shared
+                with other instances in this process (see TenantHost);
+                None loads the configuration files
+        """
+        self.lazy = lazy
+        self.shared_config = shared_config
+        self.settings = load_settings()
         self.registry = Registry()
         self.event_system = EventSystem()
-        self.config_loader = ConfigLoader(self.registry)
-        self.plugin_loader = PluginLoader(self.registry)
+        self.config_loader = ConfigLoader(self.registry,
+                                          cache_dir=self.settings.CONFIG_CACHE_DIR or None)
+        # No-op unless BEAST_STARTUP_PROFILE or BEAST_STARTUP_TRACE is set
+        self.startup_profiler = StartupProfiler.from_env()
+        self.plugin_loader = PluginLoader(self.registry, profiler=self.startup_profiler)
         self.hierarchy_manager: Optional[HierarchyManager] = None
+        self.result_cache: Optional['AutomationResultCache'] = None
+        self.trigger_manager: Optional['TriggerManager'] = None
+        self.config_watcher: Optional['ConfigWatcher'] = None
+        self.snapshot_restore: Optional['SnapshotRestore'] = None
+        self.instrumentation: Optional['Instrumentation'] = None
+        self.memory_sampler: Optional['MemorySampler'] = None
     
     def initialize(self):
         """
         Initialize the entire system
         Loads configurations and registers all departments
         """
-        # Load hierarchy configuration
-        hierarchy_config_path = HIERARCHY_CONFIG_PATH
-        if hierarchy_config_path.exists():
-            self.config_loader.load_hierarchy_config(hierarchy_config_path)
-            self.hierarchy_manager = HierarchyManager(self.registry)
-        else:
-            # Create default hierarchy manager
-            self.hierarchy_manager = HierarchyManager(self.registry)
-        
-        # Load and register departments
-        self._load_departments()
+        with self.startup_profiler.span("initialize"):
+            self.settings.ensure_log_dir()
+            
+            # Load hierarchy configuration
+            hierarchy_config_path = self.settings.HIERARCHY_CONFIG_PATH
+            shared = self.shared_config
+            if shared is not None and shared.hierarchy is not None:
+                self.config_loader.set_config(hierarchy_config_path.stem, shared.hierarchy)
+                self.registry.set_hierarchy_config(shared.hierarchy)
+                self.hierarchy_manager = HierarchyManager(self.registry, shared_ranks=shared.ranks)
+            elif hierarchy_config_path.exists():
+                with self.startup_profiler.span("load_hierarchy_config", "config"):
+                    self.config_loader.load_hierarchy_config(hierarchy_config_path)
+                self.hierarchy_manager = HierarchyManager(self.registry)
+            else:
+                # Create default hierarchy manager
+                self.hierarchy_manager = HierarchyManager(self.registry)
+            
+            # Load and register departments
+            self._load_departments()
+            
+            # Off unless BEAST_MEMORY_BUDGET_MB is set
+            if self.settings.MEMORY_BUDGET_MB:
+                self.start_memory_sampler()
         
+        self.startup_profiler.finish()
         return self
     
     def _load_departments(self):
         """Load all departments from configuration or defaults"""
         # Try to load from configuration
-        depts_config_path = DEPARTMENTS_CONFIG_PATH
-        if depts_config_path.exists():
+        depts_config_path = self.settings.DEPARTMENTS_CONFIG_PATH
+        shared = self.shared_config
+        if shared is not None and shared.departments is not None:
+            depts_config = shared.departments
+            self.config_loader.set_config(depts_config_path.stem, depts_config)
+        elif depts_config_path.exists():
             depts_config = self.config_loader.load_from_file(depts_config_path)
+        else:
+            depts_config = None
+        
+        if depts_config is not None:
             departments_config = depts_config.get('departments', [])
             
             for dept_config in departments_config:
                 if dept_config.get('enabled', True):
-                    try:
-                        dept = self.plugin_loader.load_department_from_module(
-                            dept_config['module_path'],
-                            dept_config['class_name']
-                        )
-                        dept.registry = self.registry
-                        dept.event_system = self.event_system
-                        
-                        # Special handling for Hadracha (needs hierarchy manager)
-                        if isinstance(dept, HadrachaDepartment):
-                            dept.hierarchy_manager = self.hierarchy_manager
-                        
-                        dept.initialize()
-                        self.registry.register_department(dept_config['name'], dept)
-                    except Exception as e:
-                        print(f"Warning: Failed to load department {dept_config['name']}: {e}")
+                    self._register_department(dept_config)
         else:
             # Load default departments directly
             self._load_default_departments()
+        
+        self._apply_profiling_config(depts_config.get('profiling') if depts_config else None)
+    
+    def _register_department(self, dept_config: dict):
+        """Register one department from its configuration entry"""
+        descriptor = DepartmentDescriptor(
+            name=dept_config['name'],
+            module_path=dept_config['module_path'],
+            class_name=dept_config['class_name'],
+            loader=self._create_department,
+            automations=dept_config.get('automations', []),
+            display_name=dept_config.get('display_name')
+        )
+        if self.lazy:
+            self.registry.register_lazy_department(descriptor)
+        else:
+            dept = self._create_department(descriptor)
+            if dept is not None:
+                self.registry.register_department(descriptor.name, dept)
+    
+    def _unregister_department(self, name: str):
+        """Remove a department, its automations and its event subscriptions"""
+        if self.registry.is_department_loaded(name):
+            dept = self.registry.get_department(name)
+            for automation in dept._automations.values():
+                if automation is None:
+                    continue
+                if self.result_cache:
+                    self.result_cache.detach(automation)
+                if self.trigger_manager:
+                    self.trigger_manager.detach(automation)
+            dept.unsubscribe_events()
+        self.registry.unregister_department(name)
+    
+    def _create_department(self, descriptor: DepartmentDescriptor):
+        """
+        Import, construct and initialize a department
+        
+        Args:
+            descriptor: Department descriptor
+        
+        Returns:
+            Initialized department, or None if loading failed
+        """
+        profiler = self.startup_profiler
+        with profiler.plugin(descriptor.name):
+            try:
+                dept = self.plugin_loader.load_department_from_module(
+                    descriptor.module_path,
+                    descriptor.class_name
+                )
+                dept.registry = self.registry
+                dept.event_system = self.event_system
+                
+                # Departments that work with ranks (e.g. Hadracha) get the hierarchy manager
+                if hasattr(dept, 'hierarchy_manager'):
+                    dept.hierarchy_manager = self.hierarchy_manager
+                
+                with profiler.phase("initialize"), \
+                        profiler.wrap_method(dept, "_register_automations", "register_automations"):
+                    dept.initialize()
+                
+                # Departments loaded after restore() take their state from the snapshot
+                if self.snapshot_restore is not None:
+                    self.snapshot_restore.apply(descriptor.name, dept)
+            except Exception as e:
+                profiler.record_failure(e)
+                print(f"Warning: Failed to load department {descriptor.name}: {e}")
+                return None
+        
+        # Departments loaded after enable_result_cache()/enable_triggers()
+        self._attach_automations(dept)
+        self.event_system.emit(EventType.DEPARTMENT_LOADED.value, "factory", {
+            "department": descriptor.name,
+            "lazy": self.lazy
+        })
+        return dept
+    
+    def _attach_automations(self, dept):
+        """Attach a department's automations to the result cache and triggers, if enabled"""
+        for automation in dept._automations.values():
+            if self.result_cache:
+                self.result_cache.attach(automation)
+            if self.trigger_manager:
+                self.trigger_manager.attach(automation)
     
     def _load_default_departments(self):
         """Load default departments if configuration is not available"""
+        from beast.departments.hadracha import HadrachaDepartment
+        from beast.departments.logistika import LogistikaDepartment
+        from beast.departments.kochav_adam import KochavAdamDepartment
+        from beast.departments.tifool import TifoolDepartment
+        
         departments = [
             HadrachaDepartment(registry=self.registry, 
                               event_system=self.event_system,
@@ -96,22 +233,352 @@ class BeastFactory:
             dept.initialize()
             self.registry.register_department(dept.name_en, dept)
     
+    def apply_config_file(self, path: Path) -> Optional[dict]:
+        """
+        Reload a configuration file and apply only what changed
+        
+        hierarchy.yaml updates ranks in place (added, removed, modified);
+        departments.yaml registers newly enabled departments, unregisters
+        disabled ones and reloads entries whose definition changed. A single
+        `config_changed` event describes the diff.
+        
+        Args:
+            path: Changed configuration file
+        
+        Returns:
+            The diff, or None if nothing changed
+        """
+        path = Path(path)
+        previous = self.config_loader.get_config(path.stem)
+        config = self.config_loader.reload_config(path)
+        if config == previous:
+            return None
+        
+        diff = {"config": path.stem, "path": str(path)}
+        if path.stem == self.settings.HIERARCHY_CONFIG_PATH.stem:
+            self.registry.set_hierarchy_config(config)
+            diff["ranks"] = self.hierarchy_manager.load_from_config(config or {})
+        elif path.stem == self.settings.DEPARTMENTS_CONFIG_PATH.stem:
+            diff["departments"] = self._apply_departments_config(previous or {}, config or {})
+            if (previous or {}).get('profiling') != (config or {}).get('profiling'):
+                diff["profiling"] = self._apply_profiling_config((config or {}).get('profiling'))
+        
+        self.event_system.emit(EventType.CONFIG_CHANGED.value, "factory", diff)
+        return diff
+    
+    def _apply_departments_config(self, previous: dict, config: dict) -> dict:
+        """Enable, disable and reload departments to match a new configuration"""
+        def enabled(entries: dict) -> dict:
+            return {dept['name']: dept for dept in entries.get('departments') or []
+                    if dept.get('enabled', True)}
+        
+        old, new = enabled(previous), enabled(config)
+        diff = {
+            "enabled": [name for name in new if name not in old],
+            "disabled": [name for name in old if name not in new],
+            "modified": [name for name in new if name in old and new[name] != old[name]],
+        }
+        for name in diff["disabled"] + diff["modified"]:
+            self._unregister_department(name)
+        for name in diff["modified"] + diff["enabled"]:
+            self._register_department(new[name])
+        return diff
+    
+    def _apply_profiling_config(self, spec) -> Optional[str]:
+        """
+        Switch the profiling hooks to match the `profiling` entry of
+        departments.yaml; BEAST_PROFILE_HOOKS, when set, takes precedence
+        
+        Returns:
+            The spec applied, or None if profiling is not configured
+        """
+        spec = self.settings.PROFILE_HOOKS or spec
+        if spec is not None:
+            from beast.core.instrumentation import OFF_SPECS
+            spec = str(spec).strip()
+            if spec.lower() in OFF_SPECS:
+                spec = "off"
+        if spec is None or spec == "off":
+            # No hooks, and the application's own signal handlers stay
+            if self.instrumentation is not None:
+                self.instrumentation.remove_signal_handlers()
+                self.instrumentation.disable()
+            return spec
+        try:
+            self.enable_profiling(spec, signals=True)
+        except ValueError as e:
+            print(f"Warning: Profiling hooks not enabled: {e}")
+            return None
+        return spec
+    
+    def enable_profiling(self, backend: Optional[str] = "counters",
+                         signals: bool = False) -> 'Instrumentation':
+        """
+        Install profiling hooks on department methods and automation execute()
+        See beast.core.instrumentation. Hooks are installed on the classes,
+        so they cover every instance in the process.
+        
+        Args:
+            backend: "counters", "timing", "cprofile" or "cprofile:<N>";
+                None to only follow this registry (hooks stay off)
+            signals: Toggle the hooks on SIGUSR1 and dump to PROFILE_DIR
+                on SIGUSR2 (main thread only)
+        
+        Returns:
+            The process-wide Instrumentation
+        """
+        from beast.core.instrumentation import get_instrumentation
+        instrumentation = get_instrumentation()
+        instrumentation.attach(self.registry)
+        if backend is not None:
+            instrumentation.enable(backend)
+        if signals:
+            instrumentation.install_signal_handlers(Path(self.settings.PROFILE_DIR))
+        self.instrumentation = instrumentation
+        return instrumentation
+    
+    def dump_profile(self, directory: Optional[Path] = None) -> List[Path]:
+        """
+        Write what the profiling hooks recorded
+        
+        Args:
+            directory: Output directory (default: PROFILE_DIR)
+        
+        Returns:
+            Written files (pstats, collapsed stacks or JSON, by backend)
+        """
+        if self.instrumentation is None:
+            return []
+        return self.instrumentation.dump(Path(directory or self.settings.PROFILE_DIR))
+    
+    def watch_config(self, interval: float = 1.0, use_inotify: bool = True) -> 'ConfigWatcher':
+        """
+        Apply configuration file changes as they happen
+        
+        Args:
+            interval: Polling interval in seconds when inotify is unavailable
+            use_inotify: Use inotify when the platform supports it
+        
+        Returns:
+            The running watcher (stop it with watcher.stop())
+        """
+        from beast.core.config_watcher import ConfigWatcher
+        if self.config_watcher is None:
+            self.config_watcher = ConfigWatcher(self.settings.CONFIG_DIR, self.apply_config_file,
+                                                interval=interval, use_inotify=use_inotify)
+        self.config_watcher.start()
+        return self.config_watcher
+    
+    def hot_swap_department(self, name: str):
+        """
+        Reload a department's module and swap in a new instance without downtime
+        See PluginLoader.hot_swap_department; result caching and event
+        triggers move to the new automations.
+        
+        Args:
+            name: Department name
+        
+        Returns:
+            The new department instance, or None if it was not loaded yet
+        """
+        old = self.registry.get_department(name) if self.registry.is_department_loaded(name) else None
+        new = self.plugin_loader.hot_swap_department(name)
+        if new is None:
+            return None
+        
+        for automation in old._automations.values():
+            if automation is None:
+                continue
+            if self.result_cache:
+                self.result_cache.detach(automation)
+            if self.trigger_manager:
+                self.trigger_manager.detach(automation)
+        self._attach_automations(new)
+        
+        self.event_system.emit(EventType.DEPARTMENT_LOADED.value, "factory", {
+            "department": name,
+            "lazy": self.lazy,
+            "hot_swapped": True
+        })
+        return new
+    
+    def snapshot(self, path: Path) -> dict:
+        """
+        Write the state of every loaded department to a binary snapshot
+        See beast.core.snapshot for the format
+        
+        Args:
+            path: Snapshot file
+        
+        Returns:
+            The snapshot index (sections with offsets, lengths and checksums)
+        """
+        from beast.core.snapshot import write_snapshot
+        passthrough = self.snapshot_restore.passthrough_sections() \
+            if self.snapshot_restore is not None else None
+        return write_snapshot(self, path, passthrough)
+    
+    def restore(self, path: Path) -> 'SnapshotRestore':
+        """
+        Restore department state from a snapshot written by snapshot()
+        
+        Loaded departments are restored immediately; lazy departments when
+        first loaded. No domain events are emitted.
+        
+        Args:
+            path: Snapshot file
+        
+        Returns:
+            The restore (restored and pending departments)
+        """
+        from beast.core.snapshot import SnapshotReader, SnapshotRestore
+        restore = SnapshotRestore(self, SnapshotReader(path))
+        self.snapshot_restore = restore
+        for name in sorted(restore.pending):
+            if self.registry.is_department_loaded(name):
+                restore.apply(name, self.registry.get_department(name))
+            elif self.registry.get_department_descriptor(name) is None:
+                print(f"Warning: Snapshot section '{name}' has no registered department - skipped")
+                restore.skip(name)
+        return restore
+    
+    def memory_report(self) -> dict:
+        """
+        Deep memory size of each department's data, the event history and
+        the result cache - see beast.core.memory.memory_report
+        """
+        from beast.core.memory import memory_report
+        return memory_report(self)
+    
+    def start_memory_sampler(self, budget: Optional[int] = None,
+                             interval: Optional[float] = None,
+                             budgets: Optional[Dict[str, int]] = None) -> 'MemorySampler':
+        """
+        Sample memory_report() in the background and emit a `memory_report`
+        event whenever a budget is exceeded
+        
+        Args:
+            budget: Total budget in bytes (default: BEAST_MEMORY_BUDGET_MB)
+            interval: Seconds between samples (default: BEAST_MEMORY_SAMPLE_INTERVAL)
+            budgets: Per-component budgets, e.g. {"kochav_adam.users": 200_000_000}
+        
+        Returns:
+            The running sampler
+        """
+        from beast.core.memory import MemorySampler
+        if budget is None and self.settings.MEMORY_BUDGET_MB:
+            budget = int(float(self.settings.MEMORY_BUDGET_MB) * 1024 * 1024)
+        if self.memory_sampler is not None:
+            self.memory_sampler.stop()
+        self.memory_sampler = MemorySampler(self, budget=budget,
+                                            interval=interval or self.settings.MEMORY_SAMPLE_INTERVAL,
+                                            budgets=budgets)
+        self.memory_sampler.start()
+        return self.memory_sampler
+    
     def get_system_info(self) -> dict:
         """Get information about the initialized system"""
         return {
             "departments": self.registry.list_departments(),
+            "loaded_departments": self.registry.list_loaded_departments(),
             "automations": self.registry.list_automations(),
             "hierarchy_ranks": [r.name for r in self.hierarchy_manager.list_ranks()] if self.hierarchy_manager else []
         }
+    
+    def enable_result_cache(self, max_entries: int = 1024,
+                            default_ttl: Optional[float] = None) -> 'AutomationResultCache':
+        """
+        Enable result caching for every registered automation that opts in
+        
+        Args:
+            max_entries: Maximum cached results
+            default_ttl: Seconds before an entry expires (None for no expiry)
+        
+        Returns:
+            The result cache
+        """
+        from beast.automation.cache import AutomationResultCache
+        if self.result_cache is None:
+            self.result_cache = AutomationResultCache(self.event_system, max_entries, default_ttl)
+        for dept_name, auto_names in self.registry.list_automations().items():
+            for auto_name in auto_names:
+                self.result_cache.attach(self.registry.get_automation(dept_name, auto_name))
+        return self.result_cache
+    
+    def enable_triggers(self, max_workers: int = 4) -> 'TriggerManager':
+        """
+        Bind the event triggers of every registered automation and start firing
+        
+        Args:
+            max_workers: Pool size for triggered runs
+        
+        Returns:
+            The trigger manager
+        """
+        from beast.automation.triggers import TriggerManager
+        if self.trigger_manager is None:
+            self.trigger_manager = TriggerManager(self.event_system, max_workers)
+        for dept_name, auto_names in self.registry.list_automations().items():
+            for auto_name in auto_names:
+                self.trigger_manager.attach(self.registry.get_automation(dept_name, auto_name))
+        self.trigger_manager.start()
+        return self.trigger_manager
+    
+    def export_metrics(self, path: Path) -> Path:
+        """
+        Write automation run telemetry to a file in Prometheus text format
+        
+        Args:
+            path: Output file path
+        
+        Returns:
+            Path written
+        """
+        from beast.automation.telemetry import export_prometheus
+        automations = [
+            self.registry.get_automation(dept_name, auto_name)
+            for dept_name, auto_names in self.registry.list_automations().items()
+            for auto_name in auto_names
+        ]
+        return export_prometheus(automations, path)
+    
+    def run_all(self, department: Optional[str] = None, parallelism: int = 4,
+                executor: str = "thread", timeout: Optional[float] = None,
+                kwargs: Optional[dict] = None) -> dict:
+        """
+        Run all registered automations concurrently
+        See beast.automation.runner.run_all for details
+        """
+        from beast.automation.runner import run_all
+        return run_all(self.registry, department=department, parallelism=parallelism,
+                       executor=executor, timeout=timeout, kwargs=kwargs)
+    
+    def prefork(self, workers: Optional[int] = None) -> 'PreforkPool':
+        """
+        Fork worker processes that serve automation and report requests
+        from this instance's loaded state without copying it
+        See beast.automation.prefork.PreforkPool for details
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+        
+        Returns:
+            The started pool
+        """
+        from beast.automation.prefork import PreforkPool
+        return PreforkPool(self, workers).start()
 
 
-def create_beast() -> BeastFactory:
+def create_beast(lazy: bool = False) -> BeastFactory:
     """
     Convenience function to create and initialize the BEAST system
     
+    Args:
+        lazy: Load departments on first access (see BeastFactory)
+    
     Returns:
         Initialized BeastFactory instance
     """
-    factory = BeastFactory()
+    factory = BeastFactory(lazy=lazy)
     factory.initialize()
     return factory
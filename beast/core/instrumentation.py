@@ -0,0 +1,575 @@
+"""
+Runtime Instrumentation
+Pluggable profiling hooks on department methods and automation execute()
+
+Hooks are installed by replacing the functions on the classes themselves
+(every public method of a loaded department's classes, and the execute()
+of each registered automation), so instances, pickles and snapshots are
+untouched. Turning profiling off puts the original functions back - a
+disabled hook costs nothing.
+"""
+
+import functools
+import inspect
+import itertools
+import json
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from beast.core.registry import Registry, RegistrySnapshot
+
+# Backend spec: "counters", "timing", "cprofile" or "cprofile:<every N calls>"
+DEFAULT_BACKEND = "counters"
+DEFAULT_SAMPLE_EVERY = 100
+# Specs that leave the hooks installed-but-off (signals can still switch them on)
+OFF_SPECS = ("", "off", "none", "false", "0")
+
+# Registry changes that can bring new department or automation classes
+_LOADING_ACTIONS = ("register_department", "load_department", "replace_department",
+                    "register_automation")
+
+# pstats key: (file, first line, function label)
+Site = Tuple[str, int, str]
+
+
+class CountersBackend:
+    """Call count, error count and cumulative wall / CPU time per method"""
+    
+    name = "counters"
+    
+    def __init__(self):
+        # label -> [calls, errors, wall total, cpu total, wall max]
+        self.stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def call(self, label: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - start_cpu
+            with self._lock:
+                entry = self.stats.get(label)
+                if entry is None:
+                    entry = self.stats[label] = [0, 0, 0.0, 0.0, 0.0]
+                entry[0] += 1
+                entry[1] += failed
+                entry[2] += wall
+                entry[3] += cpu
+                if wall > entry[4]:
+                    entry[4] = wall
+    
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-method totals, most total wall time first"""
+        with self._lock:
+            items = [(label, list(entry)) for label, entry in self.stats.items()]
+        items.sort(key=lambda item: item[1][2], reverse=True)
+        return {label: {
+            "calls": calls,
+            "errors": errors,
+            "wall_total": wall,
+            "wall_mean": wall / calls if calls else 0.0,
+            "wall_max": wall_max,
+            "cpu_total": cpu,
+        } for label, (calls, errors, wall, cpu, wall_max) in items}
+    
+    def write(self, directory: Path, stem: str, sites: Dict[str, Site]) -> List[Path]:
+        path = directory / f"{stem}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return [path]
+
+
+class TimingBackend:
+    """
+    Self and total time per call path of instrumented methods
+    
+    Each thread keeps its own stack of instrumented calls, so time spent in
+    nested instrumented calls is subtracted from the caller - no
+    sys.setprofile() hook is involved and untouched code runs at full speed.
+    """
+    
+    name = "timing"
+    
+    def __init__(self):
+        # call path (outermost first) -> [calls, total, self]
+        self.paths: Dict[Tuple[str, ...], List[float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def call(self, label: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # Frame: [call path, time spent in instrumented children]
+        frame = [stack[-1][0] + (label,) if stack else (label,), 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                entry = self.paths.get(frame[0])
+                if entry is None:
+                    entry = self.paths[frame[0]] = [0, 0.0, 0.0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += elapsed - frame[1]
+    
+    def collapsed(self) -> List[str]:
+        """Collapsed stacks ("a;b;c <self microseconds>") for flame graph tools"""
+        with self._lock:
+            paths = [(path, entry[2]) for path, entry in self.paths.items()]
+        lines = []
+        for path, self_time in sorted(paths):
+            microseconds = round(self_time * 1e6)
+            if microseconds > 0:
+                lines.append(f"{';'.join(path)} {microseconds}")
+        return lines
+    
+    def pstats(self, sites: Dict[str, Site]) -> Dict[Site, tuple]:
+        """Statistics in the pstats format, with callers from the call paths"""
+        with self._lock:
+            paths = [(path, list(entry)) for path, entry in self.paths.items()]
+        stats: Dict[Site, tuple] = {}
+        for path, (calls, total, self_time) in paths:
+            key = sites.get(path[-1], ("~", 0, path[-1]))
+            # Recursive calls count towards the call total only once
+            primitive = 0 if path[-1] in path[:-1] else calls
+            cumulative = 0.0 if primitive == 0 else total
+            cc, nc, tt, ct, callers = stats.get(key, (0, 0, 0.0, 0.0, {}))
+            if len(path) > 1:
+                caller = sites.get(path[-2], ("~", 0, path[-2]))
+                pcc, pnc, ptt, pct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (pcc + primitive, pnc + calls,
+                                   ptt + self_time, pct + cumulative)
+            stats[key] = (cc + primitive, nc + calls, tt + self_time, ct + cumulative, callers)
+        return stats
+    
+    def write(self, directory: Path, stem: str, sites: Dict[str, Site]) -> List[Path]:
+        stats_path = directory / f"{stem}.pstats"
+        with open(stats_path, "wb") as f:
+            marshal.dump(self.pstats(sites), f)
+        collapsed_path = directory / f"{stem}.collapsed"
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        return [stats_path, collapsed_path]
+
+
+class SampledCProfileBackend:
+    """
+    cProfile for one in every N instrumented calls
+    
+    A sampled call is profiled down to every Python function it reaches.
+    Calls nested inside a sample are part of it, and nothing is sampled
+    while another profiler is active on the thread.
+    """
+    
+    name = "cprofile"
+    
+    def __init__(self, every: int = DEFAULT_SAMPLE_EVERY):
+        """
+        Initialize backend
+        
+        Args:
+            every: Profile one call in this many
+        """
+        self.every = max(1, int(every))
+        self.samples = 0
+        self._counter = itertools.count()
+        self._local = threading.local()
+        self._profiles: List[Any] = []
+        self._busy = set()
+        self._lock = threading.Lock()
+    
+    def call(self, label: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        local = self._local
+        if getattr(local, "active", False) or next(self._counter) % self.every:
+            return func(*args, **kwargs)
+        if sys.getprofile() is not None:
+            return func(*args, **kwargs)
+        profile = getattr(local, "profile", None)
+        if profile is None:
+            import cProfile
+            profile = local.profile = cProfile.Profile()
+            with self._lock:
+                self._profiles.append(profile)
+        with self._lock:
+            self._busy.add(id(profile))
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool holds the interpreter hook
+            with self._lock:
+                self._busy.discard(id(profile))
+            return func(*args, **kwargs)
+        local.active = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            local.active = False
+            with self._lock:
+                self._busy.discard(id(profile))
+                self.samples += 1
+    
+    def stats(self) -> Optional[Any]:
+        """Merged pstats.Stats of every thread's samples (None before the first)"""
+        import pstats
+        with self._lock:
+            # A profile in the middle of a sample is picked up by the next dump
+            profiles = [profile for profile in self._profiles if id(profile) not in self._busy]
+            merged = None
+            for profile in profiles:
+                profile.create_stats()
+                if not profile.stats:
+                    continue
+                if merged is None:
+                    merged = pstats.Stats(profile)
+                else:
+                    merged.add(profile)
+        return merged
+    
+    def write(self, directory: Path, stem: str, sites: Dict[str, Site]) -> List[Path]:
+        stats = self.stats()
+        if stats is None:
+            return []
+        path = directory / f"{stem}.pstats"
+        stats.dump_stats(str(path))
+        return [path]
+
+
+BACKENDS = {
+    CountersBackend.name: CountersBackend,
+    TimingBackend.name: TimingBackend,
+    SampledCProfileBackend.name: SampledCProfileBackend,
+}
+
+
+def create_backend(spec: str) -> Any:
+    """
+    Build a backend from a spec string
+    
+    Args:
+        spec: "counters", "timing", "cprofile" or "cprofile:<N>" to
+            profile one call in N
+    """
+    name, _, argument = str(spec).strip().lower().partition(":")
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown profiling backend '{name}' "
+                         f"(expected one of: {', '.join(BACKENDS)})")
+    if not argument:
+        return backend_class()
+    if backend_class is not SampledCProfileBackend:
+        raise ValueError(f"Profiling backend '{name}' takes no argument")
+    try:
+        return backend_class(every=int(argument))
+    except ValueError:
+        raise ValueError(f"Invalid sampling rate in profiling spec '{spec}'") from None
+
+
+def _notify(message: str):
+    """Report from signal-driven work without going through sys.stdout"""
+    try:
+        os.write(2, (message + "\n").encode("utf-8", "replace"))
+    except OSError:
+        pass
+
+
+def _probe(instrumentation: 'Instrumentation', label: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def probe(*args, **kwargs):
+        backend = instrumentation.backend
+        if backend is None:
+            return func(*args, **kwargs)
+        return backend.call(label, func, args, kwargs)
+    probe.__beast_probe__ = func
+    return probe
+
+
+def _generator_probe(instrumentation: 'Instrumentation', label: str, func: Callable) -> Callable:
+    """
+    _probe for generator functions (e.g. streaming execute())
+    
+    Each resume of the generator is one backend call, so the totals cover
+    the whole iteration but not the consumer's work between chunks, and
+    "calls" counts resumes.
+    """
+    @functools.wraps(func)
+    def probe(*args, **kwargs):
+        generator = func(*args, **kwargs)
+        resume, argument = generator.send, None
+        try:
+            while True:
+                backend = instrumentation.backend
+                try:
+                    if backend is None:
+                        item = resume(argument)
+                    else:
+                        item = backend.call(label, resume, (argument,), {})
+                except StopIteration as stop:
+                    return stop.value
+                try:
+                    resume, argument = generator.send, (yield item)
+                except GeneratorExit:
+                    raise
+                except BaseException as error:
+                    resume, argument = generator.throw, error
+        finally:
+            generator.close()
+    probe.__beast_probe__ = func
+    return probe
+
+
+def _instrumentable(name: str, value: Any) -> bool:
+    # Coroutines and async generators are not hooked: a probe would only
+    # time their creation, and their awaits interleave with other tasks
+    target = inspect.unwrap(value) if inspect.isfunction(value) else value
+    return (inspect.isfunction(value) and not name.startswith("_")
+            and not hasattr(value, "__beast_probe__")
+            and not inspect.iscoroutinefunction(target)
+            and not inspect.isasyncgenfunction(target))
+
+
+class Instrumentation:
+    """
+    Installs and removes profiling hooks and owns the active backend
+    
+    Hooks live on classes, so there is one instance per process (see
+    get_instrumentation()); every attached registry contributes its
+    departments and automations.
+    """
+    
+    def __init__(self):
+        self.backend: Optional[Any] = None
+        # Last backend used - toggling back on continues it, dump() writes it
+        self.last_backend: Optional[Any] = None
+        self.sites: Dict[str, Site] = {}
+        self._patched: Dict[Tuple[type, str], Callable] = {}
+        self._registries: List['Registry'] = []
+        # Signal number -> handler replaced by install_signal_handlers()
+        self._previous_handlers: Dict[int, Any] = {}
+        self._lock = threading.RLock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    def attach(self, registry: 'Registry'):
+        """Instrument a registry's departments and automations, now and as they load"""
+        with self._lock:
+            if registry in self._registries:
+                return
+            self._registries.append(registry)
+            registry.watch(self._on_registry_change)
+            if self.backend is not None:
+                self._install_snapshot(registry.snapshot())
+    
+    def detach(self, registry: 'Registry'):
+        """Stop following a registry (installed hooks stay until disable())"""
+        with self._lock:
+            if registry in self._registries:
+                self._registries.remove(registry)
+                registry.unwatch(self._on_registry_change)
+    
+    def enable(self, backend: Union[str, Any] = DEFAULT_BACKEND):
+        """
+        Install the hooks and start recording
+        
+        Args:
+            backend: Backend instance or spec string (see create_backend)
+        """
+        if isinstance(backend, str):
+            backend = create_backend(backend)
+        with self._lock:
+            self.backend = self.last_backend = backend
+            for registry in self._registries:
+                self._install_snapshot(registry.snapshot())
+    
+    def disable(self):
+        """Remove every hook (the backend's data stays available to dump())"""
+        with self._lock:
+            for (cls, name), original in self._patched.items():
+                setattr(cls, name, original)
+            self._patched.clear()
+            self.backend = None
+    
+    def toggle(self) -> bool:
+        """Switch recording off, or back on with the last backend; returns the new state"""
+        with self._lock:
+            if self.backend is not None:
+                self.disable()
+            else:
+                self.enable(self.last_backend or DEFAULT_BACKEND)
+            return self.enabled
+    
+    def reset(self):
+        """Start over with an empty backend of the same kind"""
+        with self._lock:
+            if self.last_backend is None:
+                return
+            last = self.last_backend
+            if isinstance(last, SampledCProfileBackend):
+                fresh = SampledCProfileBackend(every=last.every)
+            else:
+                fresh = type(last)()
+            if self.backend is not None:
+                self.backend = fresh
+            self.last_backend = fresh
+    
+    def dump(self, directory: Path) -> List[Path]:
+        """
+        Write the recorded data of the current (or last) backend
+        
+        counters writes JSON; timing writes pstats and collapsed stacks;
+        cprofile writes pstats. pstats files open with `python -m pstats`
+        or snakeviz; collapsed stacks feed flamegraph.pl or speedscope.
+        
+        Args:
+            directory: Output directory (created if needed)
+        
+        Returns:
+            Written files
+        """
+        with self._lock:
+            backend = self.last_backend
+            sites = dict(self.sites)
+        if backend is None:
+            return []
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"beast-{backend.name}-{os.getpid()}-{datetime.now():%Y%m%d-%H%M%S}"
+        return backend.write(directory, stem, sites)
+    
+    def install_signal_handlers(self, directory: Path,
+                                toggle_signal: Optional[int] = None,
+                                dump_signal: Optional[int] = None) -> bool:
+        """
+        Toggle recording on one signal and dump on another
+        
+        Defaults to SIGUSR1 (toggle) and SIGUSR2 (dump). Signal handlers
+        can only be set from the main thread. The previous handlers are
+        kept and put back by remove_signal_handlers().
+        
+        The work runs on a short-lived thread, since the interrupted main
+        thread may hold a backend lock or be writing to stdout.
+        
+        Returns:
+            False if signals are unavailable here (non-main thread, Windows)
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        toggle_signal = toggle_signal or getattr(signal, "SIGUSR1", None)
+        dump_signal = dump_signal or getattr(signal, "SIGUSR2", None)
+        if toggle_signal is None or dump_signal is None:
+            return False
+        
+        def toggle():
+            state = "on" if self.toggle() else "off"
+            _notify(f"Profiling hooks turned {state}")
+        
+        def dump():
+            for path in self.dump(directory):
+                _notify(f"Profile written to {path}")
+        
+        def handler(work: Callable[[], None]) -> Callable:
+            def on_signal(signum, frame):
+                threading.Thread(target=work, name="beast-profile-signal", daemon=True).start()
+            return on_signal
+        
+        self.remove_signal_handlers()
+        self._previous_handlers = {
+            toggle_signal: signal.signal(toggle_signal, handler(toggle)),
+            dump_signal: signal.signal(dump_signal, handler(dump)),
+        }
+        return True
+    
+    def remove_signal_handlers(self):
+        """Put back the handlers replaced by install_signal_handlers() (main thread only)"""
+        if not self._previous_handlers or threading.current_thread() is not threading.main_thread():
+            return
+        for signum, previous in self._previous_handlers.items():
+            signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+        self._previous_handlers = {}
+    
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            backend = self.backend or self.last_backend
+            return {
+                "enabled": self.enabled,
+                "backend": backend.name if backend else None,
+                "hooks": len(self._patched),
+            }
+    
+    def _on_registry_change(self, snapshot: 'RegistrySnapshot', change: Dict[str, Any]):
+        if self.backend is not None and change.get("action") in _LOADING_ACTIONS:
+            with self._lock:
+                if self.backend is not None:
+                    self._install_snapshot(snapshot)
+    
+    def _install_snapshot(self, snapshot: 'RegistrySnapshot'):
+        for department in snapshot.departments.values():
+            self._install_department(type(department))
+        for automations in snapshot.automations.values():
+            for automation in automations.values():
+                if automation is not None:
+                    self._install_automation(type(automation))
+    
+    def _install_department(self, department_class: type):
+        for cls in department_class.__mro__:
+            if cls.__module__ in ("builtins", "abc"):
+                continue
+            for name, value in list(vars(cls).items()):
+                if _instrumentable(name, value):
+                    self._patch(cls, name, value)
+    
+    def _install_automation(self, automation_class: type):
+        for cls in automation_class.__mro__:
+            value = vars(cls).get("execute")
+            if value is None:
+                continue
+            if _instrumentable("execute", value) and not getattr(value, "__isabstractmethod__", False):
+                self._patch(cls, "execute", value)
+            return
+    
+    def _patch(self, cls: type, name: str, func: Callable):
+        if (cls, name) in self._patched:
+            return
+        label = func.__qualname__
+        # The wrapped function, not a decorator's wrapper (e.g. requires_access)
+        code = inspect.unwrap(func).__code__
+        self.sites.setdefault(label, (code.co_filename, code.co_firstlineno, label))
+        self._patched[(cls, name)] = func
+        probe = _generator_probe if inspect.isgeneratorfunction(inspect.unwrap(func)) else _probe
+        setattr(cls, name, probe(self, label, func))
+
+
+_instrumentation: Optional[Instrumentation] = None
+_instrumentation_lock = threading.Lock()
+
+
+def get_instrumentation() -> Instrumentation:
+    """The process-wide Instrumentation"""
+    global _instrumentation
+    with _instrumentation_lock:
+        if _instrumentation is None:
+            _instrumentation = Instrumentation()
+        return _instrumentation
@@ -0,0 +1,307 @@
+"""
+Memory Accounting
+Deep object sizes for per-tenant and per-component reporting, tracemalloc
+diffs grouped by module, and a sampler that reports when over budget
+"""
+
+import functools
+import gc
+import sys
+import threading
+import tracemalloc
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, TYPE_CHECKING
+
+from beast.core.event_system import EventType
+
+if TYPE_CHECKING:
+    from beast.core.factory import BeastFactory
+
+# Frames kept per allocation by start_tracing(), enough to get from library
+# code back to the beast module that asked for the memory
+DEFAULT_TRACE_FRAMES = 25
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+# Department attributes that are wiring, not data
+_DEPARTMENT_WIRING = ('registry', 'event_system', '_subscriptions', '_initialized', 'version')
+
+# Shared by every instance (code, classes, modules) - never counted or followed
+_OPAQUE_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+
+def deep_sizeof(obj: Any, exclude: Iterable[Any] = ()) -> int:
+    """
+    Approximate bytes reachable from an object
+    
+    Follows references (gc.get_referents) and counts each object once.
+    Classes, modules and functions are not followed, and neither are bound
+    methods (the instance is reached through its owner instead). Objects in
+    `exclude` - and everything only reachable through them - are skipped,
+    which is how shared state is kept out of a component's total.
+    Walks the whole object graph: meant for reports, not hot paths.
+    
+    Args:
+        obj: Root object
+        exclude: Objects not to count or traverse
+    
+    Returns:
+        Size in bytes
+    """
+    return _walk(obj, {id(item) for item in exclude})
+
+
+def _walk(obj: Any, seen: Set[int]) -> int:
+    """deep_sizeof() with a caller-owned `seen` set, so totals never overlap"""
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _OPAQUE_TYPES):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 0)
+        stack.extend(gc.get_referents(item))
+    return total
+
+
+def memory_report(factory: 'BeastFactory') -> Dict[str, Any]:
+    """
+    Deep sizes of the data each component of a system holds
+    
+    Every object is counted once. Objects reachable from several
+    components (a user in a classroom, a result in an event) count towards
+    the first: departments that own shared objects (see
+    BaseDepartment.get_snapshot_refs) come first, then the other
+    departments, the event system and the result cache. Framework plumbing
+    and ranks are not counted.
+    
+    Args:
+        factory: Initialized factory
+    
+    Returns:
+        {"departments": {name: {component: bytes, ..., "total": bytes}},
+        "event_system": {"history": ..., "subscribers": ..., "total": ...},
+        "result_cache": bytes, "total": bytes, "timestamp": ...}
+    """
+    departments = dict(factory.registry.snapshot().departments)
+    plumbing = [factory, factory.registry, factory.event_system, factory.config_loader,
+                factory.plugin_loader, factory.hierarchy_manager, factory.settings,
+                factory.result_cache, factory.trigger_manager, factory.config_watcher,
+                factory.snapshot_restore, factory.instrumentation, factory.memory_sampler,
+                *departments.values()]
+    if factory.hierarchy_manager is not None:
+        plumbing.extend(factory.hierarchy_manager.list_ranks())
+    seen = {id(item) for item in plumbing if item is not None}
+    
+    report: Dict[str, Any] = {"departments": {}}
+    owners_first = sorted(departments, key=lambda name: (not departments[name].get_snapshot_refs(), name))
+    for name in owners_first:
+        components = {}
+        for key, value in vars(departments[name]).items():
+            if key in _DEPARTMENT_WIRING:
+                continue
+            size = _walk(value, seen)
+            if size:
+                components[key.lstrip("_")] = size
+        components["total"] = sum(components.values())
+        report["departments"][name] = components
+    
+    events = factory.event_system
+    report["event_system"] = {
+        "history": _walk(events._event_history, seen),
+        "subscribers": _walk(events._subscribers, seen),
+    }
+    report["event_system"]["total"] = sum(report["event_system"].values())
+    report["result_cache"] = (_walk(vars(factory.result_cache), seen)
+                              if factory.result_cache is not None else 0)
+    report["total"] = (sum(entry["total"] for entry in report["departments"].values())
+                       + report["event_system"]["total"] + report["result_cache"])
+    report["timestamp"] = datetime.now().isoformat()
+    return report
+
+
+def component_size(report: Dict[str, Any], component: str) -> Optional[int]:
+    """
+    Look up one size in a memory_report()
+    
+    Args:
+        component: "total", "event_system", "result_cache", a department
+            name, or a dotted path such as "kochav_adam.users" or
+            "event_system.history"
+    
+    Returns:
+        Size in bytes, or None if the report has no such component
+    """
+    parts = component.split(".")
+    node = report["departments"].get(parts[0], report.get(parts[0]))
+    for part in parts[1:]:
+        node = node.get(part) if isinstance(node, dict) else None
+    if isinstance(node, dict):
+        node = node.get("total")
+    return node if isinstance(node, int) else None
+
+
+def start_tracing(frames: int = DEFAULT_TRACE_FRAMES):
+    """
+    Start tracemalloc for take_snapshot() / diff_by_module()
+    
+    Tracing slows allocation-heavy code noticeably; stop it with
+    tracemalloc.stop() when done. If tracing is already on (for example
+    by enable_memory_tracking()), it is left as it is.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Current traced allocations, without tracemalloc's own"""
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing - call start_tracing() first")
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+@functools.lru_cache(maxsize=None)
+def _beast_module(filename: str) -> Optional[str]:
+    try:
+        relative = Path(filename).resolve().relative_to(_PACKAGE_ROOT)
+    except ValueError:
+        return None
+    parts = relative.with_suffix("").parts
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(("beast",) + parts)
+
+
+def _owning_module(traceback: tracemalloc.Traceback) -> str:
+    # Frames run oldest to most recent; the innermost beast frame is responsible
+    for frame in reversed(traceback):
+        module = _beast_module(frame.filename)
+        if module is not None:
+            return module
+    return "(other)"
+
+
+def diff_by_module(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Allocation growth between two snapshots, grouped by beast module
+    
+    Each allocation is charged to the innermost beast module on its
+    traceback (standard library and third-party frames are skipped), or
+    to "(other)" if no beast code was involved. Tracebacks are only as
+    deep as tracemalloc was started with - see start_tracing().
+    
+    Args:
+        before: Earlier snapshot
+        after: Later snapshot
+        limit: Return only this many modules (largest growth first)
+    
+    Returns:
+        [{"module", "size_diff", "count_diff", "size", "count"}, ...]
+    """
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for stat in after.compare_to(before, "traceback"):
+        module = _owning_module(stat.traceback)
+        entry = grouped.get(module)
+        if entry is None:
+            entry = grouped[module] = {"module": module, "size_diff": 0, "count_diff": 0,
+                                       "size": 0, "count": 0}
+        entry["size_diff"] += stat.size_diff
+        entry["count_diff"] += stat.count_diff
+        entry["size"] += stat.size
+        entry["count"] += stat.count
+    rows = sorted(grouped.values(), key=lambda entry: entry["size_diff"], reverse=True)
+    return rows[:limit] if limit else rows
+
+
+class MemorySampler:
+    """
+    Measures memory_report() periodically and emits a `memory_report`
+    event while a budget is exceeded
+    
+    Each sample walks every department's data, so keep the interval in
+    the order of minutes for large schools.
+    """
+    
+    def __init__(self, factory: 'BeastFactory', budget: Optional[int] = None,
+                 interval: float = 60.0, budgets: Optional[Dict[str, int]] = None):
+        """
+        Initialize sampler
+        
+        Args:
+            factory: Initialized factory
+            budget: Limit for the total, in bytes (None for no total limit)
+            interval: Seconds between samples
+            budgets: Limits for single components, keyed as in
+                component_size() (e.g. {"kochav_adam.users": 200_000_000})
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.factory = factory
+        self.budgets = dict(budgets or {})
+        if budget is not None:
+            self.budgets["total"] = budget
+        self.interval = interval
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def check(self) -> List[str]:
+        """
+        Take one sample and emit the event if over budget
+        
+        Returns:
+            Components over their budget (empty if all within)
+        """
+        report = memory_report(self.factory)
+        self.last_report = report
+        sizes: Dict[str, int] = {}
+        for component, limit in self.budgets.items():
+            size = component_size(report, component)
+            if size is not None and size > limit:
+                sizes[component] = size
+        if sizes:
+            # Only the figures, not the report: events stay in the history,
+            # which the next sample measures
+            self.factory.event_system.emit(EventType.MEMORY_REPORT.value, "memory_sampler", {
+                "over_budget": list(sizes),
+                "sizes": sizes,
+                "budgets": {component: self.budgets[component] for component in sizes},
+                "total": report["total"],
+                "department_totals": {name: entry["total"]
+                                      for name, entry in report["departments"].items()},
+                "timestamp": report["timestamp"],
+            })
+        return list(sizes)
+    
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="beast-memory-sampler",
+                                        daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait: bool = True):
+        """Stop sampling"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Warning: Memory sample failed: {e}")
@@ -3,9 +3,11 @@ Dynamic Hierarchy System
 Hierarchy is loaded from configuration, allowing runtime changes
 """
 
-from typing import Dict, List, Optional, Set
-from beast.core.models.base_model import BaseModel
-from beast.core.registry import Registry
+from typing import Dict, List, Mapping, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from beast.core.authorization import Authorizer
+    from beast.core.registry import Registry
 
 
 class Rank:
@@ -45,6 +47,10 @@ class Rank:
         self.departments = departments or []
         self.parent_ranks = parent_ranks or []
     
+    def update_from(self, other: 'Rank'):
+        """Copy another rank's attributes in place (keeps existing references valid)"""
+        self.__dict__.update(other.__dict__)
+    
     def can_manage_rank(self, other_rank: 'Rank') -> bool:
         """Check if this rank can manage another rank"""
         if other_rank.name in self.parent_ranks:
@@ -71,17 +77,61 @@ class Rank:
         return f"Rank(name={self.name}, display_name={self.display_name}, level={self.level})"
 
 
+class SharedRank(Rank):
+    """
+    Read-only Rank shared by several HierarchyManagers (flyweight)
+    Managers replace it with a private copy before changing it.
+    """
+    
+    @classmethod
+    def freeze(cls, rank: Rank) -> 'SharedRank':
+        """Read-only copy of a rank"""
+        shared = object.__new__(cls)
+        shared.__dict__.update(rank.__dict__)
+        return shared
+    
+    def thaw(self) -> Rank:
+        """Private, modifiable copy"""
+        rank = object.__new__(Rank)
+        rank.__dict__.update({key: list(value) if isinstance(value, list) else value
+                              for key, value in self.__dict__.items()})
+        return rank
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Rank '{self.name}' is shared - use HierarchyManager.override_rank()")
+
+
 class HierarchyManager:
     """
     Manages the dynamic hierarchy system
     Loads ranks from configuration and provides hierarchy queries
     """
     
-    def __init__(self, registry: Optional[Registry] = None):
+    def __init__(self, registry: Optional['Registry'] = None,
+                 shared_ranks: Optional[Mapping[str, Rank]] = None):
+        """
+        Initialize manager
+        
+        Args:
+            registry: Registry holding the hierarchy configuration
+            shared_ranks: Flyweight ranks (SharedRank) to start from; they are
+                referenced, not copied, until this manager changes them
+        """
         self.registry = registry
-        self._ranks: Dict[str, Rank] = {}
+        self._ranks: Dict[str, Rank] = dict(shared_ranks or {})
+        # Bumped on every rank change; compiled permissions follow it
+        self.version = 0
+        self._authorizer: Optional['Authorizer'] = None
         self._load_from_registry()
     
+    @property
+    def authorizer(self) -> 'Authorizer':
+        """Department permissions of these ranks, compiled to bitmasks"""
+        if self._authorizer is None:
+            from beast.core.authorization import Authorizer
+            self._authorizer = Authorizer(self)
+        return self._authorizer
+    
     def _load_from_registry(self):
         """Load hierarchy configuration from registry"""
         if self.registry:
@@ -89,10 +139,15 @@ class HierarchyManager:
             if config:
                 self.load_from_config(config)
     
-    def load_from_config(self, config: Dict):
+    def load_from_config(self, config: Dict) -> Dict[str, List[str]]:
         """
         Load hierarchy from configuration
         
+        Only the differences from the current ranks are applied: new ranks
+        are added, missing ones removed, and changed ranks are updated in
+        place. A changed SharedRank is replaced by a private copy instead
+        (copy-on-write); users look their rank up by name, so they see it.
+        
         Expected config structure:
         {
             "ranks": [
@@ -105,13 +160,33 @@ class HierarchyManager:
                 ...
             ]
         }
-        """
-        ranks_config = config.get('ranks', [])
-        self._ranks.clear()
         
-        for rank_config in ranks_config:
+        Returns:
+            Diff applied: {"added": [...], "removed": [...], "modified": [...]}
+        """
+        ranks = {}
+        for rank_config in config.get('ranks', []):
             rank = Rank.from_config(rank_config)
-            self._ranks[rank.name] = rank
+            ranks[rank.name] = rank
+        
+        diff: Dict[str, List[str]] = {"added": [], "removed": [], "modified": []}
+        for name in [name for name in self._ranks if name not in ranks]:
+            del self._ranks[name]
+            diff["removed"].append(name)
+        for name, rank in ranks.items():
+            current = self._ranks.get(name)
+            if current is None:
+                self._ranks[name] = rank
+                diff["added"].append(name)
+            elif current.__dict__ != rank.__dict__:
+                if isinstance(current, SharedRank):
+                    self._ranks[name] = rank
+                else:
+                    current.update_from(rank)
+                diff["modified"].append(name)
+        if any(diff.values()):
+            self.version += 1
+        return diff
     
     def get_rank(self, rank_name: str) -> Optional[Rank]:
         """Get a rank by name"""
@@ -120,11 +195,38 @@ class HierarchyManager:
     def add_rank(self, rank: Rank):
         """Add or update a rank dynamically"""
         self._ranks[rank.name] = rank
+        self.version += 1
+    
+    def override_rank(self, rank_name: str, **changes) -> Rank:
+        """
+        Change attributes of a rank for this manager only
+        A shared rank is copied first; other managers keep the shared one.
+        
+        Returns:
+            The (possibly new) rank object
+        """
+        rank = self._ranks.get(rank_name)
+        if rank is None:
+            raise ValueError(f"Unknown rank: '{rank_name}'")
+        if isinstance(rank, SharedRank):
+            rank = rank.thaw()
+            self._ranks[rank_name] = rank
+        for key, value in changes.items():
+            if not hasattr(rank, key):
+                raise ValueError(f"Rank has no attribute '{key}'")
+            setattr(rank, key, value)
+        self.version += 1
+        return rank
+    
+    def is_shared(self, rank_name: str) -> bool:
+        """Whether a rank is still the shared flyweight"""
+        return isinstance(self._ranks.get(rank_name), SharedRank)
     
     def remove_rank(self, rank_name: str):
         """Remove a rank (if not in use)"""
         if rank_name in self._ranks:
             del self._ranks[rank_name]
+            self.version += 1
     
     def list_ranks(self) -> List[Rank]:
         """List all ranks, sorted by level"""
@@ -140,6 +242,16 @@ class HierarchyManager:
         
         return manager.can_manage_rank(managed)
     
-    def reload(self):
-        """Reload hierarchy from registry configuration"""
-        self._load_from_registry()
+    def reload(self) -> Dict[str, List[str]]:
+        """Reload hierarchy from registry configuration, returning the diff applied"""
+        config = self.registry.get_hierarchy_config() if self.registry else None
+        if not config:
+            return {"added": [], "removed": [], "modified": []}
+        return self.load_from_config(config)
+    
+    def __getstate__(self) -> Dict:
+        """Pickle ranks only - the registry stays with the owning process"""
+        state = self.__dict__.copy()
+        state['registry'] = None
+        state['_authorizer'] = None
+        return state
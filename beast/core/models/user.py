@@ -42,18 +42,22 @@ class User(BaseModel):
         self.department = department
         self.class_name = class_name
         self._hierarchy_manager = hierarchy_manager
-        self._rank: Optional[Rank] = None
-        
-        # Load rank if hierarchy manager is available
-        if self._hierarchy_manager:
-            self._rank = self._hierarchy_manager.get_rank(rank_name)
     
     @property
     def rank(self) -> Optional[Rank]:
-        """Get the user's rank object"""
-        if self._rank is None and self._hierarchy_manager:
-            self._rank = self._hierarchy_manager.get_rank(self.rank_name)
-        return self._rank
+        """
+        Get the user's rank object
+        Looked up by name on every access, so reloaded or overridden ranks
+        (which may be new Rank objects) apply to existing users.
+        """
+        if self._hierarchy_manager:
+            return self._hierarchy_manager.get_rank(self.rank_name)
+        return None
+    
+    @property
+    def hierarchy_manager(self) -> Optional[HierarchyManager]:
+        """Hierarchy manager the user's rank is looked up in"""
+        return self._hierarchy_manager
     
     @property
     def display_rank(self) -> str:
@@ -95,15 +99,11 @@ class User(BaseModel):
     def update_rank(self, new_rank_name: str):
         """Update user's rank"""
         self.rank_name = new_rank_name
-        if self._hierarchy_manager:
-            self._rank = self._hierarchy_manager.get_rank(new_rank_name)
         self.updated_at = datetime.now()
     
     def set_hierarchy_manager(self, hierarchy_manager: HierarchyManager):
         """Set hierarchy manager (useful for dynamic reloading)"""
         self._hierarchy_manager = hierarchy_manager
-        if self._hierarchy_manager:
-            self._rank = self._hierarchy_manager.get_rank(self.rank_name)
     
     def __repr__(self):
         return f"User(id={self.id_number}, name={self.full_name}, rank={self.display_rank})"
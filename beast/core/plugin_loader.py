@@ -6,9 +6,11 @@ Loads and manages plugins and departments dynamically
 import importlib
 import importlib.util
 import inspect
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional, Type
 from beast.core.registry import Registry
+from beast.core.startup_profiler import NULL_STARTUP_PROFILER
 
 
 class PluginLoader:
@@ -17,8 +19,16 @@ class PluginLoader:
     Supports hot-reloading and dynamic discovery
     """
     
-    def __init__(self, registry: Registry):
+    def __init__(self, registry: Registry, profiler=None):
+        """
+        Initialize loader
+        
+        Args:
+            registry: Registry instance
+            profiler: StartupProfiler timing imports and construction (optional)
+        """
         self.registry = registry
+        self.profiler = profiler or NULL_STARTUP_PROFILER
         self._loaded_modules: Dict[str, Any] = {}
     
     def load_department_from_module(self, module_path: str, department_class_name: str) -> Any:
@@ -33,7 +43,8 @@ class PluginLoader:
             Department instance
         """
         try:
-            module = importlib.import_module(module_path)
+            with self.profiler.phase("import"):
+                module = importlib.import_module(module_path)
             department_class = getattr(module, department_class_name)
             
             # Verify it's a department class
@@ -41,7 +52,8 @@ class PluginLoader:
             if not issubclass(department_class, BaseDepartment):
                 raise TypeError(f"{department_class_name} is not a valid department class")
             
-            instance = department_class()
+            with self.profiler.phase("construct"):
+                instance = department_class()
             self._loaded_modules[module_path] = module
             return instance
             
@@ -99,7 +111,62 @@ class PluginLoader:
         
         return departments
     
-    def reload_module(self, module_path: str):
-        """Reload a previously loaded module"""
-        if module_path in self._loaded_modules:
-            importlib.reload(self._loaded_modules[module_path])
+    def reload_module(self, module_path: str) -> Any:
+        """
+        Reload a module (importing it if it was never loaded)
+        
+        Returns:
+            The reloaded module
+        """
+        module = self._loaded_modules.get(module_path) or sys.modules.get(module_path)
+        if module is None:
+            module = importlib.import_module(module_path)
+        else:
+            module = importlib.reload(module)
+        self._loaded_modules[module_path] = module
+        return module
+    
+    def hot_swap_department(self, name: str) -> Optional[Any]:
+        """
+        Replace a running department with one built from its reloaded module
+        
+        The new instance takes over the old one's state (see
+        BaseDepartment.migrate_state) and automation run history, then the
+        registry entries, automations and event subscriptions are switched
+        over. Calls already running on the old instance finish there.
+        A department that has not been loaded yet only has its module
+        reloaded; it is built from the new code on first access.
+        
+        Args:
+            name: Department name
+        
+        Returns:
+            The new department instance, or None if it was not loaded
+        """
+        if not self.registry.is_department_loaded(name):
+            descriptor = self.registry.get_department_descriptor(name)
+            if descriptor is None:
+                raise ValueError(f"Department '{name}' is not registered")
+            self.reload_module(descriptor.module_path)
+            return None
+        
+        old = self.registry.get_department(name)
+        module = self.reload_module(type(old).__module__)
+        department_class = getattr(module, type(old).__name__)
+        
+        # Build and initialize off to the side: no registry, no event system
+        new = department_class()
+        new.migrate_state(old)
+        new.initialize()
+        for auto_name, automation in new._automations.items():
+            previous = old.get_automation(auto_name)
+            if automation is not None and previous is not None:
+                automation.history = previous.history
+        
+        new.registry = self.registry
+        self.registry.replace_department(name, new, new._automations)
+        if old.event_system:
+            old.event_system.replace_subscriptions(old._subscriptions, new._subscriptions)
+        new.event_system = old.event_system
+        old._subscriptions = []
+        return new
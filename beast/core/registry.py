@@ -3,78 +3,350 @@ Dynamic Registry System
 Manages registration and retrieval of departments, automations, and plugins
 """
 
-from typing import Dict, Any, List, Optional, Type
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Mapping, Optional, Tuple, Type
 from abc import ABC, abstractmethod
 
 
+class DepartmentDescriptor:
+    """
+    Deferred department registration
+    The department is imported, constructed and initialized on first use
+    """
+    
+    def __init__(self, name: str, module_path: str, class_name: str,
+                 loader: Callable[['DepartmentDescriptor'], Optional[Any]],
+                 automations: Optional[List[str]] = None,
+                 display_name: Optional[str] = None):
+        """
+        Initialize descriptor
+        
+        Args:
+            name: Department name
+            module_path: Module containing the department class
+            class_name: Department class name
+            loader: Builds the initialized department (returns None on failure)
+            automations: Automation names declared in configuration
+            display_name: Display name in Hebrew (optional)
+        """
+        self.name = name
+        self.module_path = module_path
+        self.class_name = class_name
+        self.loader = loader
+        self.automations = automations or []
+        self.display_name = display_name
+    
+    def load(self) -> Optional[Any]:
+        """Build the department instance"""
+        return self.loader(self)
+    
+    def __repr__(self):
+        return f"DepartmentDescriptor(name={self.name}, module={self.module_path}.{self.class_name})"
+
+
+def _read_only(mapping: Mapping) -> Mapping:
+    """Read-only view; mappings already frozen by a previous snapshot are shared, not copied"""
+    if isinstance(mapping, MappingProxyType):
+        return mapping
+    return MappingProxyType(dict(mapping))
+
+
+class RegistrySnapshot:
+    """
+    Immutable, consistent view of a Registry at one version
+    Mappings are read-only; every change to the registry publishes a new snapshot.
+    """
+    
+    __slots__ = ('version', 'departments', 'automations', 'plugins',
+                 'lazy_departments', 'hierarchy_config')
+    
+    def __init__(self, version: int = 0,
+                 departments: Optional[Dict[str, Any]] = None,
+                 automations: Optional[Dict[str, Dict[str, Any]]] = None,
+                 plugins: Optional[Dict[str, Any]] = None,
+                 lazy_departments: Optional[Dict[str, DepartmentDescriptor]] = None,
+                 hierarchy_config: Optional[Dict] = None):
+        automations = automations or {}
+        if not isinstance(automations, MappingProxyType):
+            automations = {dept: _read_only(autos) for dept, autos in automations.items()}
+        setattr_ = object.__setattr__
+        setattr_(self, 'version', version)
+        setattr_(self, 'departments', _read_only(departments or {}))
+        setattr_(self, 'automations', _read_only(automations))
+        setattr_(self, 'plugins', _read_only(plugins or {}))
+        setattr_(self, 'lazy_departments', _read_only(lazy_departments or {}))
+        setattr_(self, 'hierarchy_config', hierarchy_config)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("RegistrySnapshot is immutable")
+    
+    def replace(self, **fields) -> 'RegistrySnapshot':
+        """Copy with some fields replaced and the version bumped"""
+        values = {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'version'}
+        values.update(fields)
+        return RegistrySnapshot(version=self.version + 1, **values)
+    
+    def get_department(self, name: str) -> Optional[Any]:
+        """Loaded department (lazy departments are not loaded from a snapshot)"""
+        return self.departments.get(name)
+    
+    def get_automation(self, department: str, automation_name: str) -> Optional[Any]:
+        """Registered automation instance"""
+        return self.automations.get(department, {}).get(automation_name)
+    
+    def __repr__(self):
+        return (f"RegistrySnapshot(version={self.version}, departments={len(self.departments)}, "
+                f"lazy={len(self.lazy_departments)})")
+
+
 class Registry:
     """
     Central registry for all dynamic components
     Supports runtime registration of departments, automations, and plugins
+    
+    State lives in an immutable RegistrySnapshot. Readers use the current
+    snapshot without locking; writers serialize on a lock, build a new
+    snapshot and swap it in, so a reader never sees a half-applied change.
+    `version` increases with every change - callers can cache lookups and
+    revalidate with a single integer comparison - and watch() callbacks
+    are told about each change.
     """
     
     def __init__(self):
-        self._departments: Dict[str, Any] = {}
-        self._automations: Dict[str, List[Any]] = {}
-        self._plugins: Dict[str, Any] = {}
-        self._hierarchy_config: Optional[Dict] = None
+        self._snapshot = RegistrySnapshot()
+        # Serializes writers and lazy loading (reentrant: loading registers automations)
+        self._lock = threading.RLock()
+        self._loading: set = set()
+        self._watchers: Tuple[Callable[[RegistrySnapshot, Dict[str, Any]], None], ...] = ()
+    
+    @property
+    def version(self) -> int:
+        """Number of changes made so far"""
+        return self._snapshot.version
+    
+    def snapshot(self) -> RegistrySnapshot:
+        """Current consistent view (never changes once returned)"""
+        return self._snapshot
+    
+    def watch(self, callback: Callable[[RegistrySnapshot, Dict[str, Any]], None]):
+        """
+        Call `callback(snapshot, change)` after every change
+        
+        `change` holds the action (e.g. "register_department"), the names
+        involved and the new version. Callbacks run on the writing thread,
+        after the new snapshot is published.
+        """
+        with self._lock:
+            if callback not in self._watchers:
+                self._watchers = self._watchers + (callback,)
+    
+    def unwatch(self, callback: Callable[[RegistrySnapshot, Dict[str, Any]], None]):
+        """Stop calling a watch() callback"""
+        with self._lock:
+            self._watchers = tuple(w for w in self._watchers if w != callback)
+    
+    def _publish(self, action: str, change: Dict[str, Any], **fields) -> Tuple[RegistrySnapshot, Dict[str, Any]]:
+        """Swap in a new snapshot - caller holds the lock and calls _notify() after releasing it"""
+        snapshot = self._snapshot.replace(**fields)
+        self._snapshot = snapshot
+        return snapshot, dict(change, action=action, version=snapshot.version)
+    
+    def _notify(self, published: Tuple[RegistrySnapshot, Dict[str, Any]]):
+        snapshot, change = published
+        for callback in self._watchers:
+            try:
+                callback(snapshot, change)
+            except Exception as e:
+                print(f"Error in registry watcher: {e}")
     
     def register_department(self, name: str, department_instance: Any):
         """Register a department with the system"""
-        if name in self._departments:
-            raise ValueError(f"Department '{name}' is already registered")
-        self._departments[name] = department_instance
+        with self._lock:
+            snapshot = self._snapshot
+            if name in snapshot.departments or name in snapshot.lazy_departments:
+                raise ValueError(f"Department '{name}' is already registered")
+            departments = dict(snapshot.departments)
+            departments[name] = department_instance
+            published = self._publish("register_department", {"department": name},
+                                      departments=departments)
+        self._notify(published)
+    
+    def register_lazy_department(self, descriptor: DepartmentDescriptor):
+        """Register a department to be loaded on first access"""
+        with self._lock:
+            snapshot = self._snapshot
+            if descriptor.name in snapshot.departments or descriptor.name in snapshot.lazy_departments:
+                raise ValueError(f"Department '{descriptor.name}' is already registered")
+            lazy_departments = dict(snapshot.lazy_departments)
+            lazy_departments[descriptor.name] = descriptor
+            published = self._publish("register_lazy_department", {"department": descriptor.name},
+                                      lazy_departments=lazy_departments)
+        self._notify(published)
     
     def get_department(self, name: str) -> Optional[Any]:
-        """Retrieve a registered department"""
-        return self._departments.get(name)
+        """Retrieve a registered department (loading it if it is lazy)"""
+        snapshot = self._snapshot
+        department = snapshot.departments.get(name)
+        if department is None and name in snapshot.lazy_departments:
+            department = self._load_lazy_department(name)
+        return department
+    
+    def _load_lazy_department(self, name: str) -> Optional[Any]:
+        """Load a lazy department exactly once, even with concurrent callers"""
+        with self._lock:
+            snapshot = self._snapshot
+            if name in snapshot.departments:
+                return snapshot.departments[name]
+            descriptor = snapshot.lazy_departments.get(name)
+            if descriptor is None or name in self._loading:
+                # Unknown, or looked up again while it initializes
+                return None
+            self._loading.add(name)
+            try:
+                department = descriptor.load()
+            finally:
+                self._loading.discard(name)
+            
+            snapshot = self._snapshot
+            lazy_departments = dict(snapshot.lazy_departments)
+            lazy_departments.pop(name, None)
+            departments = dict(snapshot.departments)
+            if department is not None:
+                departments[name] = department
+            published = self._publish("load_department",
+                                      {"department": name, "loaded": department is not None},
+                                      departments=departments, lazy_departments=lazy_departments)
+        self._notify(published)
+        return department
+    
+    def get_department_descriptor(self, name: str) -> Optional[DepartmentDescriptor]:
+        """Get the descriptor of a department that has not been loaded yet"""
+        return self._snapshot.lazy_departments.get(name)
+    
+    def is_department_loaded(self, name: str) -> bool:
+        """Check whether a department has been instantiated"""
+        return name in self._snapshot.departments
     
     def list_departments(self) -> List[str]:
-        """List all registered department names"""
-        return list(self._departments.keys())
+        """List all registered department names (loaded or not)"""
+        snapshot = self._snapshot
+        return list(snapshot.departments.keys()) + [
+            name for name in snapshot.lazy_departments if name not in snapshot.departments
+        ]
+    
+    def list_loaded_departments(self) -> List[str]:
+        """List departments that have been instantiated"""
+        return list(self._snapshot.departments.keys())
     
     def unregister_department(self, name: str):
-        """Remove a department from registry"""
-        if name in self._departments:
-            del self._departments[name]
+        """Remove a department and its automations from registry"""
+        with self._lock:
+            snapshot = self._snapshot
+            departments = {k: v for k, v in snapshot.departments.items() if k != name}
+            lazy_departments = {k: v for k, v in snapshot.lazy_departments.items() if k != name}
+            automations = {k: v for k, v in snapshot.automations.items() if k != name}
+            published = self._publish("unregister_department", {"department": name},
+                                      departments=departments, lazy_departments=lazy_departments,
+                                      automations=automations)
+        self._notify(published)
     
     def register_automation(self, department: str, automation_name: str, automation_instance: Any):
         """Register an automation for a specific department"""
-        if department not in self._automations:
-            self._automations[department] = {}
-        if automation_name in self._automations[department]:
-            raise ValueError(f"Automation '{automation_name}' already exists in department '{department}'")
-        self._automations[department][automation_name] = automation_instance
+        with self._lock:
+            snapshot = self._snapshot
+            department_automations = dict(snapshot.automations.get(department, {}))
+            if automation_name in department_automations:
+                raise ValueError(f"Automation '{automation_name}' already exists in department '{department}'")
+            department_automations[automation_name] = automation_instance
+            automations = dict(snapshot.automations)
+            automations[department] = department_automations
+            published = self._publish("register_automation",
+                                      {"department": department, "automation": automation_name},
+                                      automations=automations)
+        self._notify(published)
+    
+    def unregister_automation(self, department: str, automation_name: str):
+        """Remove an automation from a department"""
+        with self._lock:
+            snapshot = self._snapshot
+            if automation_name not in snapshot.automations.get(department, {}):
+                return
+            automations = dict(snapshot.automations)
+            automations[department] = {k: v for k, v in automations[department].items()
+                                       if k != automation_name}
+            published = self._publish("unregister_automation",
+                                      {"department": department, "automation": automation_name},
+                                      automations=automations)
+        self._notify(published)
+    
+    def replace_department(self, name: str, department_instance: Any,
+                           automations: Dict[str, Any]):
+        """
+        Swap a registered department and its automations for new instances
+        Both change in a single snapshot: lookups made before the swap keep
+        the old objects, later ones see only the new ones.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if name not in snapshot.departments:
+                raise ValueError(f"Department '{name}' is not loaded")
+            departments = dict(snapshot.departments)
+            departments[name] = department_instance
+            all_automations = dict(snapshot.automations)
+            all_automations[name] = dict(automations)
+            published = self._publish("replace_department", {"department": name},
+                                      departments=departments, automations=all_automations)
+        self._notify(published)
     
     def get_automation(self, department: str, automation_name: str) -> Optional[Any]:
-        """Retrieve a specific automation"""
-        if department not in self._automations:
-            return None
-        return self._automations[department].get(automation_name)
+        """Retrieve a specific automation (loading a lazy department first)"""
+        snapshot = self._snapshot
+        if department in snapshot.lazy_departments:
+            self.get_department(department)
+            snapshot = self._snapshot
+        return snapshot.get_automation(department, automation_name)
     
     def list_automations(self, department: Optional[str] = None) -> Dict[str, List[str]]:
-        """List all automations, optionally filtered by department"""
+        """
+        List all automations, optionally filtered by department
+        Unloaded lazy departments report the automations declared in configuration
+        """
+        snapshot = self._snapshot
         if department:
-            return {department: list(self._automations.get(department, {}).keys())}
-        return {dept: list(autos.keys()) for dept, autos in self._automations.items()}
+            descriptor = snapshot.lazy_departments.get(department)
+            if descriptor is not None:
+                return {department: list(descriptor.automations)}
+            return {department: list(snapshot.automations.get(department, {}).keys())}
+        automations = {dept: list(autos.keys()) for dept, autos in snapshot.automations.items()}
+        for name, descriptor in snapshot.lazy_departments.items():
+            automations.setdefault(name, list(descriptor.automations))
+        return automations
     
     def register_plugin(self, plugin_name: str, plugin_instance: Any):
         """Register a plugin"""
-        if plugin_name in self._plugins:
-            raise ValueError(f"Plugin '{plugin_name}' is already registered")
-        self._plugins[plugin_name] = plugin_instance
+        with self._lock:
+            snapshot = self._snapshot
+            if plugin_name in snapshot.plugins:
+                raise ValueError(f"Plugin '{plugin_name}' is already registered")
+            plugins = dict(snapshot.plugins)
+            plugins[plugin_name] = plugin_instance
+            published = self._publish("register_plugin", {"plugin": plugin_name}, plugins=plugins)
+        self._notify(published)
     
     def get_plugin(self, plugin_name: str) -> Optional[Any]:
         """Retrieve a plugin"""
-        return self._plugins.get(plugin_name)
+        return self._snapshot.plugins.get(plugin_name)
     
     def set_hierarchy_config(self, config: Dict):
         """Set the hierarchy configuration dynamically"""
-        self._hierarchy_config = config
+        with self._lock:
+            published = self._publish("set_hierarchy_config", {}, hierarchy_config=config)
+        self._notify(published)
     
     def get_hierarchy_config(self) -> Optional[Dict]:
         """Get the current hierarchy configuration"""
-        return self._hierarchy_config
+        return self._snapshot.hierarchy_config
     
     def reload_department(self, name: str):
         """Reload a department (useful for hot-reloading)"""
@@ -0,0 +1,305 @@
+"""
+System State Snapshots
+Versioned, checksummed binary snapshots of department state for fast warm starts
+"""
+
+import gc
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from beast.core.factory import BeastFactory
+
+MAGIC = b"BEASTSNP"
+# Bump when the layout or the encoding of sections changes
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_PICKLE_PROTOCOL = 5
+# magic, format version, reserved, index length, index crc32
+_HEADER = struct.Struct("<8sHHII")
+# Sections start on 8-byte boundaries
+_ALIGNMENT = 8
+
+
+class _SectionPickler(pickle.Pickler):
+    """
+    Pickles one department's state
+    
+    Objects owned by the framework (registry, event system, hierarchy
+    manager, ranks, departments) and objects owned by another department
+    are written as references and resolved against the live system on
+    restore, so they are never duplicated.
+    """
+    
+    def __init__(self, file, section: str, shared: Dict[int, tuple],
+                 refs: Dict[int, Tuple[str, str]]):
+        super().__init__(file, protocol=SNAPSHOT_PICKLE_PROTOCOL)
+        self.section = section
+        self.shared = shared
+        self.refs = refs
+    
+    def persistent_id(self, obj):
+        token = self.shared.get(id(obj))
+        if token is not None:
+            return token
+        ref = self.refs.get(id(obj))
+        if ref is not None and ref[0] != self.section:
+            return ("ref",) + ref
+        return None
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_snapshot(factory: 'BeastFactory', path: Path,
+                   passthrough: Optional[Dict[str, bytes]] = None) -> Dict[str, Any]:
+    """
+    Write the state of every loaded department to a snapshot file
+    
+    Layout: fixed header, JSON index (per-section offset, length and
+    CRC-32), then one pickled section per department, 8-byte aligned. The
+    file is written to a temporary name and renamed into place.
+    
+    Args:
+        factory: Initialized factory
+        path: Output file
+        passthrough: Encoded sections to copy unchanged (departments
+            restored lazily and not loaded since)
+    
+    Returns:
+        The snapshot index
+    """
+    registry = factory.registry
+    snapshot = registry.snapshot()
+    departments = snapshot.departments
+    
+    shared: Dict[int, tuple] = {id(registry): ("registry",),
+                                id(factory.event_system): ("event_system",)}
+    if factory.hierarchy_manager is not None:
+        shared[id(factory.hierarchy_manager)] = ("hierarchy",)
+        for rank in factory.hierarchy_manager.list_ranks():
+            shared[id(rank)] = ("rank", rank.name)
+    for name, dept in departments.items():
+        shared[id(dept)] = ("department", name)
+    refs: Dict[int, Tuple[str, str]] = {}
+    for name, dept in departments.items():
+        for key, obj in dept.get_snapshot_refs().items():
+            refs[id(obj)] = (name, key)
+    
+    sections: List[Tuple[str, bytes]] = []
+    for name in sorted(departments):
+        buffer = io.BytesIO()
+        _SectionPickler(buffer, name, shared, refs).dump(departments[name].get_snapshot_state())
+        sections.append((name, buffer.getvalue()))
+    for name, data in sorted((passthrough or {}).items()):
+        if name not in departments:
+            sections.append((name, bytes(data)))
+    
+    entries = [{"name": name, "length": len(data), "crc32": zlib.crc32(data)}
+               for name, data in sections]
+    index = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "pickle_protocol": SNAPSHOT_PICKLE_PROTOCOL,
+        "created_at": datetime.now().isoformat(),
+        "registry_version": snapshot.version,
+        "sections": entries,
+    }
+    # Offsets are stored in the index, so lay out until the encoded index
+    # no longer changes (offsets only grow, so this settles)
+    index_bytes = b""
+    while True:
+        offset = _align(_HEADER.size + len(index_bytes))
+        for entry in entries:
+            entry["offset"] = offset
+            offset = _align(offset + entry["length"])
+        encoded = json.dumps(index, ensure_ascii=False).encode("utf-8")
+        if encoded == index_bytes:
+            break
+        index_bytes = encoded
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, SNAPSHOT_FORMAT_VERSION, 0,
+                             len(index_bytes), zlib.crc32(index_bytes)))
+        f.write(index_bytes)
+        for entry, (_, data) in zip(entries, sections):
+            f.write(b"\0" * (entry["offset"] - f.tell()))
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return index
+
+
+class SnapshotReader:
+    """
+    Memory-mapped snapshot file
+    
+    The header and index are validated on open; each section is checked
+    against its CRC-32 only when it is read.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Open and validate a snapshot
+        
+        Args:
+            path: Snapshot file
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.index = self._read_index()
+        except Exception:
+            self._mmap.close()
+            raise
+        self.sections = {entry["name"]: entry for entry in self.index["sections"]}
+        self._lock = threading.Lock()
+    
+    def _read_index(self) -> Dict[str, Any]:
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Not a BEAST snapshot: {self.path}")
+        magic, version, _, index_length, index_crc = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a BEAST snapshot: {self.path}")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {version} "
+                             f"(expected {SNAPSHOT_FORMAT_VERSION})")
+        index_bytes = self._mmap[_HEADER.size:_HEADER.size + index_length]
+        if len(index_bytes) != index_length or zlib.crc32(index_bytes) != index_crc:
+            raise ValueError(f"Snapshot index is corrupt: {self.path}")
+        index = json.loads(index_bytes.decode("utf-8"))
+        for entry in index["sections"]:
+            if entry["offset"] + entry["length"] > len(self._mmap):
+                raise ValueError(f"Snapshot is truncated: {self.path}")
+        return index
+    
+    def read_section(self, name: str) -> bytes:
+        """
+        Raw bytes of a section, verified against its checksum
+        
+        Raises:
+            ValueError: On a checksum mismatch or unknown section
+        """
+        entry = self.sections.get(name)
+        if entry is None:
+            raise ValueError(f"Snapshot has no section '{name}'")
+        with self._lock:
+            data = self._mmap[entry["offset"]:entry["offset"] + entry["length"]]
+        if zlib.crc32(data) != entry["crc32"]:
+            raise ValueError(f"Snapshot section '{name}' is corrupt: {self.path}")
+        return data
+    
+    def close(self):
+        with self._lock:
+            self._mmap.close()
+
+
+class _SectionUnpickler(pickle.Unpickler):
+    def __init__(self, file, restore: 'SnapshotRestore'):
+        super().__init__(file)
+        self.restore = restore
+    
+    def persistent_load(self, pid):
+        return self.restore._resolve(pid)
+
+
+class SnapshotRestore:
+    """
+    Applies a snapshot to a factory's departments, one department at a time
+    
+    Loaded departments are restored right away; lazy ones when they are
+    first loaded. A department's section is decoded only when it is
+    applied, or when another department's state references objects it
+    owns. State is installed directly, so no domain events are emitted.
+    """
+    
+    def __init__(self, factory: 'BeastFactory', reader: SnapshotReader):
+        self.factory = factory
+        self.reader = reader
+        self.pending = set(reader.sections)
+        self.restored: List[str] = []
+        self._refs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+    
+    def apply(self, name: str, department: Any) -> bool:
+        """
+        Restore one department if the snapshot has state for it
+        
+        Returns:
+            True if state was installed
+        """
+        with self._lock:
+            if name not in self.pending:
+                return False
+            # Removed first so references back to this department resolve to it
+            self.pending.discard(name)
+            data = self.reader.read_section(name)
+            gc_was_enabled = gc.isenabled()
+            # Decoding creates many objects at once - skip the collector passes
+            gc.disable()
+            try:
+                state = _SectionUnpickler(io.BytesIO(data), self).load()
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+            department.restore_snapshot_state(state)
+            self.restored.append(name)
+            if not self.pending:
+                self.reader.close()
+            return True
+    
+    def skip(self, name: str):
+        """Drop a section that will not be applied"""
+        with self._lock:
+            self.pending.discard(name)
+            if not self.pending:
+                self.reader.close()
+    
+    def passthrough_sections(self) -> Dict[str, bytes]:
+        """Encoded sections not applied yet (kept by the next snapshot)"""
+        with self._lock:
+            return {name: self.reader.read_section(name) for name in self.pending}
+    
+    def _department(self, name: str) -> Any:
+        # Loads lazy departments, which applies their own section first
+        department = self.factory.registry.get_department(name)
+        if department is None:
+            raise ValueError(f"Snapshot references unknown department '{name}'")
+        self.apply(name, department)
+        return department
+    
+    def _resolve(self, pid: tuple) -> Any:
+        kind = pid[0]
+        if kind == "ref":
+            _, owner, key = pid
+            refs = self._refs.get(owner)
+            if refs is None:
+                refs = self._refs[owner] = self._department(owner).get_snapshot_refs()
+            if key not in refs:
+                raise ValueError(f"Snapshot references missing object '{key}' of '{owner}'")
+            return refs[key]
+        if kind == "rank":
+            manager = self.factory.hierarchy_manager
+            return manager.get_rank(pid[1]) if manager else None
+        if kind == "hierarchy":
+            return self.factory.hierarchy_manager
+        if kind == "registry":
+            return self.factory.registry
+        if kind == "event_system":
+            return self.factory.event_system
+        if kind == "department":
+            return self._department(pid[1])
+        raise ValueError(f"Unknown snapshot reference: {pid!r}")
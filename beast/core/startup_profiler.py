@@ -0,0 +1,360 @@
+"""
+Startup Profiler
+Times plugin imports, construction and initialization during system startup
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Set to any non-empty value to print a startup report after initialize()
+PROFILE_ENV = "BEAST_STARTUP_PROFILE"
+# Set to a file path to also write a Chrome trace-event JSON (implies profiling)
+TRACE_ENV = "BEAST_STARTUP_TRACE"
+
+# Per-plugin phases, in report column order
+PHASES = ("import", "construct", "initialize", "register_automations")
+_PHASE_LABELS = {"register_automations": "automations"}
+
+
+class _NullSpan:
+    """Reusable no-op context manager"""
+    
+    def __enter__(self):
+        return None
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullStartupProfiler:
+    """Disabled profiler - every hook is a no-op"""
+    
+    enabled = False
+    
+    def plugin(self, name: str):
+        return _NULL_SPAN
+    
+    def phase(self, phase: str):
+        return _NULL_SPAN
+    
+    def span(self, name: str, category: str = "startup"):
+        return _NULL_SPAN
+    
+    def wrap_method(self, obj: Any, method_name: str, phase: str):
+        return _NULL_SPAN
+    
+    def record_failure(self, error: BaseException):
+        pass
+    
+    def finish(self):
+        pass
+
+
+NULL_STARTUP_PROFILER = NullStartupProfiler()
+
+
+class _Span:
+    """Timed region; nested spans on the same thread are subtracted as children"""
+    
+    def __init__(self, profiler: 'StartupProfiler', name: str, category: str,
+                 plugin: Optional[str] = None, phase: Optional[str] = None):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.plugin = plugin
+        self.phase = phase
+        self.start = 0.0
+        self.child_time = 0.0
+    
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_time += duration
+        self.profiler._record(self, duration)
+        return False
+
+
+class _TimingLoader:
+    """Loader proxy that times exec_module (the module body and its own imports)"""
+    
+    def __init__(self, loader: Any, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._profiler = profiler
+    
+    def create_module(self, spec):
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module else None
+    
+    def exec_module(self, module):
+        # Hand the module its real loader back before running it
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        with _Span(self._profiler, module.__name__, "import"):
+            self._loader.exec_module(module)
+    
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer:
+    """sys.meta_path hook that wraps the loaders of modules imported while active"""
+    
+    def __init__(self, profiler: 'StartupProfiler'):
+        self.profiler = profiler
+    
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if isinstance(finder, _ImportTimer):
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Records where startup time goes, per plugin
+    
+    For each department it records import time (cumulative, including
+    transitive imports, with per-module self time as in `-X importtime`),
+    construction, initialize() and _register_automations time, plus any
+    failure with its traceback. Results are available as a sorted text
+    report and as Chrome trace events (chrome://tracing, Perfetto).
+    """
+    
+    enabled = True
+    
+    def __init__(self, trace_path: Optional[Path] = None):
+        """
+        Initialize profiler
+        
+        Args:
+            trace_path: Where finish() writes the Chrome trace (None to skip)
+        """
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.plugins: Dict[str, Dict[str, Any]] = {}
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._import_timer = _ImportTimer(self)
+        self._import_depth = 0
+    
+    @classmethod
+    def from_env(cls):
+        """Profiler configured from the environment, or the no-op profiler"""
+        trace_path = os.getenv(TRACE_ENV)
+        if not os.getenv(PROFILE_ENV) and not trace_path:
+            return NULL_STARTUP_PROFILER
+        return cls(trace_path=trace_path)
+    
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _current_plugin(self) -> Optional[str]:
+        return getattr(self._local, "plugin", None)
+    
+    def plugin(self, name: str) -> '_PluginScope':
+        """Attribute the phases and imports inside the block to a plugin"""
+        return _PluginScope(self, name)
+    
+    def phase(self, phase: str) -> _Span:
+        """Time one phase of the current plugin"""
+        plugin = self._current_plugin()
+        return _Span(self, f"{plugin}.{phase}" if plugin else phase, "phase",
+                     plugin=plugin, phase=phase)
+    
+    def span(self, name: str, category: str = "startup") -> _Span:
+        """Time an arbitrary region (appears in the trace only)"""
+        return _Span(self, name, category)
+    
+    def wrap_method(self, obj: Any, method_name: str, phase: str) -> '_MethodTimer':
+        """Time every call of obj.<method_name> as a phase while the block runs"""
+        return _MethodTimer(self, obj, method_name, phase)
+    
+    def record_failure(self, error: BaseException):
+        """Mark the current plugin as failed"""
+        plugin = self._current_plugin()
+        if plugin is None:
+            return
+        with self._lock:
+            entry = self._plugin_entry(plugin)
+            entry["status"] = "failed"
+            entry["error"] = f"{type(error).__name__}: {error}"
+            entry["traceback"] = traceback.format_exc()
+    
+    def _plugin_entry(self, plugin: str) -> Dict[str, Any]:
+        entry = self.plugins.get(plugin)
+        if entry is None:
+            entry = {phase: 0.0 for phase in PHASES}
+            entry.update(total=0.0, modules=0, status="ok")
+            self.plugins[plugin] = entry
+        return entry
+    
+    def _record(self, span: _Span, duration: float):
+        with self._lock:
+            self.spans.append({
+                "name": span.name,
+                "cat": span.category,
+                "start": span.start - self._origin,
+                "duration": duration,
+                "self": duration - span.child_time,
+                "tid": threading.get_ident(),
+                "plugin": span.plugin or self._current_plugin(),
+            })
+            if span.phase is not None and span.plugin is not None:
+                self._plugin_entry(span.plugin)[span.phase] += duration
+            elif span.category == "plugin":
+                self._plugin_entry(span.name)["total"] += duration
+    
+    def _install_import_timer(self):
+        with self._lock:
+            self._import_depth += 1
+            if self._import_depth == 1:
+                sys.meta_path.insert(0, self._import_timer)
+    
+    def _remove_import_timer(self):
+        with self._lock:
+            self._import_depth -= 1
+            if self._import_depth == 0 and self._import_timer in sys.meta_path:
+                sys.meta_path.remove(self._import_timer)
+    
+    def slowest_imports(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Imported modules with the most self time"""
+        imports = [span for span in self.spans if span["cat"] == "import"]
+        return sorted(imports, key=lambda span: span["self"], reverse=True)[:limit]
+    
+    def report(self) -> str:
+        """Plain-text report, slowest plugin first"""
+        lines = ["Startup profile (ms)",
+                 f"{'plugin':<20}{'total':>10}"
+                 + "".join(f"{_PHASE_LABELS.get(p, p):>12}" for p in PHASES)
+                 + f"{'modules':>9}  status"]
+        ordered = sorted(self.plugins.items(), key=lambda item: item[1]["total"], reverse=True)
+        for name, entry in ordered:
+            lines.append(f"{name:<20}{entry['total'] * 1000:>10.2f}"
+                         + "".join(f"{entry[p] * 1000:>12.2f}" for p in PHASES)
+                         + f"{entry['modules']:>9}  {entry['status']}")
+            if entry["status"] == "failed":
+                lines.append(f"    {entry['error']}")
+        
+        slowest = self.slowest_imports()
+        if slowest:
+            lines.append("")
+            lines.append("Slowest imports (self / cumulative ms)")
+            for span in slowest:
+                lines.append(f"  {span['self'] * 1000:>8.2f} {span['duration'] * 1000:>9.2f}  "
+                             f"{span['name']} ({span['plugin'] or '-'})")
+        return "\n".join(lines)
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace in Chrome trace-event format (complete "X" events, microseconds)"""
+        pid = os.getpid()
+        events = [{
+            "name": span["name"],
+            "cat": span["cat"],
+            "ph": "X",
+            "ts": round(span["start"] * 1e6, 3),
+            "dur": round(span["duration"] * 1e6, 3),
+            "pid": pid,
+            "tid": span["tid"],
+            "args": {"plugin": span["plugin"], "self_us": round(span["self"] * 1e6, 3)},
+        } for span in self.spans]
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"plugins": self.plugins}}
+    
+    def write_trace(self, path: Path) -> Path:
+        """Write the Chrome trace JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+    
+    def finish(self):
+        """Print the report and write the trace if configured"""
+        print(self.report())
+        if self.trace_path:
+            self.write_trace(self.trace_path)
+            print(f"Startup trace written to {self.trace_path}")
+
+
+class _PluginScope:
+    """Context for one plugin: times it as a whole and times its imports"""
+    
+    def __init__(self, profiler: StartupProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.span = _Span(profiler, name, "plugin")
+        self.previous: Optional[str] = None
+        self.modules_before = 0
+    
+    def __enter__(self):
+        self.previous = self.profiler._current_plugin()
+        self.profiler._local.plugin = self.name
+        self.modules_before = len(sys.modules)
+        self.profiler._install_import_timer()
+        self.span.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.span.__exit__(exc_type, exc, tb)
+        self.profiler._remove_import_timer()
+        with self.profiler._lock:
+            self.profiler._plugin_entry(self.name)["modules"] += len(sys.modules) - self.modules_before
+        self.profiler._local.plugin = self.previous
+        return False
+
+
+class _MethodTimer:
+    """Temporarily shadows a bound method with a timed wrapper"""
+    
+    def __init__(self, profiler: StartupProfiler, obj: Any, method_name: str, phase: str):
+        self.profiler = profiler
+        self.obj = obj
+        self.method_name = method_name
+        self.phase = phase
+        self.shadowed = method_name in getattr(obj, "__dict__", {})
+    
+    def __enter__(self):
+        if self.shadowed:
+            return self
+        method = getattr(self.obj, self.method_name)
+        
+        def timed(*args, **kwargs):
+            with self.profiler.phase(self.phase):
+                return method(*args, **kwargs)
+        
+        setattr(self.obj, self.method_name, timed)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if not self.shadowed:
+            self.obj.__dict__.pop(self.method_name, None)
+        return False
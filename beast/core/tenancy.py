@@ -0,0 +1,204 @@
+"""
+Multi-Campus Tenancy
+Runs several isolated BEAST instances in one process over shared configuration
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
+from beast.core.config_loader import ConfigLoader
+from beast.core.factory import BeastFactory, load_settings
+from beast.core.memory import deep_sizeof
+from beast.core.models.hierarchy import Rank, SharedRank
+from beast.core.registry import Registry
+
+
+class SharedConfig:
+    """
+    Configuration parsed once and shared by every tenant
+    
+    Holds the parsed hierarchy and departments configuration plus one
+    flyweight SharedRank per rank. Tenants reference these objects instead
+    of copying them; a tenant that overrides a rank gets a private copy
+    (HierarchyManager.override_rank). The parsed dictionaries are shared
+    as-is and must be treated as read-only.
+    """
+    
+    def __init__(self, hierarchy: Optional[Dict[str, Any]] = None,
+                 departments: Optional[Dict[str, Any]] = None):
+        """
+        Initialize shared configuration
+        
+        Args:
+            hierarchy: Parsed hierarchy configuration (None for no ranks)
+            departments: Parsed departments configuration (None for defaults)
+        """
+        self.hierarchy = hierarchy
+        self.departments = departments
+        ranks = {}
+        for rank_config in (hierarchy or {}).get('ranks', []):
+            rank = SharedRank.freeze(Rank.from_config(rank_config))
+            ranks[rank.name] = rank
+        self.ranks = MappingProxyType(ranks)
+    
+    @classmethod
+    def load(cls, hierarchy_path: Optional[Path] = None,
+             departments_path: Optional[Path] = None) -> 'SharedConfig':
+        """
+        Parse the configuration files once (through the compiled config cache)
+        
+        Args:
+            hierarchy_path: Hierarchy file (defaults to settings)
+            departments_path: Departments file (defaults to settings)
+        """
+        settings = load_settings()
+        loader = ConfigLoader(Registry(), cache_dir=settings.CONFIG_CACHE_DIR or None)
+        hierarchy_path = Path(hierarchy_path or settings.HIERARCHY_CONFIG_PATH)
+        departments_path = Path(departments_path or settings.DEPARTMENTS_CONFIG_PATH)
+        return cls(
+            hierarchy=loader.load_from_file(hierarchy_path) if hierarchy_path.exists() else None,
+            departments=loader.load_from_file(departments_path) if departments_path.exists() else None,
+        )
+    
+    def memory_size(self) -> int:
+        """Bytes held by the shared configuration (paid once, not per tenant)"""
+        return deep_sizeof([self.hierarchy, self.departments, dict(self.ranks)])
+
+
+class TenantHost:
+    """
+    Hosts one isolated BEAST instance per campus
+    
+    Every tenant has its own BeastFactory, Registry, EventSystem and
+    departments; events and registrations never cross tenants. Parsed
+    configuration and ranks come from a single SharedConfig, so memory
+    grows with tenant data rather than with the number of tenants.
+    """
+    
+    def __init__(self, shared_config: Optional[SharedConfig] = None, lazy: bool = False):
+        """
+        Initialize host
+        
+        Args:
+            shared_config: Configuration shared by all tenants (loaded from
+                the configuration files if not given)
+            lazy: Default for loading tenant departments on first access
+        """
+        self.shared_config = shared_config or SharedConfig.load()
+        self.lazy = lazy
+        self._tenants: Dict[str, BeastFactory] = {}
+        self._lock = threading.Lock()
+    
+    def add_tenant(self, name: str, lazy: Optional[bool] = None) -> BeastFactory:
+        """
+        Create and initialize a tenant
+        
+        Args:
+            name: Tenant (campus) name
+            lazy: Load departments on first access (defaults to the host setting)
+        
+        Returns:
+            The tenant's initialized factory
+        """
+        with self._lock:
+            if name in self._tenants:
+                raise ValueError(f"Tenant '{name}' already exists")
+            # Reserve the name while the tenant initializes outside the lock
+            self._tenants[name] = None
+        try:
+            factory = BeastFactory(lazy=self.lazy if lazy is None else lazy,
+                                   shared_config=self.shared_config)
+            factory.initialize()
+        except Exception:
+            with self._lock:
+                del self._tenants[name]
+            raise
+        with self._lock:
+            self._tenants[name] = factory
+        return factory
+    
+    def get_tenant(self, name: str) -> Optional[BeastFactory]:
+        """Get a tenant's factory"""
+        return self._tenants.get(name)
+    
+    def list_tenants(self) -> List[str]:
+        """List initialized tenants"""
+        return [name for name, factory in self._tenants.items() if factory is not None]
+    
+    def remove_tenant(self, name: str):
+        """Stop a tenant's background work and drop it"""
+        with self._lock:
+            factory = self._tenants.pop(name, None)
+        if factory is None:
+            return
+        if factory.config_watcher is not None:
+            factory.config_watcher.stop()
+        if factory.trigger_manager is not None:
+            factory.trigger_manager.shutdown(flush=False)
+    
+    def get_usage(self, name: str) -> Dict[str, Any]:
+        """
+        Resource accounting for one tenant
+        
+        Counts plus the bytes of tenant-owned state. Shared configuration
+        and ranks are excluded; ranks the tenant overrode are included.
+        Memory figures walk the tenant's object graph - use for reports.
+        
+        Returns:
+            Usage dictionary
+        """
+        factory = self._tenants.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown tenant: '{name}'")
+        
+        snapshot = factory.registry.snapshot()
+        automations = [automation
+                       for autos in snapshot.automations.values()
+                       for automation in autos.values() if automation is not None]
+        runs = 0
+        wall_time = 0.0
+        cpu_time = 0.0
+        for automation in automations:
+            totals = automation.history.snapshot()
+            runs += sum(totals["outcome_totals"].values())
+            wall_time += totals["wall_time_total"]
+            cpu_time += totals["cpu_time_total"]
+        
+        # Shared objects and the tenant's plumbing are not tenant data
+        shared = [self.shared_config.hierarchy, self.shared_config.departments,
+                  *self.shared_config.ranks.values()]
+        plumbing = [factory, factory.registry, factory.event_system, factory.config_loader,
+                    factory.plugin_loader, factory.hierarchy_manager, factory.settings,
+                    factory.result_cache, factory.trigger_manager, factory.config_watcher]
+        departments = list(snapshot.departments.values())
+        memory = {
+            "departments": deep_sizeof(departments, exclude=shared + plumbing),
+            "hierarchy_overrides": deep_sizeof(factory.hierarchy_manager,
+                                               exclude=shared + [factory.registry]),
+            "events": deep_sizeof(factory.event_system, exclude=shared + departments),
+        }
+        memory["total"] = sum(memory.values())
+        
+        return {
+            "tenant": name,
+            "departments": len(snapshot.departments) + len(snapshot.lazy_departments),
+            "loaded_departments": len(snapshot.departments),
+            "automations": len(automations),
+            "registry_version": snapshot.version,
+            "events": len(factory.event_system.get_event_history(limit=sys.maxsize)),
+            "overridden_ranks": [rank.name for rank in factory.hierarchy_manager.list_ranks()
+                                 if not factory.hierarchy_manager.is_shared(rank.name)],
+            "automation_runs": runs,
+            "automation_wall_time": wall_time,
+            "automation_cpu_time": cpu_time,
+            "memory": memory,
+        }
+    
+    def get_usage_report(self) -> Dict[str, Any]:
+        """Usage of every tenant plus the one-off cost of the shared configuration"""
+        return {
+            "shared_config_bytes": self.shared_config.memory_size(),
+            "tenants": {name: self.get_usage(name) for name in self.list_tenants()},
+        }
@@ -9,6 +9,11 @@ from typing import Dict, Any, List, Optional
 from beast.core.registry import Registry
 from beast.core.event_system import EventSystem
 
+# Attributes managed by the framework - never carried over by migrate_state()
+_FRAMEWORK_ATTRIBUTES = ('registry', 'event_system', '_automations', '_subscriptions', '_initialized')
+# Never written to state snapshots (the version keeps counting up across restores)
+_SNAPSHOT_EXCLUDED = _FRAMEWORK_ATTRIBUTES + ('version',)
+
 
 class BaseDepartment(ABC):
     """
@@ -28,7 +33,10 @@ class BaseDepartment(ABC):
         self.registry = registry
         self.event_system = event_system
         self._automations: Dict[str, Any] = {}
+        self._subscriptions: List[tuple] = []
         self._initialized = False
+        # Bumped on every state change (each emitted event) - used for ETags
+        self.version = 0
     
     @property
     @abstractmethod
@@ -53,28 +61,40 @@ class BaseDepartment(ABC):
         # Register automations
         self._register_automations()
         
-        # Subscribe to events if needed
-        if self.event_system:
-            self._subscribe_to_events()
+        # Subscribe to events (recorded only while there is no event system)
+        self._subscribe_to_events()
         
         self._initialized = True
     
     def _register_automations(self):
         """Register department automations - override in subclasses"""
         automations = self.get_available_automations()
-        if self.registry:
-            for auto_name, auto_instance in automations.items():
+        for auto_name, auto_instance in automations.items():
+            if self.registry:
                 self.registry.register_automation(
                     self.name_en, 
                     auto_name, 
                     auto_instance
                 )
-                self._automations[auto_name] = auto_instance
+            self._automations[auto_name] = auto_instance
     
     def _subscribe_to_events(self):
         """Subscribe to relevant events - override in subclasses"""
         pass
     
+    def subscribe_event(self, event_type: str, callback):
+        """Subscribe to an event and remember it for unsubscribe_events() and hot swaps"""
+        if self.event_system:
+            self.event_system.subscribe(event_type, callback)
+        self._subscriptions.append((event_type, callback))
+    
+    def unsubscribe_events(self):
+        """Drop every subscription made through subscribe_event()"""
+        if self.event_system:
+            for event_type, callback in self._subscriptions:
+                self.event_system.unsubscribe(event_type, callback)
+        self._subscriptions.clear()
+    
     @abstractmethod
     def get_available_automations(self) -> Dict[str, Any]:
         """
@@ -90,30 +110,94 @@ class BaseDepartment(ABC):
         return self._automations.get(automation_name)
     
     def reload(self):
-        """Reload department (for hot-reloading)"""
-        # Unregister old automations
+        """
+        Reload department in place (for hot-reloading)
+        Rebuilds automations and subscriptions from the current class; use
+        PluginLoader.hot_swap_department to pick up changed module code.
+        """
+        # Unregister old automations and subscriptions
         if self.registry:
             for auto_name in self._automations.keys():
-                # Note: Registry doesn't have unregister_automation yet
-                # We can add it if needed
-                pass
+                self.registry.unregister_automation(self.name_en, auto_name)
+        self.unsubscribe_events()
         
         # Re-initialize
         self._initialized = False
         self._automations.clear()
         self.initialize()
     
+    def migrate_state(self, old: 'BaseDepartment'):
+        """
+        Take over in-memory state from the instance being replaced
+        
+        Called on the new instance during a hot swap, before initialize().
+        Every attribute the new instance also defines is carried over by
+        reference (so writes from calls still running on the old instance
+        are not lost); attributes the new class dropped are discarded and
+        new ones keep their defaults. Override to convert changed structures.
+        
+        Args:
+            old: Department instance being replaced
+        """
+        for key, value in old.__dict__.items():
+            if key in self.__dict__ and key not in _FRAMEWORK_ATTRIBUTES:
+                setattr(self, key, value)
+    
+    def get_snapshot_state(self) -> Dict[str, Any]:
+        """
+        Department-owned state saved by BeastFactory.snapshot()
+        Override to leave out caches or convert structures.
+        """
+        return {key: value for key, value in self.__dict__.items()
+                if key not in _SNAPSHOT_EXCLUDED}
+    
+    def restore_snapshot_state(self, state: Dict[str, Any]):
+        """
+        Install state from a snapshot (BeastFactory.restore)
+        
+        Attributes this class no longer defines are dropped, as in
+        migrate_state(). No events are emitted; the version is bumped once.
+        
+        Args:
+            state: Output of get_snapshot_state() from the snapshot
+        """
+        for key, value in state.items():
+            if key in self.__dict__ and key not in _SNAPSHOT_EXCLUDED:
+                setattr(self, key, value)
+        self.mark_changed()
+    
+    def get_snapshot_refs(self) -> Dict[str, Any]:
+        """
+        Objects this department owns that other departments reference, by key
+        Snapshots store those references as keys instead of copies.
+        """
+        return {}
+    
     def emit_event(self, event_type: str, data: Dict[str, Any], 
                    metadata: Optional[Dict[str, Any]] = None):
-        """Emit an event"""
+        """Emit an event (and count it as a state change)"""
+        self.version += 1
         if self.event_system:
             self.event_system.emit(event_type, self.name_en, data, metadata)
     
+    def mark_changed(self):
+        """Count a state change made without emitting an event"""
+        self.version += 1
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle department-owned state only (no registry or event system)"""
+        state = self.__dict__.copy()
+        state['registry'] = None
+        state['event_system'] = None
+        state['_subscriptions'] = []
+        return state
+    
     def get_info(self) -> Dict[str, Any]:
         """Get department information"""
         return {
             "name": self.name,
             "name_en": self.name_en,
             "automations": list(self._automations.keys()),
-            "initialized": self._initialized
+            "initialized": self._initialized,
+            "version": self.version
         }
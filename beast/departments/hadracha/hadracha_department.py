@@ -4,6 +4,7 @@ Manages classes, MAKS, and students
 """
 
 from typing import Dict, Any, List, Optional
+from beast.core.authorization import requires_access
 from beast.departments.base_department import BaseDepartment
 from beast.core.models.user import User
 from beast.core.models.hierarchy import HierarchyManager
@@ -57,6 +58,7 @@ class HadrachaDepartment(BaseDepartment):
         # Load existing classes if needed
         # In production, this would load from database
     
+    @requires_access("can_manage_classes")
     def create_class(self, class_name: str, maks: User) -> ClassRoom:
         """
         Create a new class with a MAKS
@@ -86,10 +88,12 @@ class HadrachaDepartment(BaseDepartment):
         
         return classroom
     
+    @requires_access()
     def get_class(self, class_name: str) -> Optional[ClassRoom]:
         """Get a class by name"""
         return self.classes.get(class_name)
     
+    @requires_access("can_manage_classes")
     def add_student_to_class(self, class_name: str, student: User):
         """Add a student to a class"""
         classroom = self.get_class(class_name)
@@ -119,9 +123,8 @@ class HadrachaDepartment(BaseDepartment):
     
     def _subscribe_to_events(self):
         """Subscribe to relevant events"""
-        if self.event_system:
-            # Subscribe to user creation to automatically assign to classes
-            self.event_system.subscribe("user_created", self._on_user_created)
+        # Subscribe to user creation to automatically assign to classes
+        self.subscribe_event("user_created", self._on_user_created)
     
     def _on_user_created(self, event):
         """Handle user created event"""
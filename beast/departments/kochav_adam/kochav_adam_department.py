@@ -4,7 +4,9 @@ Manages personnel, assignments, and roles
 """
 
 from typing import Dict, Any, List
+from beast.core.authorization import requires_access
 from beast.departments.base_department import BaseDepartment
+from beast.departments.kochav_adam.name_index import NameIndex
 from beast.core.models.user import User
 
 
@@ -22,17 +24,21 @@ class KochavAdamDepartment(BaseDepartment):
     def __init__(self, registry=None, event_system=None):
         super().__init__(registry, event_system)
         self.users: Dict[str, User] = {}
+        # Name and ID search over self.users - derived, never snapshotted
+        self.search_index = NameIndex()
     
     def initialize(self):
         """Initialize the department"""
         super().initialize()
     
+    @requires_access()
     def register_user(self, user: User):
         """Register a new user"""
         if user.id_number in self.users:
             raise ValueError(f"משתמש עם תעודת זהות {user.id_number} כבר קיים")
         
         self.users[user.id_number] = user
+        self.search_index.add(user.id_number, user.full_name)
         
         # Emit event
         self.emit_event("user_created", {
@@ -43,10 +49,92 @@ class KochavAdamDepartment(BaseDepartment):
             "class_name": user.class_name
         })
     
+    @requires_access()
     def get_user(self, id_number: str) -> User:
         """Get user by ID number"""
         return self.users.get(id_number)
     
+    @requires_access()
+    def update_user(self, id_number: str, **changes) -> User:
+        """
+        Update a user's fields and keep the search index current
+        
+        Args:
+            id_number: ID number of the user
+            **changes: Fields to set (e.g. full_name="...")
+        
+        Returns:
+            The updated user
+        """
+        user = self.users.get(id_number)
+        if user is None:
+            raise ValueError(f"משתמש עם תעודת זהות {id_number} לא נמצא")
+        if changes.get("id_number", id_number) != id_number:
+            raise ValueError("לא ניתן לשנות תעודת זהות")
+        
+        user.update(**changes)
+        self.reindex_user(user)
+        
+        self.emit_event("user_updated", {
+            "id_number": user.id_number,
+            "full_name": user.full_name,
+            "fields": sorted(changes)
+        })
+        return user
+    
+    def reindex_user(self, user: User):
+        """Refresh a user's search entry after changing full_name directly"""
+        if self.users.get(user.id_number) is user:
+            self.search_index.add(user.id_number, user.full_name)
+            self.mark_changed()
+    
+    @requires_access()
+    def search_users(self, query: str, limit: int = 20, fuzzy: bool = True) -> List[User]:
+        """
+        Find users by name or ID number
+        
+        Niqqud, final letters and geresh variants are ignored, and query
+        words match the start of name words in any order ("יוס כה" finds
+        "יוסי כהן"). With `fuzzy`, remaining places are filled with names
+        within a typo or two of the query.
+        
+        Args:
+            query: Name words or the start of an ID number
+            limit: Maximum number of users
+            fuzzy: Also return near matches
+        
+        Returns:
+            Matching users, prefix matches first
+        """
+        keys = self.search_index.prefix_search(query, limit)
+        if fuzzy and len(keys) < limit:
+            found = set(keys)
+            keys += [key for key in self.search_index.fuzzy_search(query, limit)
+                     if key not in found][:limit - len(keys)]
+        return [self.users[key] for key in keys if key in self.users]
+    
+    def rebuild_search_index(self):
+        """Index every user from scratch (after replacing self.users)"""
+        self.search_index.rebuild((key, user.full_name) for key, user in self.users.items())
+    
+    def migrate_state(self, old: BaseDepartment):
+        super().migrate_state(old)
+        self.search_index = NameIndex()
+        self.rebuild_search_index()
+    
+    def get_snapshot_state(self) -> Dict[str, Any]:
+        state = super().get_snapshot_state()
+        state.pop("search_index", None)
+        return state
+    
+    def restore_snapshot_state(self, state: Dict[str, Any]):
+        super().restore_snapshot_state(state)
+        self.rebuild_search_index()
+    
+    def get_snapshot_refs(self) -> Dict[str, Any]:
+        """Users are owned here; other departments' snapshots refer to them by ID"""
+        return self.users
+    
     def get_available_automations(self) -> Dict[str, Any]:
         """Get available automations"""
         return {
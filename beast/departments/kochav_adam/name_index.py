@@ -0,0 +1,427 @@
+"""
+Personnel Name Index
+Hebrew-aware prefix and typo-tolerant search over names and ID numbers
+"""
+
+import heapq
+import sys
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import product
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_FINAL_LETTERS = {"ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ"}
+# Geresh and gershayim, and the quote marks typed in their place
+_QUOTES = "'\"`´‘’“”„׳״"
+# Word separators besides whitespace (maqaf, paseq, sof pasuq, ...)
+_SEPARATORS = "-־‐–—_.,;:/\\()[]׀׃"
+
+
+_translation: Optional[Dict[int, Optional[str]]] = None
+
+
+def _translation_table() -> Dict[int, Optional[str]]:
+    """Built on first use - scanning Unicode for marks takes a few milliseconds"""
+    global _translation
+    if _translation is not None:
+        return _translation
+    table: Dict[int, Optional[str]] = {}
+    # Niqqud, cantillation and other combining marks (left by NFKD, too)
+    for code in range(0x10000):
+        if unicodedata.category(chr(code)) == "Mn":
+            table[code] = None
+    for final, regular in _FINAL_LETTERS.items():
+        table[ord(final)] = regular
+    for quote in _QUOTES:
+        table[ord(quote)] = None
+    for separator in _SEPARATORS:
+        table[ord(separator)] = " "
+    _translation = table
+    return table
+
+
+def normalize_name(text: str) -> str:
+    """
+    Search form of a name
+    
+    Strips niqqud and cantillation, folds final letters (ך→כ, ם→מ, ן→נ,
+    ף→פ, ץ→צ), drops geresh/gershayim and quote variants (מק"ס, מק״ס and
+    מקס are equal), turns punctuation into spaces and case-folds Latin.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text).translate(_translation_table()).casefold()
+    return " ".join(text.split())
+
+
+# Query words expanding to more vocabulary tokens than this are matched by
+# comparing prefixes instead of looking keys up in each token's postings
+_MAX_EXPANSION = 8
+
+
+def _bigrams(token: str) -> Set[str]:
+    padded = f"^{token}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _tokenize(name: str) -> Tuple[str, ...]:
+    # Interned, so every key's token tuple shares the vocabulary's strings
+    return tuple(dict.fromkeys(sys.intern(token) for token in normalize_name(name).split()))
+
+
+def _default_max_edits(token: str) -> int:
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insert, delete, substitute, swap
+    adjacent letters), or limit + 1 once it is known to exceed `limit`
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # A shared prefix and suffix don't change the distance; typos usually
+    # leave only a letter or two to compare
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class _SortedStrings:
+    """
+    Sorted set of strings for prefix lookups with cheap inserts
+    
+    New strings are inserted into a small sorted buffer, which is merged
+    into the main sorted list when full, so an insert never moves the
+    whole list. Removed strings are skipped on lookup and dropped at the
+    next merge.
+    
+    Membership is tracked by the owner (NameIndex knows its keys and
+    tokens), so add() must only be given absent strings and discard()
+    present ones.
+    """
+    
+    def __init__(self, buffer_size: int = 1024):
+        self.buffer_size = buffer_size
+        self._sorted: List[str] = []
+        self._pending: List[str] = []
+        # Removed, but still stored in _sorted or _pending
+        self._stale: Set[str] = set()
+    
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending) - len(self._stale)
+    
+    def add(self, value: str):
+        if value in self._stale:
+            self._stale.discard(value)
+            return
+        insort(self._pending, value)
+        if len(self._pending) >= self.buffer_size:
+            self._merge()
+    
+    def discard(self, value: str):
+        self._stale.add(value)
+    
+    def reset(self, values: Iterable[str]):
+        self._sorted = sorted(values)
+        self._pending = []
+        self._stale = set()
+    
+    def _merge(self):
+        self._sorted.extend(self._pending)
+        self._pending = []
+        if self._stale:
+            stale = self._stale
+            self._sorted = [value for value in self._sorted if value not in stale]
+            self._stale = set()
+        # Timsort merges the two sorted runs in linear time
+        self._sorted.sort()
+    
+    def prefix(self, prefix: str) -> Iterator[str]:
+        """Members starting with `prefix`, in sorted order"""
+        stale = self._stale
+        
+        def matching(values: List[str]) -> Iterator[str]:
+            for index in range(bisect_left(values, prefix), len(values)):
+                value = values[index]
+                if not value.startswith(prefix):
+                    return
+                if value not in stale:
+                    yield value
+        
+        if not self._pending:
+            return matching(self._sorted)
+        return heapq.merge(matching(self._sorted), matching(self._pending))
+
+
+class NameIndex:
+    """
+    Incrementally maintained search index over (key, name) pairs
+    
+    Names are normalized with normalize_name() and split into tokens.
+    Prefix search bisects a sorted token vocabulary; typo-tolerant search
+    narrows the vocabulary to tokens of about the query's length sharing
+    enough letter bigrams with it, then checks their edit distance. Keys
+    (ID numbers) are searchable by prefix too. Results are keys.
+    """
+    
+    def __init__(self):
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # The vocabulary grows slowly, so keep its lookup buffer short
+        self._vocabulary = _SortedStrings(buffer_size=64)
+        self._keys = _SortedStrings()
+        # Token length -> bigram -> tokens of that length containing it
+        self._bigrams: Dict[int, Dict[str, Set[str]]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._tokens)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._tokens
+    
+    def add(self, key: str, name: str):
+        """Index a name under a key, replacing the key's previous name"""
+        tokens = _tokenize(name)
+        previous = self._tokens.get(key)
+        if previous == tokens:
+            return
+        if previous is None:
+            self._keys.add(key)
+        else:
+            self._unlink(key, previous)
+        self._tokens[key] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary.add(token)
+                self._link_bigrams(token)
+            postings.add(key)
+    
+    def remove(self, key: str):
+        tokens = self._tokens.pop(key, None)
+        if tokens is not None:
+            self._unlink(key, tokens)
+            self._keys.discard(key)
+    
+    def _unlink(self, key: str, tokens: Tuple[str, ...]):
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary.discard(token)
+                by_gram = self._bigrams[len(token)]
+                for gram in _bigrams(token):
+                    grams = by_gram.get(gram)
+                    if grams is not None:
+                        grams.discard(token)
+                        if not grams:
+                            del by_gram[gram]
+                if not by_gram:
+                    del self._bigrams[len(token)]
+    
+    def _link_bigrams(self, token: str):
+        by_gram = self._bigrams.setdefault(len(token), {})
+        for gram in _bigrams(token):
+            by_gram.setdefault(gram, set()).add(token)
+    
+    def rebuild(self, names: Iterable[Tuple[str, str]]):
+        """Replace the whole index with (key, name) pairs (one sort, no buffering)"""
+        self._tokens = {}
+        self._postings = {}
+        self._bigrams = {}
+        for key, name in names:
+            tokens = _tokenize(name)
+            self._tokens[key] = tokens
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                postings.add(key)
+        for token in self._postings:
+            self._link_bigrams(token)
+        self._vocabulary.reset(self._postings)
+        self._keys.reset(self._tokens)
+    
+    def prefix_search(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Keys whose name has a token starting with each query token
+        (in any order), or whose key starts with a numeric query
+        
+        Args:
+            query: Name prefix, e.g. "יוס כה", or the start of an ID number
+            limit: Maximum number of results
+        """
+        words = normalize_name(query).split()
+        if not words or limit <= 0:
+            return []
+        if all(word.isdigit() for word in words):
+            return self._key_prefix("".join(words), limit)
+        
+        # Drive the search from the query token matching the fewest keys
+        matches = [list(self._vocabulary.prefix(word)) for word in words]
+        sizes = [sum(len(self._postings[token]) for token in tokens) for tokens in matches]
+        driver = sizes.index(min(sizes))
+        if not sizes[driver]:
+            return []
+        # Words matching few tokens are intersected with their postings;
+        # words matching many are checked per key by prefix comparison
+        expansions: List[List[Set[str]]] = []
+        prefixes: List[str] = []
+        for index, tokens in enumerate(matches):
+            if index == driver:
+                continue
+            if len(tokens) <= _MAX_EXPANSION:
+                expansions.append([self._postings[token] for token in tokens])
+            else:
+                prefixes.append(words[index])
+        
+        results: List[str] = []
+        seen: Set[str] = set()
+        for token in matches[driver]:
+            candidates = self._postings[token]
+            for postings in expansions:
+                if len(postings) == 1:
+                    candidates = candidates & postings[0]
+                else:
+                    candidates = set().union(*(candidates & other for other in postings))
+                if not candidates:
+                    break
+            for key in candidates:
+                if key in seen:
+                    continue
+                seen.add(key)
+                if prefixes and not all(
+                        any(name_token.startswith(word) for name_token in self._tokens[key])
+                        for word in prefixes):
+                    continue
+                results.append(key)
+                if len(results) >= limit:
+                    return results
+        return results
+    
+    def _key_prefix(self, prefix: str, limit: int) -> List[str]:
+        results = []
+        for key in self._keys.prefix(prefix):
+            results.append(key)
+            if len(results) >= limit:
+                break
+        return results
+    
+    def similar_tokens(self, word: str, max_edits: Optional[int] = None) -> Dict[str, int]:
+        """
+        Vocabulary tokens within `max_edits` of a normalized word
+        
+        Args:
+            word: Normalized query token
+            max_edits: Allowed edits (default: 0 up to 2 letters, 1 up to
+                5, then 2)
+        
+        Returns:
+            Token -> edit distance
+        """
+        if max_edits is None:
+            max_edits = _default_max_edits(word)
+        if max_edits == 0:
+            return {word: 0} if word in self._postings else {}
+        grams = _bigrams(word)
+        # One edit changes at most 3 bigrams (a swap of adjacent letters)
+        needed = max(1, len(grams) - 3 * max_edits)
+        similar = {}
+        # Only tokens within max_edits of the word's length can be close enough
+        for length in range(max(1, len(word) - max_edits), len(word) + max_edits + 1):
+            by_gram = self._bigrams.get(length)
+            if not by_gram:
+                continue
+            shared: Dict[str, int] = {}
+            for gram in grams:
+                for token in by_gram.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            for token, count in shared.items():
+                if count < needed:
+                    continue
+                distance = edit_distance(word, token, max_edits)
+                if distance <= max_edits:
+                    similar[token] = distance
+        return similar
+    
+    def fuzzy_search(self, query: str, limit: int = 20,
+                     max_edits: Optional[int] = None) -> List[str]:
+        """
+        Keys whose name has a token close to each query token
+        
+        Results are ordered by total edit distance.
+        
+        Args:
+            query: Name with possible typos, e.g. "יוסי כאן"
+            limit: Maximum number of results
+            max_edits: Allowed edits per token (default depends on length)
+        """
+        words = normalize_name(query).split()
+        if not words or limit <= 0:
+            return []
+        per_word = [self.similar_tokens(word, max_edits) for word in words]
+        if not all(per_word):
+            return []
+        
+        # Each word's postings, grouped by edit distance
+        levels: List[Dict[int, List[Set[str]]]] = []
+        for similar in per_word:
+            by_distance: Dict[int, List[Set[str]]] = {}
+            for token, distance in similar.items():
+                by_distance.setdefault(distance, []).append(self._postings[token])
+            levels.append(by_distance)
+        
+        # Try per-word distance combinations by increasing total, so keys
+        # are found at their smallest total and the search stops as soon
+        # as `limit` keys are found
+        found: Dict[str, int] = {}
+        for distances in sorted(product(*(sorted(by_distance) for by_distance in levels)), key=sum):
+            total = sum(distances)
+            choices = [levels[index][distance] for index, distance in enumerate(distances)]
+            for combination in product(*choices):
+                # Intersect smallest first (set & set iterates the smaller
+                # set); words matching the same token share one postings set
+                combination = sorted({id(postings): postings for postings in combination}.values(),
+                                     key=len)
+                candidates = combination[0]
+                for postings in combination[1:]:
+                    candidates = candidates & postings
+                    if not candidates:
+                        break
+                for key in candidates:
+                    if key not in found:
+                        found[key] = total
+                        if len(found) >= limit:
+                            return heapq.nsmallest(limit, found, key=lambda key: (found[key], key))
+        return heapq.nsmallest(limit, found, key=lambda key: (found[key], key))
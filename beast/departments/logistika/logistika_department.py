@@ -4,6 +4,7 @@ Manages inventory, equipment, and supplies
 """
 
 from typing import Dict, Any, Optional
+from beast.core.authorization import requires_access
 from beast.departments.base_department import BaseDepartment
 
 
@@ -26,6 +27,7 @@ class LogistikaDepartment(BaseDepartment):
         """Initialize the department"""
         super().initialize()
     
+    @requires_access()
     def add_item(self, item_name: str, quantity: int, details: Optional[Dict] = None):
         """Add item to inventory"""
         if item_name in self.inventory:
@@ -1,6 +1,10 @@
 """
 Global Settings
 Configuration for the entire system
+
+Values that depend on the environment are resolved on first access (PEP 562),
+so environment variables set after import but before first use still apply.
+Importing this module never touches the filesystem.
 """
 
 import os
@@ -13,9 +17,6 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SCHOOL_NAME = "טכני באר שבע"
 PROJECT_NAME = "BEAST"
 
-# Database configuration
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///beast.db")
-
 # Configuration paths
 CONFIG_DIR = BASE_DIR / "config"
 HIERARCHY_CONFIG_PATH = CONFIG_DIR / "hierarchy.yaml"
@@ -24,8 +25,39 @@ HIERARCHY_CONFIG_PATH = CONFIG_DIR / "hierarchy.yaml"
 DEPARTMENTS_CONFIG_PATH = CONFIG_DIR / "departments.yaml"
 
 # Logging
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_DIR = BASE_DIR / "logs"
 
-# Create necessary directories
-LOG_DIR.mkdir(exist_ok=True)
+# Environment-dependent settings, resolved on first access
+_RESOLVERS = {
+    # Database configuration
+    "DATABASE_URL": lambda: os.getenv("DATABASE_URL", "sqlite:///beast.db"),
+    # Compiled configuration cache (set BEAST_CONFIG_CACHE_DIR="" to disable)
+    "CONFIG_CACHE_DIR": lambda: os.getenv("BEAST_CONFIG_CACHE_DIR",
+                                          str(BASE_DIR / ".cache" / "config")),
+    "LOG_LEVEL": lambda: os.getenv("LOG_LEVEL", "INFO"),
+    # Profiling hooks on department methods: "counters", "timing", "cprofile:<N>"
+    # or "off" (overrides the `profiling` entry of departments.yaml)
+    "PROFILE_HOOKS": lambda: os.getenv("BEAST_PROFILE_HOOKS", ""),
+    "PROFILE_DIR": lambda: os.getenv("BEAST_PROFILE_DIR", str(LOG_DIR / "profiles")),
+    # Memory budget for the periodic memory_report sampler (unset: no sampler)
+    "MEMORY_BUDGET_MB": lambda: os.getenv("BEAST_MEMORY_BUDGET_MB", ""),
+    "MEMORY_SAMPLE_INTERVAL": lambda: float(os.getenv("BEAST_MEMORY_SAMPLE_INTERVAL", "60")),
+}
+
+
+def __getattr__(name):
+    if name in _RESOLVERS:
+        value = _RESOLVERS[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_RESOLVERS))
+
+
+def ensure_log_dir() -> Path:
+    """Create the log directory on first use and return it"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LOG_DIR
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for BEAST
+Measures, in fresh interpreter processes, the time to import the factory,
+initialize the system and fetch a single department - or, with --imports,
+what importing individual modules costs
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Runs in a fresh interpreter so every measurement is a true cold start
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from beast.core.factory import create_beast
+imported = time.perf_counter()
+beast = create_beast(lazy={lazy})
+initialized = time.perf_counter()
+department = beast.registry.get_department({department!r})
+ready = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "initialize": initialized - imported,
+    "first_access": ready - initialized,
+    "total": ready - start,
+    "loaded": beast.registry.list_loaded_departments(),
+    "modules": len(sys.modules),
+}}))
+"""
+
+# Measures one import and reports which modules it pulled in
+IMPORT_PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted(set(sys.modules) - before)
+print(json.dumps({{
+    "import": elapsed,
+    "modules": len(loaded),
+    "project_modules": [name for name in loaded if name.split(".")[0] in ("beast", "config")],
+}}))
+"""
+
+# Modules whose import cost matters: worker processes often need only models
+IMPORT_TARGETS = ("beast", "beast.core.models.user", "beast.core.registry", "beast.core.factory")
+
+
+def run_probe(code: str) -> dict:
+    """Run a probe in a fresh interpreter and parse its JSON output"""
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_import(module: str, runs: int) -> dict:
+    """Median import time of a module in fresh processes"""
+    samples = [run_probe(IMPORT_PROBE.format(module=module)) for _ in range(runs)]
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": round(statistics.median(sample["import"] * 1000 for sample in samples), 2),
+        "modules": samples[-1]["modules"],
+        "project_modules": samples[-1]["project_modules"],
+    }
+
+
+def measure(lazy: bool, department: str, runs: int) -> dict:
+    """Run the probe `runs` times and aggregate the timings"""
+    samples = [run_probe(PROBE.format(lazy=lazy, department=department))
+               for _ in range(runs)]
+    
+    summary = {"mode": "lazy" if lazy else "eager", "runs": runs}
+    for key in ("import", "initialize", "first_access", "total"):
+        values = [sample[key] * 1000 for sample in samples]
+        summary[f"{key}_ms"] = round(statistics.median(values), 2)
+    summary["loaded_departments"] = samples[-1]["loaded"]
+    summary["modules"] = samples[-1]["modules"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure BEAST cold-start time")
+    parser.add_argument("--runs", type=int, default=10, help="Processes per mode")
+    parser.add_argument("--department", default="hadracha", help="Department to fetch")
+    parser.add_argument("--imports", action="store_true",
+                        help="Measure module import cost instead of system startup")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = parser.parse_args()
+    
+    if args.imports:
+        results = [measure_import(module, args.runs) for module in IMPORT_TARGETS]
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+        print(f"Import cost, median of {args.runs} runs:")
+        for result in results:
+            print(f"  {result['module']:<26} {result['import_ms']:>8.2f} ms  "
+                  f"modules={result['modules']:<4} "
+                  f"project={','.join(result['project_modules'])}")
+        return
+    
+    results = [measure(lazy, args.department, args.runs) for lazy in (False, True)]
+    
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    print(f"Cold start, median of {args.runs} runs (fetching '{args.department}'):")
+    for result in results:
+        print(f"  {result['mode']:<6} total {result['total_ms']:>8.2f} ms  "
+              f"(import {result['import_ms']:.2f}, initialize {result['initialize_ms']:.2f}, "
+              f"first access {result['first_access_ms']:.2f})  "
+              f"modules={result['modules']}  loaded={','.join(result['loaded_departments'])}")
+
+
+if __name__ == "__main__":
+    main()
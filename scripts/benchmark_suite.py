@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Hot-path benchmark suite for BEAST
+Times the framework's hot paths, stores results as JSON with environment
+metadata, and compares a run against a saved baseline to flag regressions
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beast.automation.base_automation import BaseAutomation
+from beast.core.event_system import EventSystem
+from beast.core.factory import create_beast
+from beast.core.models.user import User
+from beast.departments.hadracha.hadracha_department import ClassRoom
+
+from benchmark_startup import PROBE, ROOT, run_probe
+from generate_school import FIRST_NAMES_FEMALE, FIRST_NAMES_MALE, LAST_NAMES
+
+RESULTS_FORMAT_VERSION = 1
+# Regressions smaller than this (percent of the baseline median) are noise
+DEFAULT_THRESHOLD = 10.0
+
+# A benchmark's setup returns (operation, operations per call); the
+# operation is timed as a whole and reported per operation
+Setup = Callable[[int], Tuple[Callable[[], Any], int]]
+BENCHMARKS: List[Tuple[str, str, Setup]] = []
+
+
+def benchmark(name: str, description: str):
+    """Register a benchmark setup function"""
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append((name, description, setup))
+        return setup
+    return register
+
+
+def _emit_setup(subscribers: int) -> Setup:
+    def setup(scale: int):
+        events = EventSystem()
+        for _ in range(subscribers):
+            events.subscribe("user_created", lambda event: None)
+        data = {"id_number": "123456789", "rank_name": "shocher"}
+        # Full history, so every emit also evicts the oldest event
+        for _ in range(events._max_history):
+            events.emit("user_created", "benchmark", data)
+        
+        def run():
+            for _ in range(1000):
+                events.emit("user_created", "kochav_adam", data)
+        return run, 1000
+    return setup
+
+
+for _count in (0, 10, 100):
+    benchmark(f"event_emit_{_count}_subscribers",
+              f"EventSystem.emit with {_count} subscribers and a full history")(_emit_setup(_count))
+
+
+@benchmark("register_user", "KochavAdamDepartment.register_user into a growing department")
+def _register_user(scale: int):
+    beast = create_beast()
+    manager = beast.hierarchy_manager
+    users = [User(f"{i:09d}", f"תלמיד {i}", "shocher", hierarchy_manager=manager)
+             for i in range(scale)]
+    
+    def run():
+        # Empty department per call, so every call registers into 0..scale
+        # users and indexes every name again
+        department = beast.registry.get_department("kochav_adam")
+        department.users = {}
+        department.rebuild_search_index()
+        for user in users:
+            department.register_user(user)
+    return run, scale
+
+
+def _typo(rng: random.Random, name: str) -> str:
+    """`name` with one letter replaced, dropped or swapped with the next"""
+    positions = [i for i, letter in enumerate(name) if letter != " "]
+    i = rng.choice(positions)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return name[:i] + rng.choice("אבגדהוזחטיכלמנסעפצקרשת") + name[i + 1:]
+    if edit == 1 or i + 1 >= len(name) or name[i + 1] == " ":
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def _search_setup(fuzzy: bool) -> Setup:
+    def setup(scale: int):
+        rng = random.Random(0)
+        beast = create_beast()
+        manager = beast.hierarchy_manager
+        department = beast.registry.get_department("kochav_adam")
+        first_names = FIRST_NAMES_MALE + FIRST_NAMES_FEMALE
+        for i in range(scale):
+            name = f"{rng.choice(first_names)} {rng.choice(LAST_NAMES)}"
+            department.users[f"{i:09d}"] = User(f"{i:09d}", name, "shocher",
+                                                 hierarchy_manager=manager)
+        department.rebuild_search_index()
+        index = department.search_index
+        names = [user.full_name for user in rng.sample(list(department.users.values()), 1000)]
+        if fuzzy:
+            queries = [_typo(rng, name) for name in names]
+            search = index.fuzzy_search
+        else:
+            queries = [" ".join(word[:rng.randint(1, 3)] for word in name.split())
+                       for name in names]
+            search = index.prefix_search
+        
+        def run():
+            for query in queries:
+                search(query)
+        return run, len(queries)
+    return setup
+
+
+benchmark("search_prefix", "NameIndex.prefix_search of name prefixes among --scale users")(
+    _search_setup(fuzzy=False))
+benchmark("search_fuzzy", "NameIndex.fuzzy_search of one-typo names among --scale users")(
+    _search_setup(fuzzy=True))
+
+
+@benchmark("can_manage", "HierarchyManager.can_manage between two configured ranks")
+def _can_manage(scale: int):
+    manager = create_beast().hierarchy_manager
+    ranks = [rank.name for rank in manager.list_ranks()] or ["shocher"]
+    manager_rank, managed_rank = ranks[-1], ranks[0]
+    
+    def run():
+        for _ in range(1000):
+            manager.can_manage(manager_rank, managed_rank)
+    return run, 1000
+
+
+@benchmark("to_dict", "BaseModel.to_dict of a user")
+def _to_dict(scale: int):
+    user = User("123456789", "יוסי כהן", "maks", class_name="יא-1")
+    
+    def run():
+        for _ in range(1000):
+            user.to_dict()
+    return run, 1000
+
+
+@benchmark("classroom_add_student", "ClassRoom.add_student into a class of 1000")
+def _add_student(scale: int):
+    manager = create_beast().hierarchy_manager
+    students = [User(f"{i:09d}", f"תלמיד {i}", "shocher", hierarchy_manager=manager)
+                for i in range(1000)]
+    
+    def run():
+        classroom = ClassRoom("יא-1")
+        for student in students:
+            classroom.add_student(student)
+    return run, 1000
+
+
+class _NoopAutomation(BaseAutomation):
+    @property
+    def name(self) -> str:
+        return "ריקה"
+    
+    @property
+    def name_en(self) -> str:
+        return "noop"
+    
+    def execute(self, **kwargs) -> Dict[str, Any]:
+        return {}
+
+
+@benchmark("automation_run_overhead", "BaseAutomation.run around an empty execute()")
+def _automation_run(scale: int):
+    automation = _NoopAutomation(None)
+    
+    def run():
+        for _ in range(1000):
+            automation.run()
+    return run, 1000
+
+
+@benchmark("cold_start", "create_beast() in a fresh interpreter (import + initialize)")
+def _cold_start(scale: int):
+    code = PROBE.format(lazy=False, department="hadracha")
+    
+    def run():
+        run_probe(code)
+    return run, 1
+
+
+def time_benchmark(setup: Setup, scale: int, repeats: int,
+                   min_time: float) -> Dict[str, Any]:
+    """
+    Time one benchmark like timeit: calls are batched until a repeat takes
+    at least `min_time` seconds, the collector is off while timing, and
+    the median repeat is reported
+    """
+    operation, per_call = setup(scale)
+    operation()  # Warm-up
+    
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        if time.perf_counter() - start >= min_time or calls >= 1 << 20:
+            break
+        calls *= 2
+    
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            for _ in range(calls):
+                operation()
+            samples.append((time.perf_counter_ns() - start) / (calls * per_call))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    
+    return {
+        "unit": "ns/op",
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeats": repeats,
+        "operations": calls * per_call,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Metadata needed to judge whether two result files are comparable"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def run_suite(scale: int, repeats: int, min_time: float,
+              only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the results document"""
+    results = {}
+    for name, description, setup in BENCHMARKS:
+        if only and not any(pattern in name for pattern in only):
+            continue
+        print(f"  {name:<28}", end="", flush=True, file=sys.stderr)
+        result = time_benchmark(setup, scale, repeats, min_time)
+        result["description"] = description
+        results[name] = result
+        print(f"{format_ns(result['median']):>12}", file=sys.stderr)
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "environment": environment(),
+        "settings": {"scale": scale, "repeats": repeats, "min_time": min_time},
+        "benchmarks": results,
+    }
+
+
+def format_ns(value: float) -> str:
+    for unit, factor in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= factor:
+            return f"{value / factor:.2f} {unit}"
+    return f"{value:.1f} ns"
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare median times per benchmark
+    
+    Returns:
+        One entry per benchmark present in both runs, with the change in
+        percent and a status of "regression", "improvement" or "ok"
+    """
+    rows = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        change = (result["median"] - base["median"]) / base["median"] * 100
+        status = "ok"
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        rows.append({"name": name, "baseline": base["median"], "current": result["median"],
+                     "change": change, "status": status})
+    return rows
+
+
+def environment_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    keys = ("python", "implementation", "machine", "processor", "cpu_count")
+    return [f"{key}: {baseline['environment'].get(key)} -> {current['environment'].get(key)}"
+            for key in keys
+            if baseline["environment"].get(key) != current["environment"].get(key)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BEAST hot paths")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this file")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE",
+                        help="Compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Percent slowdown reported as a regression")
+    parser.add_argument("--scale", type=int, default=100000,
+                        help="Users per register_user call and in the search index")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per repeat")
+    parser.add_argument("--only", nargs="*", help="Run benchmarks whose names contain these")
+    parser.add_argument("--quick", action="store_true",
+                        help="Smaller scale and fewer repeats (smoke test)")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args()
+    
+    if args.list:
+        for name, description, _ in BENCHMARKS:
+            print(f"  {name:<28} {description}")
+        return
+    if args.quick:
+        args.scale, args.repeats, args.min_time = 10000, 3, 0.05
+    
+    print(f"Running benchmarks (median of {args.repeats}):", file=sys.stderr)
+    results = run_suite(args.scale, args.repeats, args.min_time, args.only)
+    
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    elif not args.compare:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("format_version") != RESULTS_FORMAT_VERSION:
+            sys.exit(f"Unsupported baseline format: {args.compare}")
+        differences = environment_differences(baseline, results)
+        if differences:
+            print("Warning: Environment differs from the baseline - "
+                  + "; ".join(differences))
+        rows = compare(baseline, results, args.threshold)
+        print(f"Compared with {args.compare} (threshold {args.threshold:.0f}%):")
+        for row in rows:
+            marker = {"regression": "REGRESSION", "improvement": "faster"}.get(row["status"], "")
+            print(f"  {row['name']:<28} {format_ns(row['baseline']):>12} -> "
+                  f"{format_ns(row['current']):>12}  {row['change']:+7.1f}%  {marker}")
+        if any(row["status"] == "regression" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
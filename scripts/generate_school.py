@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Synthetic school dataset generator for BEAST
+Generates a deterministic school - staff hierarchy, classes, students,
+inventory, attendance and grades - into the departments or into JSONL/CSV
+files, and can drive a mixed load against the loaded system
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from beast.automation.telemetry import percentile
+from beast.core.factory import create_beast
+from beast.core.models.user import User
+
+FIRST_NAMES_MALE = (
+    "אברהם", "אורי", "איתי", "אלון", "אריאל", "בן", "גיא", "גלעד", "דוד", "דניאל",
+    "הראל", "יאיר", "יהונתן", "יוסף", "יונתן", "יותם", "ליאור", "מתן", "נדב", "נועם",
+    "עדי", "עומר", "עידו", "רועי", "שגיא", "שחר", "שי", "תומר", "אביב", "עמית",
+)
+FIRST_NAMES_FEMALE = (
+    "אביגיל", "אורית", "איילת", "אלה", "הדס", "הילה", "טליה", "יעל", "ליה", "מאיה",
+    "מיכל", "נוגה", "נועה", "עדן", "רוני", "רותם", "שירה", "שני", "תמר", "אגם",
+    "ענבל", "קרן", "רחל", "שקד", "הגר", "צליל", "דנה", "ליאת", "מורן", "סהר",
+)
+LAST_NAMES = (
+    "כהן", "לוי", "מזרחי", "פרץ", "ביטון", "דהן", "אברהם", "פרידמן", "אזולאי", "מלכה",
+    "כץ", "יוסף", "דוד", "עמר", "אוחיון", "חדד", "גבאי", "בן דוד", "שפירא", "אשכנזי",
+    "רוזנברג", "ברק", "שלום", "טל", "גולן", "נחום", "סויסה", "זילברמן", "אלמוג", "קליין",
+)
+CITIES = ("באר שבע", "דימונה", "אופקים", "נתיבות", "ירוחם", "ערד", "שדרות", "אשקלון",
+          "קריית גת", "מצפה רמון", "אילת", "רהט")
+GRADES = ("ט", "י", "יא", "יב")
+SUBJECTS = ("מתמטיקה", "אנגלית", "פיזיקה", "אלקטרוניקה", "תכנות", "היסטוריה", "תנ\"ך", "לשון")
+INVENTORY_CATALOGUE = (
+    # item, category, unit cost, stock per school
+    ("מחשב נייד", "מחשוב", 3200, 120),
+    ("מקרן", "מחשוב", 2100, 25),
+    ("מדפסת", "מחשוב", 900, 10),
+    ("שולחן תלמיד", "ריהוט", 350, 400),
+    ("כיסא", "ריהוט", 180, 450),
+    ("לוח מחיק", "ריהוט", 600, 40),
+    ("מדים", "ביגוד", 150, 800),
+    ("נעלי עבודה", "ביגוד", 220, 300),
+    ("ערכת מעבדה", "ציוד לימודי", 750, 60),
+    ("מולטימטר", "ציוד לימודי", 140, 90),
+    ("ערכת עזרה ראשונה", "בטיחות", 120, 30),
+    ("מטף כיבוי", "בטיחות", 260, 35),
+)
+
+ATTENDANCE_FIELDS = ("date", "class_name", "student_id", "status")
+GRADE_FIELDS = ("date", "class_name", "student_id", "subject", "grade")
+USER_FIELDS = ("id_number", "full_name", "rank_name", "department", "class_name", "school", "gender")
+CLASS_FIELDS = ("class_name", "school", "grade", "maks_id", "memach_id", "student_count")
+INVENTORY_FIELDS = ("item", "quantity", "school", "category", "unit_cost")
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Size of a generated school network"""
+    colleges: int            # machlala commanders
+    schools: int             # tichon commanders per college
+    memachs: int             # per school
+    classes: int             # per MEMACH (one MAKS each)
+    students: int            # per class
+    days: int                # calendar days of attendance and grades
+
+
+PRESETS = {
+    "small": Scale(colleges=1, schools=2, memachs=3, classes=4, students=25, days=30),
+    "campus": Scale(colleges=1, schools=6, memachs=5, classes=8, students=30, days=90),
+    "national": Scale(colleges=12, schools=8, memachs=6, classes=10, students=30, days=120),
+}
+
+
+def id_number(serial: int) -> str:
+    """Nine-digit Israeli ID with a valid check digit"""
+    digits = f"{serial % 10 ** 8:08d}"
+    total = 0
+    for position, digit in enumerate(digits):
+        value = int(digit) * (1 if position % 2 == 0 else 2)
+        total += value // 10 + value % 10
+    return digits + str((10 - total % 10) % 10)
+
+
+class SchoolGenerator:
+    """
+    Deterministic generator of a school network
+    
+    Every class is generated from its own seeded random stream, so any
+    part of the dataset can be regenerated without the rest and streams
+    never need to hold more than one class in memory.
+    """
+    
+    def __init__(self, scale: Scale, seed: int = 0, start: Optional[date] = None):
+        """
+        Initialize generator
+        
+        Args:
+            scale: Dataset size
+            seed: Random seed (same seed, same dataset)
+            start: First day of attendance and grades (defaults to 1 Sep 2024)
+        """
+        self.scale = scale
+        self.seed = seed
+        self.start = start or date(2024, 9, 1)
+    
+    def _random(self, *parts: Any) -> random.Random:
+        return random.Random(":".join(str(part) for part in (self.seed,) + parts))
+    
+    def _person(self, rng: random.Random, serial: int, rank_name: str,
+                department: Optional[str], class_name: Optional[str],
+                school: Optional[str]) -> Dict[str, Any]:
+        gender = rng.choice(("m", "f"))
+        first = rng.choice(FIRST_NAMES_MALE if gender == "m" else FIRST_NAMES_FEMALE)
+        return {
+            "id_number": id_number(serial),
+            "full_name": f"{first} {rng.choice(LAST_NAMES)}",
+            "rank_name": rank_name,
+            "department": department,
+            "class_name": class_name,
+            "school": school,
+            "gender": gender,
+        }
+    
+    # Structure
+    
+    def school_names(self) -> Iterator[str]:
+        for college in range(self.scale.colleges):
+            for school in range(self.scale.schools):
+                city = CITIES[(college * self.scale.schools + school) % len(CITIES)]
+                yield f"{city} {college + 1}.{school + 1}"
+    
+    def iter_staff(self) -> Iterator[Dict[str, Any]]:
+        """Commanders, MEMACHs and MAKSs, top of the hierarchy first"""
+        scale = self.scale
+        rng = self._random("staff")
+        serial = 10 ** 7
+        for college in range(scale.colleges):
+            serial += 1
+            yield self._person(rng, serial, "machlala_commander", None, None, None)
+        for school in self.school_names():
+            serial += 1
+            yield self._person(rng, serial, "tichon_commander", None, None, school)
+            for _ in range(scale.memachs):
+                serial += 1
+                yield self._person(rng, serial, "memach", "hadracha", None, school)
+        for spec in self.iter_class_specs():
+            yield spec["maks"]
+    
+    def iter_class_specs(self) -> Iterator[Dict[str, Any]]:
+        """Classes with their MAKS (students are generated separately)"""
+        scale = self.scale
+        index = 0
+        memach_serial = 10 ** 7 + scale.colleges
+        for school_number, school in enumerate(self.school_names()):
+            memach_serial += 1  # the school's tichon commander
+            for memach in range(scale.memachs):
+                memach_serial += 1
+                for number in range(scale.classes):
+                    grade = GRADES[number % len(GRADES)]
+                    class_name = f"{grade}-{memach * scale.classes + number + 1}/{school_number + 1}"
+                    rng = self._random("class", index)
+                    yield {
+                        "index": index,
+                        "class_name": class_name,
+                        "school": school,
+                        "grade": grade,
+                        "memach_id": id_number(memach_serial),
+                        "maks": self._person(rng, 2 * 10 ** 7 + index, "maks", "hadracha",
+                                             class_name, school),
+                    }
+                    index += 1
+    
+    def class_students(self, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The students of one class (same result every time)"""
+        rng = self._random("students", spec["index"])
+        base = 3 * 10 ** 7 + spec["index"] * 1000
+        return [self._person(rng, base + n, "shocher", None, spec["class_name"], spec["school"])
+                for n in range(self.scale.students)]
+    
+    def iter_classes(self) -> Iterator[Dict[str, Any]]:
+        """Class records"""
+        for spec in self.iter_class_specs():
+            yield {
+                "class_name": spec["class_name"],
+                "school": spec["school"],
+                "grade": spec["grade"],
+                "maks_id": spec["maks"]["id_number"],
+                "memach_id": spec["memach_id"],
+                "student_count": self.scale.students,
+            }
+    
+    def iter_users(self) -> Iterator[Dict[str, Any]]:
+        """Every user: staff first, then students class by class"""
+        yield from self.iter_staff()
+        for spec in self.iter_class_specs():
+            yield from self.class_students(spec)
+    
+    def iter_inventory(self) -> Iterator[Dict[str, Any]]:
+        """Stock per school, keyed "item (school)" as in the logistics department"""
+        rng = self._random("inventory")
+        for school in self.school_names():
+            for item, category, unit_cost, stock in INVENTORY_CATALOGUE:
+                yield {
+                    "item": f"{item} ({school})",
+                    "quantity": max(0, int(rng.gauss(stock, stock * 0.15))),
+                    "school": school,
+                    "category": category,
+                    "unit_cost": unit_cost,
+                }
+    
+    # Activity
+    
+    def school_days(self) -> List[date]:
+        """Sunday to Thursday within the generated period"""
+        days = (self.start + timedelta(days=n) for n in range(self.scale.days))
+        return [day for day in days if day.weekday() not in (4, 5)]
+    
+    def iter_attendance(self) -> Iterator[Dict[str, Any]]:
+        """Daily attendance; each student has a persistent absence tendency"""
+        days = [day.isoformat() for day in self.school_days()]
+        for spec in self.iter_class_specs():
+            rng = self._random("attendance", spec["index"])
+            students = [(student["id_number"], rng.betavariate(1.2, 14))
+                        for student in self.class_students(spec)]
+            for day in days:
+                for student_id, absence in students:
+                    roll = rng.random()
+                    status = "absent" if roll < absence else "late" if roll < absence * 1.5 else "present"
+                    yield {"date": day, "class_name": spec["class_name"],
+                           "student_id": student_id, "status": status}
+    
+    def iter_grades(self) -> Iterator[Dict[str, Any]]:
+        """One exam per subject every two weeks; grades follow student ability"""
+        days = self.school_days()
+        for spec in self.iter_class_specs():
+            rng = self._random("grades", spec["index"])
+            students = [(student["id_number"], rng.gauss(78, 10))
+                        for student in self.class_students(spec)]
+            for offset, subject in enumerate(SUBJECTS):
+                for day in days[offset % 10::10]:
+                    for student_id, ability in students:
+                        grade = min(100, max(0, round(rng.gauss(ability, 8))))
+                        yield {"date": day.isoformat(), "class_name": spec["class_name"],
+                               "student_id": student_id, "subject": subject, "grade": grade}
+
+
+# Targets
+
+DATASETS = (
+    ("users", USER_FIELDS, "iter_users"),
+    ("classes", CLASS_FIELDS, "iter_classes"),
+    ("inventory", INVENTORY_FIELDS, "iter_inventory"),
+    ("attendance", ATTENDANCE_FIELDS, "iter_attendance"),
+    ("grades", GRADE_FIELDS, "iter_grades"),
+)
+
+
+def write_files(generator: SchoolGenerator, output: Path, fmt: str,
+                only: Optional[List[str]] = None) -> Dict[str, int]:
+    """Stream datasets to <output>/<name>.jsonl or .csv, returning row counts"""
+    output.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for name, fields, method in DATASETS:
+        if only is not None and name not in only:
+            continue
+        path = output / f"{name}.{fmt}"
+        count = 0
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for record in getattr(generator, method)():
+                    writer.writerow(record)
+                    count += 1
+            else:
+                for record in getattr(generator, method)():
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+                    count += 1
+        counts[name] = count
+        print(f"  {path}: {count} rows")
+    return counts
+
+
+def load_departments(generator: SchoolGenerator, beast=None):
+    """
+    Stream users, classes and inventory into the departments through
+    their public APIs (events are emitted as in normal operation)
+    
+    Returns:
+        The loaded BEAST instance
+    """
+    beast = beast or create_beast()
+    manager = beast.hierarchy_manager
+    kochav_adam = beast.registry.get_department("kochav_adam")
+    hadracha = beast.registry.get_department("hadracha")
+    logistika = beast.registry.get_department("logistika")
+    
+    def user(record: Dict[str, Any]) -> User:
+        return User(record["id_number"], record["full_name"], record["rank_name"],
+                    department=record["department"], class_name=record["class_name"],
+                    hierarchy_manager=manager, school=record["school"])
+    
+    staff = 0
+    for record in generator.iter_staff():
+        if record["rank_name"] != "maks":
+            kochav_adam.register_user(user(record))
+            staff += 1
+    classes = students = 0
+    for spec in generator.iter_class_specs():
+        maks = user(spec["maks"])
+        kochav_adam.register_user(maks)
+        hadracha.create_class(spec["class_name"], maks)
+        classes += 1
+        for record in generator.class_students(spec):
+            student = user(record)
+            kochav_adam.register_user(student)
+            hadracha.add_student_to_class(spec["class_name"], student)
+            students += 1
+    items = 0
+    for record in generator.iter_inventory():
+        logistika.add_item(record["item"], record["quantity"],
+                           {"school": record["school"], "category": record["category"],
+                            "unit_cost": record["unit_cost"]})
+        items += 1
+    print(f"  Loaded {staff + classes} staff, {classes} classes, {students} students, "
+          f"{items} inventory items")
+    return beast
+
+
+# Load driver
+
+class LoadDriver:
+    """
+    Replays a weighted mix of operations at a target rate
+    
+    Operations are scheduled open-loop (operation i at start + i / rate)
+    and latency is measured from the scheduled time, so a slow operation
+    shows up in the latency of the ones queued behind it.
+    """
+    
+    def __init__(self, beast, generator: SchoolGenerator, seed: int = 0):
+        self.beast = beast
+        self.generator = generator
+        self.rng = random.Random(f"{seed}:load")
+        self.kochav_adam = beast.registry.get_department("kochav_adam")
+        self.hadracha = beast.registry.get_department("hadracha")
+        self.logistika = beast.registry.get_department("logistika")
+        self.user_ids = list(self.kochav_adam.users)
+        self.class_names = list(self.hadracha.classes)
+        self.items = list(self.logistika.inventory)
+        self.ranks = [rank.name for rank in beast.hierarchy_manager.list_ranks()]
+        self._serial = 9 * 10 ** 7
+        # operation name -> (weight, callable)
+        self.mix = {
+            "get_user": (40, self._get_user),
+            "can_manage": (15, self._can_manage),
+            "daily_attendance": (12, self._daily_attendance),
+            "grades_report": (8, self._grades_report),
+            "inventory_update": (10, self._inventory_update),
+            "register_user": (8, self._register_user),
+            "add_student_to_class": (7, self._add_student),
+        }
+    
+    def _get_user(self):
+        self.kochav_adam.get_user(self.rng.choice(self.user_ids))
+    
+    def _can_manage(self):
+        self.beast.hierarchy_manager.can_manage(self.rng.choice(self.ranks), self.rng.choice(self.ranks))
+    
+    def _daily_attendance(self):
+        self.beast.registry.get_automation("hadracha", "daily_attendance").run(
+            class_name=self.rng.choice(self.class_names))
+    
+    def _grades_report(self):
+        self.beast.registry.get_automation("hadracha", "grades_report").run(
+            class_name=self.rng.choice(self.class_names), subject=self.rng.choice(SUBJECTS))
+    
+    def _inventory_update(self):
+        self.logistika.add_item(self.rng.choice(self.items), self.rng.randint(-5, 20))
+    
+    def _new_student(self) -> User:
+        self._serial += 1
+        record = self.generator._person(self.rng, self._serial, "shocher", None, None, None)
+        return User(record["id_number"], record["full_name"], "shocher",
+                    hierarchy_manager=self.beast.hierarchy_manager)
+    
+    def _register_user(self):
+        student = self._new_student()
+        self.kochav_adam.register_user(student)
+        self.user_ids.append(student.id_number)
+    
+    def _add_student(self):
+        self.hadracha.add_student_to_class(self.rng.choice(self.class_names), self._new_student())
+    
+    def run(self, rate: float, duration: float) -> Dict[str, Any]:
+        """
+        Run the mix
+        
+        Args:
+            rate: Target operations per second
+            duration: Seconds to run
+        
+        Returns:
+            Per-operation counts and latency percentiles (milliseconds)
+        """
+        names = list(self.mix)
+        weights = [self.mix[name][0] for name in names]
+        total = int(rate * duration)
+        plan = self.rng.choices(names, weights=weights, k=total)
+        latencies: Dict[str, List[float]] = {name: [] for name in names}
+        errors: Dict[str, int] = {}
+        
+        start = time.perf_counter()
+        for i, name in enumerate(plan):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.mix[name][1]()
+            except Exception:
+                errors[name] = errors.get(name, 0) + 1
+            latencies[name].append((time.perf_counter() - scheduled) * 1000)
+        elapsed = time.perf_counter() - start
+        
+        report = {"target_rate": rate, "achieved_rate": total / elapsed if elapsed else 0.0,
+                  "operations": total, "errors": errors, "latency_ms": {}}
+        everything = sorted(value for values in latencies.values() for value in values)
+        for name, values in list(latencies.items()) + [("all", everything)]:
+            values = sorted(values)
+            if not values:
+                continue
+            report["latency_ms"][name] = {
+                "count": len(values),
+                **{f"p{label}": percentile(values, q)
+                   for label, q in (("50", 0.5), ("90", 0.9), ("99", 0.99), ("99.9", 0.999))},
+                "max": values[-1],
+            }
+        return report
+
+
+def print_load_report(report: Dict[str, Any]):
+    print(f"  Target {report['target_rate']:.0f} ops/s, achieved {report['achieved_rate']:.0f} ops/s "
+          f"({report['operations']} operations)")
+    print(f"  {'operation':<22}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}  (ms)")
+    for name, stats in report["latency_ms"].items():
+        print(f"  {name:<22}{stats['count']:>8}" + "".join(
+            f"{stats[key]:>10.3f}" for key in ("p50", "p90", "p99", "p99.9", "max")))
+    if report["errors"]:
+        print(f"  Errors: {report['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic school dataset")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", choices=("departments", "jsonl", "csv"), default="departments",
+                        help="Load into the departments, or write files")
+    parser.add_argument("--output", type=Path, help="Output directory for jsonl/csv")
+    parser.add_argument("--datasets", nargs="*", choices=[name for name, _, _ in DATASETS],
+                        help="Only write these datasets (files only)")
+    parser.add_argument("--days", type=int, help="Override the preset's number of days")
+    parser.add_argument("--snapshot", type=Path,
+                        help="After loading departments, write a state snapshot here")
+    parser.add_argument("--load", action="store_true",
+                        help="After loading departments, run the load driver")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Load driver ops/second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Load driver seconds")
+    parser.add_argument("--json", action="store_true", help="Print the load report as JSON")
+    args = parser.parse_args()
+    
+    scale = PRESETS[args.preset]
+    if args.days is not None:
+        scale = Scale(**{**scale.__dict__, "days": args.days})
+    generator = SchoolGenerator(scale, seed=args.seed)
+    classes = scale.colleges * scale.schools * scale.memachs * scale.classes
+    print(f"Preset '{args.preset}' (seed {args.seed}): {classes} classes, "
+          f"{classes * scale.students} students, {scale.days} days")
+    
+    if args.target != "departments":
+        if args.output is None:
+            parser.error("--output is required for file targets")
+        start = time.perf_counter()
+        write_files(generator, args.output, args.target, args.datasets)
+        print(f"Done in {time.perf_counter() - start:.1f}s")
+        return
+    
+    start = time.perf_counter()
+    beast = load_departments(generator)
+    print(f"Loaded in {time.perf_counter() - start:.1f}s "
+          "(attendance and grades are not stored by any department - use --target jsonl/csv)")
+    if args.snapshot:
+        beast.snapshot(args.snapshot)
+        print(f"Snapshot written to {args.snapshot}")
+    if args.load:
+        print(f"Running load driver for {args.duration:.0f}s...")
+        report = LoadDriver(beast, generator, seed=args.seed).run(args.rate, args.duration)
+        if args.json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            print_load_report(report)
+
+
+if __name__ == "__main__":
+    main()